@@ -2,7 +2,7 @@ from rest_framework import permissions
 from rest_framework.request import Request
 from rest_framework.views import APIView
 
-from events.models import Activity
+from events.models import ActivityPlayer
 
 
 class ActivityMessagePermission(permissions.BasePermission):
@@ -11,7 +11,4 @@ class ActivityMessagePermission(permissions.BasePermission):
         request: Request,
         view: APIView,
     ) -> bool:
-        return Activity.objects.filter(
-            pk=view.kwargs[view.lookup_field],
-            players=request.user.player,
-        ).exists()
+        return ActivityPlayer.objects.is_member(view.kwargs[view.lookup_field], request.user.player.pk)
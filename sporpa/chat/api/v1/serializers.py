@@ -1,6 +1,9 @@
 from rest_framework import serializers
 
-from chat.models import ActivityMessage
+from django.utils.translation import gettext
+
+from accounts.models import User
+from chat.models import ActivityMessage, DirectMessage
 
 
 class ActivityMessageListSerializer(serializers.ModelSerializer):
@@ -13,3 +16,41 @@ class ActivityMessageListSerializer(serializers.ModelSerializer):
             "created_at",
             "content",
         )
+
+
+class DirectMessageListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DirectMessage
+        fields = (
+            "pk",
+            "sender",
+            "receiver",
+            "created_at",
+            "content",
+        )
+
+
+class DirectMessageCreateSerializer(serializers.ModelSerializer):
+    """Creates a direct message from the `sender` in the context."""
+
+    receiver = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+    message = serializers.CharField(
+        source="content",
+        max_length=DirectMessage.content.field.max_length,
+        allow_blank=True,
+    )
+
+    class Meta:
+        model = DirectMessage
+        fields = (
+            "receiver",
+            "message",
+        )
+
+    def validate_receiver(self, value: User) -> User:
+        if value == self.context["sender"]:
+            raise serializers.ValidationError(gettext("You cannot send a message to yourself."))
+        return value
+
+    def create(self, validated_data: dict) -> DirectMessage:
+        return super().create({**validated_data, "sender": self.context["sender"]})
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import ActivityMessageListView
+from .views import ActivityMessageListView, ConversationListView, DirectMessageListView
 
 app_name = "chat"
 urlpatterns = [
@@ -9,4 +9,14 @@ urlpatterns = [
         ActivityMessageListView.as_view(),
         name="activity_messages",
     ),
+    path(
+        "conversations/",
+        ConversationListView.as_view(),
+        name="conversations",
+    ),
+    path(
+        "direct-messages/<int:user_pk>/",
+        DirectMessageListView.as_view(),
+        name="direct_messages",
+    ),
 ]
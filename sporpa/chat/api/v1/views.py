@@ -3,11 +3,11 @@ from rest_framework.settings import api_settings
 
 from django.db.models import QuerySet
 
-from chat.models import ActivityMessage
+from chat.models import ActivityMessage, DirectMessage
 
 from .paginations import MessageCursorPagination
 from .permissions import ActivityMessagePermission
-from .serializers import ActivityMessageListSerializer
+from .serializers import ActivityMessageListSerializer, DirectMessageListSerializer
 
 
 class ActivityMessageListView(generics.ListAPIView):
@@ -19,3 +19,22 @@ class ActivityMessageListView(generics.ListAPIView):
     def get_queryset(self) -> QuerySet[ActivityMessage]:
         activity_pk = self.kwargs[self.lookup_field]
         return ActivityMessage.objects.filter(activity=activity_pk)
+
+
+class ConversationListView(generics.ListAPIView):
+    """Lists the latest message of every conversation of the user."""
+
+    pagination_class = MessageCursorPagination
+    serializer_class = DirectMessageListSerializer
+
+    def get_queryset(self) -> QuerySet[DirectMessage]:
+        return DirectMessage.objects.filter_latest(self.request.user.pk)
+
+
+class DirectMessageListView(generics.ListAPIView):
+    pagination_class = MessageCursorPagination
+    serializer_class = DirectMessageListSerializer
+    lookup_field = "user_pk"
+
+    def get_queryset(self) -> QuerySet[DirectMessage]:
+        return DirectMessage.objects.filter_conversation(self.request.user.pk, self.kwargs[self.lookup_field])
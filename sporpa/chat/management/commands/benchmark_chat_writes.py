@@ -0,0 +1,120 @@
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import async_to_sync
+from psycopg2.extras import DateTimeTZRange
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from accounts.models import User
+from chat.models import ActivityMessage
+from chat.ws.writers import ActivityMessageWriter
+from events.models import Activity
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends synthetic activity chat messages through the direct and the write-behind store paths, "
+        "then compares their throughput and how long a message waits before it can be broadcast."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=2000,
+            help="Number of messages per mode.",
+        )
+        parser.add_argument(
+            "--senders",
+            type=int,
+            default=20,
+            help="Number of concurrent senders, like consumers of one worker process.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CHAT_WRITE_BEHIND_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--flush-interval",
+            type=float,
+            default=settings.CHAT_WRITE_BEHIND_FLUSH_INTERVAL,
+        )
+        parser.add_argument(
+            "--synchronous-commit",
+            choices=("on", "off", "local", "remote_write", "remote_apply"),
+            default=settings.CHAT_WRITE_BEHIND_SYNCHRONOUS_COMMIT,
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        user = User.objects.create_user("benchmark-chat@sporpa.invalid", "")
+        now = timezone.datetime.now()
+        # Saved directly, it needs no roster and must not publish deltas.
+        activity = Activity(
+            organizer=user.player,
+            sport_id=1,
+            player_count=1,
+            name="Benchmark chat",
+            available_between_at=DateTimeTZRange(now + timezone.timedelta(days=1), now + timezone.timedelta(days=2)),
+        )
+        activity.save()
+        writer = ActivityMessageWriter(
+            batch_size=options["batch_size"],
+            flush_interval=options["flush_interval"],
+            synchronous_commit=options["synchronous_commit"],
+        )
+
+        async def store_directly(content: str) -> None:
+            await ActivityMessage.objects.acreate(sender=user, activity=activity, content=content)
+
+        async def store_behind(content: str) -> None:
+            activity_message = ActivityMessage(
+                pk=await writer.get_next_pk(),
+                sender=user,
+                activity=activity,
+                content=content,
+            )
+            await writer.add(activity_message)
+
+        try:
+            for mode, store, flush in (
+                ("direct", store_directly, None),
+                ("write_behind", store_behind, writer.flush),
+            ):
+                durations, elapsed = async_to_sync(self._run)(store, flush, options["messages"], options["senders"])
+                durations.sort()
+                self.stdout.write(
+                    f"{mode}: {len(durations) / elapsed:.0f} messages/s, "
+                    f"broadcast after p50 {statistics.median(durations) * 1000:.2f} ms, "
+                    f"p99 {durations[int(len(durations) * 0.99)] * 1000:.2f} ms"
+                )
+            total_stored = ActivityMessage.objects.filter(activity=activity).count()
+            self.stdout.write(self.style.SUCCESS(f"Stored {total_stored} messages."))
+        finally:
+            user.delete()
+
+    async def _run(
+        self,
+        store: Callable[[str], Awaitable[None]],
+        flush: Callable[[], Awaitable[None]] | None,
+        total: int,
+        senders: int,
+    ) -> tuple[list[float], float]:
+        durations: list[float] = []
+
+        async def send(sender: int) -> None:
+            for index in range(sender, total, senders):
+                started_at = time.perf_counter()
+                await store(f"Benchmark message {index}")
+                durations.append(time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(send(sender) for sender in range(senders)))
+        if flush is not None:
+            await flush()
+        return durations, time.perf_counter() - started_at
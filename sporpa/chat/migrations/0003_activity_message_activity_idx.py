@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-18 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0013_activity_player_exclusive_schedule"),
+        ("chat", "0002_message_created_at_default"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="activitymessage",
+            name="activity",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="messages",
+                to="events.activity",
+                verbose_name="activity",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activitymessage",
+            index=models.Index(fields=["activity", "id"], name="activity_message_activity_idx"),
+        ),
+    ]
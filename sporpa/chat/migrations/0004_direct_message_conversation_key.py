@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+import utils.models.generated_field
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0003_activity_message_activity_idx"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name="directmessage",
+                    name="conversation_key",
+                    field=utils.models.generated_field.GeneratedCharField(
+                        editable=False,
+                        help_text="The pks of the sender and the receiver, the lower one first, as <pk>:<pk>.",
+                        max_length=41,
+                        null=True,
+                        verbose_name="conversation key",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql="""
+                        ALTER TABLE direct_message ADD COLUMN conversation_key varchar(41) GENERATED ALWAYS AS (
+                            least(sender_id, receiver_id)::text || ':' || greatest(sender_id, receiver_id)::text
+                        ) STORED
+                    """,
+                    reverse_sql="ALTER TABLE direct_message DROP COLUMN conversation_key",
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="directmessage",
+            index=models.Index(fields=["conversation_key", "id"], name="direct_message_key_idx"),
+        ),
+    ]
@@ -1,10 +1,31 @@
+from contextlib import contextmanager
+from typing import Iterator
+
 from django.conf import settings
-from django.db import models
+from django.db import connection, models
 from django.utils.translation import gettext_lazy as _
 
 from .message import Message
 
 
+class ActivityMessageManager(models.Manager):
+    @contextmanager
+    def lock_activity(self, activity_pk: int) -> Iterator[None]:
+        """
+        Holds a session level advisory lock of the chat of the activity, shared
+        by every process, until the block exits. Unlike a transaction level
+        lock, statements in the block can commit while it is held.
+        """
+        # Activities whose keys collide only share a lock.
+        lock_key = f"{self.model._meta.db_table}:{activity_pk}"
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(hashtext(%s))", [lock_key])
+            try:
+                yield
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [lock_key])
+
+
 class ActivityMessage(Message):
     sender = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -17,12 +38,23 @@ class ActivityMessage(Message):
         verbose_name=_("activity"),
         on_delete=models.CASCADE,
         related_name="messages",
+        # Covered by activity_message_activity_idx.
+        db_index=False,
     )
 
+    objects = ActivityMessageManager()
+
     class Meta:
         db_table = "activity_message"
         verbose_name = _("activity message")
         verbose_name_plural = _("activity messages")
+        indexes = (
+            # The latest messages of an activity and the replay after a pk.
+            models.Index(
+                fields=("activity", "id"),
+                name="activity_message_activity_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"Activity message from {self.sender} to {self.activity}"
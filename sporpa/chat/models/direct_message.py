@@ -2,9 +2,30 @@ from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from utils.models import GeneratedCharField
+
 from .message import Message
 
 
+class DirectMessageManager(models.Manager):
+    def filter_conversation(self, user_pk: int, other_user_pk: int) -> models.QuerySet:
+        return self.filter(conversation_key=self.model.get_conversation_key(user_pk, other_user_pk))
+
+    def filter_latest(self, user_pk: int) -> models.QuerySet:
+        """
+        Filters the latest message of every conversation of the user. Every
+        message with a conversation key of the user is sent or received by
+        them, so the latest ones are the highest pks per key among those.
+        """
+        latest_pks = (
+            self.filter(models.Q(sender=user_pk) | models.Q(receiver=user_pk))
+            .values("conversation_key")
+            .annotate(latest_pk=models.Max("pk"))
+            .values("latest_pk")
+        )
+        return self.filter(pk__in=latest_pks)
+
+
 class DirectMessage(Message):
     sender = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -18,11 +39,29 @@ class DirectMessage(Message):
         on_delete=models.CASCADE,
         related_name="received_direct_messages",
     )
+    conversation_key = GeneratedCharField(
+        _("conversation key"),
+        max_length=41,
+        help_text=_("The pks of the sender and the receiver, the lower one first, as <pk>:<pk>."),
+    )
+
+    objects = DirectMessageManager()
 
     class Meta:
         db_table = "direct_message"
         verbose_name = _("direct message")
         verbose_name_plural = _("direct messages")
+        indexes = (
+            # The history of a conversation, latest first.
+            models.Index(
+                fields=("conversation_key", "id"),
+                name="direct_message_key_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"Direct message from {self.sender} to {self.receiver}"
+
+    @staticmethod
+    def get_conversation_key(user_pk: int, other_user_pk: int) -> str:
+        return f"{min(user_pk, other_user_pk)}:{max(user_pk, other_user_pk)}"
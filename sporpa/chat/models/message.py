@@ -1,11 +1,14 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
 class Message(models.Model):
     created_at = models.DateTimeField(
         _("created at"),
-        auto_now_add=True,
+        # Not auto_now_add, messages stored in batches keep their receive time.
+        default=timezone.now,
+        editable=False,
     )
     content = models.TextField(
         _("content"),
@@ -1,55 +1,221 @@
 import json
+from typing import Any
+from urllib.parse import parse_qs
 
+from asgiref.sync import async_to_sync, sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.layers import get_channel_layer
+from rest_framework.exceptions import ValidationError
 
-from chat.api.v1.serializers import ActivityMessageListSerializer
-from chat.models import ActivityMessage
-from events.models import Activity
+from django.conf import settings
+
+from accounts.models import User
+from chat.api.v1.serializers import (
+    ActivityMessageListSerializer,
+    DirectMessageCreateSerializer,
+    DirectMessageListSerializer,
+)
+from chat.models import ActivityMessage, DirectMessage
+from events.models import ActivityPlayer
+
+from .controls import get_activity_chat_group_name
+from .writers import get_activity_message_writer
+
+
+def get_direct_message_group_name(user_pk: int) -> str:
+    return f"direct_messages_user_{user_pk}"
+
+
+def send_activity_message(sender: User, activity_pk: int, content: str) -> None:
+    """
+    Stores the message and sends it to the chat of the activity under the
+    lock of the activity, so every process stores and sends the messages of
+    an activity one at a time, in the order of their pks, each one after it
+    is committed.
+    """
+    with ActivityMessage.objects.lock_activity(activity_pk):
+        activity_message = ActivityMessage.objects.create(
+            sender=sender,
+            activity_id=activity_pk,
+            content=content,
+        )
+        serializer = ActivityMessageListSerializer(instance=activity_message)
+        async_to_sync(get_channel_layer().group_send)(
+            get_activity_chat_group_name(activity_pk),
+            {"type": "chat_message", "activity_message": serializer.data},
+        )
 
 
 class ActivityMessageConsumer(AsyncWebsocketConsumer):
+    """
+    Sends the messages of the activity chat to its players. Reconnecting
+    clients pass the pk of the last message they received as `since` in the
+    query string and are sent the messages after it before the live ones.
+
+    Messages are sent in the order of their pks, each one after it is
+    stored, see `send_activity_message`. The replay reads the stored
+    messages, so it is refused with CHAT_WRITE_BEHIND, where the messages of
+    other processes are sent before they are stored and may take a lower pk
+    than the ones already sent.
+    """
+
+    # Application close codes, 4000 plus the matching HTTP status.
+    REVOKED_CLOSE_CODE = 4403
+    CLOSED_CLOSE_CODE = 4410
+    REPLAY_TOO_LARGE_CLOSE_CODE = 4413
+    REPLAY_UNAVAILABLE_CLOSE_CODE = 4501
+
     async def connect(self) -> None:
+        self.activity_pk = self.scope["url_route"]["kwargs"]["activity_pk"]
+        self.activity_chat_group_name = get_activity_chat_group_name(self.activity_pk)
+        self.replayed_pks: set[int] = set()
         self.user = self.scope.get("user")
         if not self.user or not self.user.pk:
             await self.close()
+            return
 
-        activity_pk = self.scope["url_route"]["kwargs"]["activity_pk"]
+        since = parse_qs(self.scope["query_string"].decode()).get("since")
         try:
-            self.activity = await Activity.objects.aget(
-                pk=activity_pk,
-                players=self.user.player,
-            )
-            self.activity_chat_group_name = f"activity_chat_{self.activity.pk}"
+            since_pk = int(since[-1]) if since else None
+        except ValueError:
+            await self.close()
+            return
 
-            await self.channel_layer.group_add(
-                self.activity_chat_group_name,
-                self.channel_name,
-            )
-            await self.accept()
-        except Activity.DoesNotExist:
+        self.player_pk = self.user.player.pk
+        if not await ActivityPlayer.objects.ais_member(self.activity_pk, self.player_pk, include_cancelled=False):
             await self.close()
+            return
 
-    async def disconnect(self, close_code: int) -> None:
-        await self.channel_layer.group_discard(
+        if since_pk is not None and settings.CHAT_WRITE_BEHIND:
+            # Accepts first, a close before it drops the code.
+            await self.accept()
+            await self.close(code=self.REPLAY_UNAVAILABLE_CLOSE_CODE)
+            return
+
+        await self.channel_layer.group_add(
             self.activity_chat_group_name,
             self.channel_name,
         )
+        await self.accept()
+        if since_pk is not None:
+            # Read after joining the group, so every message is either
+            # replayed or sent live. Live messages wait until connect
+            # returns.
+            await self.replay(since_pk)
+
+    async def disconnect(self, close_code: int) -> None:
+        await self._leave()
+        if settings.CHAT_WRITE_BEHIND:
+            await get_activity_message_writer().flush()
 
     async def receive(self, text_data: str) -> None:
         data = json.loads(text_data)
         message = data["message"]
 
-        activity_message = await ActivityMessage.objects.acreate(
-            sender=self.user,
-            activity=self.activity,
-            content=message,
-        )
-        serializer = ActivityMessageListSerializer(instance=activity_message)
+        if settings.CHAT_WRITE_BEHIND:
+            writer = get_activity_message_writer()
+            activity_message = ActivityMessage(
+                pk=await writer.get_next_pk(),
+                sender=self.user,
+                activity_id=self.activity_pk,
+                content=message,
+            )
+            await writer.add(activity_message)
+            serializer = ActivityMessageListSerializer(instance=activity_message)
+            await self.channel_layer.group_send(
+                self.activity_chat_group_name,
+                {"type": "chat_message", "activity_message": serializer.data},
+            )
+        else:
+            await sync_to_async(send_activity_message)(self.user, self.activity_pk, message)
 
-        await self.channel_layer.group_send(
-            self.activity_chat_group_name,
-            {"type": "chat_message", "activity_message": serializer.data},
-        )
+    async def replay(self, since_pk: int) -> None:
+        activity_messages = [
+            activity_message
+            async for activity_message in ActivityMessage.objects.filter(
+                activity=self.activity_pk,
+                pk__gt=since_pk,
+            ).order_by("pk")[: settings.CHAT_REPLAY_LIMIT + 1]
+        ]
+
+        if len(activity_messages) > settings.CHAT_REPLAY_LIMIT:
+            await self._leave()
+            await self.close(code=self.REPLAY_TOO_LARGE_CLOSE_CODE)
+            return
+
+        for activity_message in activity_messages:
+            serializer = ActivityMessageListSerializer(instance=activity_message)
+            await self.send(text_data=json.dumps(serializer.data))
+        self.replayed_pks = {activity_message.pk for activity_message in activity_messages}
 
     async def chat_message(self, event: dict) -> None:
+        # Messages stored while the replay was read are also sent live.
+        pk = event["activity_message"]["pk"]
+        if pk in self.replayed_pks:
+            self.replayed_pks.remove(pk)
+            return
         await self.send(text_data=json.dumps(event["activity_message"]))
+
+    async def chat_revoke(self, event: dict) -> None:
+        if self.player_pk in event["player_pks"]:
+            await self._leave()
+            await self.close(code=self.REVOKED_CLOSE_CODE)
+
+    async def chat_close(self, event: dict) -> None:
+        await self._leave()
+        await self.close(code=self.CLOSED_CLOSE_CODE)
+
+    async def _leave(self) -> None:
+        # Leaves the group at once, the disconnect of a closed socket may
+        # come much later.
+        await self.channel_layer.group_discard(
+            self.activity_chat_group_name,
+            self.channel_name,
+        )
+
+
+class DirectMessageConsumer(AsyncWebsocketConsumer):
+    """
+    The inbox of the user. Sends the direct messages they receive, and the
+    ones they send from any socket, and stores the ones sent through it as
+    `{"receiver": <user pk>, "message": <content>}`.
+    """
+
+    async def connect(self) -> None:
+        self.group_names: list[str] = []
+        self.user = self.scope.get("user")
+        if not self.user or not self.user.pk:
+            await self.close()
+            return
+
+        self.group_names.append(get_direct_message_group_name(self.user.pk))
+        for group_name in self.group_names:
+            await self.channel_layer.group_add(group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code: int) -> None:
+        for group_name in self.group_names:
+            await self.channel_layer.group_discard(group_name, self.channel_name)
+
+    async def receive(self, text_data: str) -> None:
+        try:
+            direct_message = await self.create_direct_message(json.loads(text_data))
+        except ValidationError as error:
+            await self.send(text_data=json.dumps({"errors": error.detail}))
+            return
+
+        data = DirectMessageListSerializer(instance=direct_message).data
+        for user_pk in (direct_message.sender_id, direct_message.receiver_id):
+            await self.channel_layer.group_send(
+                get_direct_message_group_name(user_pk),
+                {"type": "direct_message", "direct_message": data},
+            )
+
+    @sync_to_async
+    def create_direct_message(self, data: Any) -> DirectMessage:
+        serializer = DirectMessageCreateSerializer(data=data, context={"sender": self.user})
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    async def direct_message(self, event: dict) -> None:
+        await self.send(text_data=json.dumps(event["direct_message"]))
@@ -0,0 +1,36 @@
+from typing import Any, Iterable
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from django.db import transaction
+
+
+def get_activity_chat_group_name(activity_pk: int) -> str:
+    return f"activity_chat_{activity_pk}"
+
+
+def _send(activity_pk: int, event: dict[str, Any]) -> None:
+    async_to_sync(get_channel_layer().group_send)(get_activity_chat_group_name(activity_pk), event)
+
+
+def _publish(activity_pk: int, event: dict[str, Any]) -> None:
+    # Consumers also check the membership on connect, a channel layer failure
+    # must not fail the committed change.
+    transaction.on_commit(lambda: _send(activity_pk, event), robust=True)  # type: ignore[call-arg]
+
+
+def revoke_activity_chat_members(activity_pk: int, player_pks: Iterable[int]) -> None:
+    """
+    Makes the consumers of the players in the chat of the activity leave its
+    group and close once the transaction commits.
+    """
+    _publish(activity_pk, {"type": "chat_revoke", "player_pks": list(player_pks)})
+
+
+def close_activity_chat(activity_pk: int) -> None:
+    """
+    Makes every consumer in the chat of the activity leave its group and
+    close once the transaction commits, so the group is gone.
+    """
+    _publish(activity_pk, {"type": "chat_close"})
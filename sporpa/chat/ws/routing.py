@@ -4,4 +4,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     path("chat/<int:activity_pk>/", consumers.ActivityMessageConsumer.as_asgi()),
+    path("chat/direct/", consumers.DirectMessageConsumer.as_asgi()),
 ]
@@ -0,0 +1,154 @@
+import asyncio
+import atexit
+import logging
+from collections import deque
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from chat.models import ActivityMessage
+
+logger = logging.getLogger(__name__)
+
+NEXT_PKS_SQL = "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)"
+
+
+class ActivityMessageWriter:
+    """
+    Stores activity messages behind their broadcast. Messages take their pk
+    from the table's sequence when they are received, so they can be sent
+    to the chat at once, and are inserted with `bulk_create` when
+    `batch_size` messages are pending or `flush_interval` seconds after the
+    first pending message, whichever comes first.
+
+    The pks are reserved `batch_size` at a time and the unused ones are
+    dropped on every flush, so the messages of different processes stay in
+    about the order they were received.
+
+    Pending messages are lost if the process is killed before they are
+    flushed, consumers flush on disconnect and the rest is flushed at exit.
+    A message which fails to insert is pending again, up to `max_attempts`
+    times, and then dropped and logged.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        synchronous_commit: str = "on",
+        max_attempts: int = 3,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.synchronous_commit = synchronous_commit
+        self.max_attempts = max_attempts
+        self.pending: list[ActivityMessage] = []
+        self.failed_attempts: dict[int, int] = {}
+        self.reserved_pks: deque[int] = deque()
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def get_next_pk(self) -> int:
+        if not self.reserved_pks:
+            self.reserved_pks.extend(await self.reserve_pks())
+        return self.reserved_pks.popleft()
+
+    # Like the async ORM methods, not database_sync_to_async, which would
+    # reconnect on every call without persistent connections.
+    @sync_to_async
+    def reserve_pks(self) -> list[int]:
+        with connection.cursor() as cursor:
+            cursor.execute(NEXT_PKS_SQL, [ActivityMessage._meta.db_table, self.batch_size])
+            return [pk for (pk,) in cursor.fetchall()]
+
+    async def add(self, activity_message: ActivityMessage) -> None:
+        self.pending.append(activity_message)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_later)
+
+    def _flush_later(self) -> None:
+        self._flush_timer = None
+        task = asyncio.create_task(self.flush())
+        # Keeps a reference, the event loop only holds weak ones.
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        activity_messages, self.pending = self.pending, []
+        self.reserved_pks.clear()
+        if activity_messages:
+            retried_activity_messages = await sync_to_async(self.write)(activity_messages)
+            for activity_message in retried_activity_messages:
+                await self.add(activity_message)
+
+    def flush_sync(self) -> None:
+        while self.pending:
+            activity_messages, self.pending = self.pending, []
+            self.pending = self.write(activity_messages)
+
+    def write(self, activity_messages: list[ActivityMessage]) -> list[ActivityMessage]:
+        """
+        Inserts the messages and returns the ones to retry.
+        """
+        try:
+            self._bulk_create(activity_messages)
+        except DatabaseError:
+            pass
+        else:
+            for activity_message in activity_messages:
+                self.failed_attempts.pop(activity_message.pk, None)
+            return []
+
+        # A single bad message, e.g. of an activity deleted meanwhile, must
+        # not drop the rest of the batch.
+        retried_activity_messages = []
+        for activity_message in activity_messages:
+            try:
+                self._bulk_create([activity_message])
+            except DatabaseError:
+                failed_attempts = self.failed_attempts.pop(activity_message.pk, 0) + 1
+                if failed_attempts < self.max_attempts:
+                    self.failed_attempts[activity_message.pk] = failed_attempts
+                    retried_activity_messages.append(activity_message)
+                else:
+                    # It was already sent to the chat, it is only missing
+                    # from the history.
+                    logger.exception(
+                        "Dropped activity message %d of activity %d after %d attempts.",
+                        activity_message.pk,
+                        activity_message.activity_id,
+                        failed_attempts,
+                    )
+            else:
+                self.failed_attempts.pop(activity_message.pk, None)
+        return retried_activity_messages
+
+    def _bulk_create(self, activity_messages: list[ActivityMessage]) -> None:
+        with transaction.atomic():
+            if self.synchronous_commit != "on":
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT set_config('synchronous_commit', %s, true)", [self.synchronous_commit])
+            ActivityMessage.objects.bulk_create(activity_messages)
+
+
+_writer: ActivityMessageWriter | None = None
+
+
+def get_activity_message_writer() -> ActivityMessageWriter:
+    """Returns the writer shared by the consumers of the process."""
+    global _writer
+    if _writer is None:
+        _writer = ActivityMessageWriter(
+            batch_size=settings.CHAT_WRITE_BEHIND_BATCH_SIZE,
+            flush_interval=settings.CHAT_WRITE_BEHIND_FLUSH_INTERVAL,
+            synchronous_commit=settings.CHAT_WRITE_BEHIND_SYNCHRONOUS_COMMIT,
+        )
+        atexit.register(_writer.flush_sync)
+    return _writer
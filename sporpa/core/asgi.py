@@ -6,7 +6,8 @@ from channels.security.websocket import AllowedHostsOriginValidator
 
 from django.core.asgi import get_asgi_application
 
-from chat.ws.routing import websocket_urlpatterns
+from chat.ws.routing import websocket_urlpatterns as chat_websocket_urlpatterns
+from events.ws.routing import websocket_urlpatterns as events_websocket_urlpatterns
 from utils.middleware import TokenAuthMiddlewareStack
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
@@ -14,7 +15,9 @@ application = ProtocolTypeRouter(
     {
         "http": get_asgi_application(),
         "websocket": AllowedHostsOriginValidator(
-            TokenAuthMiddlewareStack(AuthMiddlewareStack(URLRouter(websocket_urlpatterns))),
+            TokenAuthMiddlewareStack(
+                AuthMiddlewareStack(URLRouter(chat_websocket_urlpatterns + events_websocket_urlpatterns))
+            ),
         ),
     },
 )
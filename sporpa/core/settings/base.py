@@ -144,6 +144,34 @@ CHANNEL_LAYERS = {
 }
 
 
+# cache
+
+# Shared by the processes, e.g. cached activity rosters must be cleared for
+# every worker at once.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("CACHE_LOCATION", default="redis://127.0.0.1:6379"),
+    },
+}
+
+
+# chat
+
+# Broadcast activity chat messages before they are stored and store them in
+# micro-batches of up to BATCH_SIZE messages, at most FLUSH_INTERVAL seconds
+# after they are received.
+CHAT_WRITE_BEHIND = config("CHAT_WRITE_BEHIND", default=False, cast=bool)
+CHAT_WRITE_BEHIND_BATCH_SIZE = config("CHAT_WRITE_BEHIND_BATCH_SIZE", default=100, cast=int)
+CHAT_WRITE_BEHIND_FLUSH_INTERVAL = config("CHAT_WRITE_BEHIND_FLUSH_INTERVAL", default=0.05, cast=float)
+# PostgreSQL synchronous_commit of the batches. "off" does not wait for the
+# WAL flush, a database crash can then lose the last acknowledged batches.
+CHAT_WRITE_BEHIND_SYNCHRONOUS_COMMIT = config("CHAT_WRITE_BEHIND_SYNCHRONOUS_COMMIT", default="on")
+# Most messages replayed to a reconnecting chat socket, clients missing more
+# backfill through the API.
+CHAT_REPLAY_LIMIT = config("CHAT_REPLAY_LIMIT", default=500, cast=int)
+
+
 # djangorestframework
 
 REST_FRAMEWORK = {
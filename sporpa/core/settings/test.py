@@ -20,6 +20,15 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+
 # Email Settings
 
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
@@ -1,6 +1,10 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import QuerySet
+from django.forms import ModelForm
+from django.http import HttpRequest
 
-from events.models import Activity, ActivityLevel, ActivityPlayer
+from events.models import Activity, ActivityFeedEntry, ActivityLevel, ActivityPlayer, ActivitySeries
 
 
 @admin.register(Activity)
@@ -8,11 +12,61 @@ class ActivityAdmin(admin.ModelAdmin):
     pass
 
 
+@admin.register(ActivityFeedEntry)
+class ActivityFeedEntryAdmin(admin.ModelAdmin):
+    pass
+
+
 @admin.register(ActivityLevel)
 class ActivityLevelAdmin(admin.ModelAdmin):
-    pass
+    def save_model(self, request: HttpRequest, obj: ActivityLevel, form: ModelForm, change: bool) -> None:
+        super().save_model(request, obj, form, change)
+        # A level moved to another activity changes the levels of both.
+        self._sync_levels({obj.activity_id, form.initial.get("activity", obj.activity_id)})
+
+    def delete_model(self, request: HttpRequest, obj: ActivityLevel) -> None:
+        super().delete_model(request, obj)
+        self._sync_levels({obj.activity_id})
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet[ActivityLevel]) -> None:
+        activity_pks = set(queryset.values_list("activity", flat=True))
+        super().delete_queryset(request, queryset)
+        self._sync_levels(activity_pks)
+
+    @staticmethod
+    def _sync_levels(activity_pks: set[int]) -> None:
+        for activity in Activity.all_objects.filter(pk__in=activity_pks):
+            activity.sync_level_ids()
+            activity.refresh_feed_entries()
 
 
 @admin.register(ActivityPlayer)
 class ActivityPlayerAdmin(admin.ModelAdmin):
+    """
+    Rosters only change through `Activity.add_participants` and
+    `remove_participant`, which keep `player_count`, the feed, the chat
+    membership and the schedules in sync, so participants can only be
+    removed here.
+    """
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: ActivityPlayer | None = None) -> bool:
+        return False
+
+    def has_delete_permission(self, request: HttpRequest, obj: ActivityPlayer | None = None) -> bool:
+        return (obj is None or not obj.is_organizer) and super().has_delete_permission(request, obj)
+
+    def delete_model(self, request: HttpRequest, obj: ActivityPlayer) -> None:
+        obj.activity.remove_participant(obj.player)
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet[ActivityPlayer]) -> None:
+        with transaction.atomic():
+            for activity_player in queryset.filter(is_organizer=False).select_related("activity", "player"):
+                activity_player.activity.remove_participant(activity_player.player)
+
+
+@admin.register(ActivitySeries)
+class ActivitySeriesAdmin(admin.ModelAdmin):
     pass
@@ -0,0 +1,99 @@
+import csv
+import json
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Any, AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.postgres.fields.ranges import RangeEndsWith, RangeStartsWith
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from events.models import Activity
+
+
+class ActivityRowEncoder(ABC):
+    """
+    Encodes activities as flat rows read with `values_list` over a server
+    side cursor, instead of building model instances for a serializer, so an
+    export of any length is streamed in constant memory.
+
+    Rows are read and encoded asynchronously, a chunk at a time, as ASGI
+    responses buffer synchronous iterators before sending them.
+    """
+
+    content_type = "text/plain"
+    # Rows fetched from the server side cursor at a time.
+    chunk_size = 2000
+    fields = (
+        "pk",
+        "sport",
+        "levels",
+        "organizer",
+        "player_limit",
+        "player_count",
+        "name",
+        "status",
+        "available_from",
+        "available_to",
+    )
+
+    async def get_rows(self, queryset: QuerySet[Activity]) -> AsyncIterator[tuple[Any, ...]]:
+        # Not `aiterator`, which runs the query of a `values_list` in the
+        # event loop on Django 4.2.
+        rows = (
+            queryset.annotate(
+                available_from=RangeStartsWith("available_between_at"),
+                available_to=RangeEndsWith("available_between_at"),
+            )
+            .order_by("available_from", "pk")
+            .values_list(
+                "pk",
+                "sport",
+                "level_ids",
+                "organizer",
+                "player_limit",
+                "player_count",
+                "name",
+                "status",
+                "available_from",
+                "available_to",
+            )
+            .iterator(chunk_size=self.chunk_size)
+        )
+        while chunk := await sync_to_async(self._read_chunk)(rows):
+            for row in chunk:
+                yield row
+
+    def _read_chunk(self, rows: Iterator[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+        return list(islice(rows, self.chunk_size))
+
+    @abstractmethod
+    def encode(self, rows: AsyncIterator[tuple[Any, ...]]) -> AsyncIterator[str]:
+        ...
+
+
+class NDJSONActivityRowEncoder(ActivityRowEncoder):
+    content_type = "application/x-ndjson"
+
+    async def encode(self, rows: AsyncIterator[tuple[Any, ...]]) -> AsyncIterator[str]:
+        async for row in rows:
+            yield json.dumps(dict(zip(self.fields, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+class _Echo:
+    """A file-like object which returns what is written, for `csv.writer`."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class CSVActivityRowEncoder(ActivityRowEncoder):
+    content_type = "text/csv"
+
+    async def encode(self, rows: AsyncIterator[tuple[Any, ...]]) -> AsyncIterator[str]:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.fields)
+        async for pk, sport, level_ids, *values in rows:
+            yield writer.writerow((pk, sport, " ".join(map(str, level_ids)), *values))
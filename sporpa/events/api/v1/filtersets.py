@@ -1,28 +1,89 @@
 from django_filters import rest_framework as filters
+from psycopg2.extras import DateTimeTZRange
+from rest_framework.request import Request
 
+from django import forms
 from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 
 from events.models import Activity
-from participants.models import Sport
+from participants.models import Sport, SportLevel
+
+
+def _player_activities(request: Request) -> QuerySet[Activity]:
+    return Activity.objects.filter(players=request.user.player)
+
+
+class ActivityListFilterForm(forms.Form):
+    AM_OVERLAP = "overlap"
+    AM_CONTAINED_BY = "contained_by"
+    AVAILABLE_BETWEEN_AT_MODES = (
+        (AM_OVERLAP, _("Overlap")),
+        (AM_CONTAINED_BY, _("Contained by")),
+    )
+
+    # Not a filter, it only changes how available_between_at is applied.
+    available_between_at_mode = forms.ChoiceField(
+        choices=AVAILABLE_BETWEEN_AT_MODES,
+        required=False,
+    )
+
+
+class RankedActivityListFilterForm(ActivityListFilterForm):
+    # Not a filter, the time of a ranking which later pages rank with.
+    ranked_at = forms.DateTimeField(
+        required=False,
+    )
 
 
 class BaseActivityListFilterset(filters.FilterSet):
+    AM_OVERLAP = ActivityListFilterForm.AM_OVERLAP
+    AM_CONTAINED_BY = ActivityListFilterForm.AM_CONTAINED_BY
+
     sport = filters.ModelMultipleChoiceFilter(
         field_name="sport",
         queryset=Sport.objects.all(),
     )
+    levels = filters.ModelMultipleChoiceFilter(
+        queryset=SportLevel.objects.all(),
+        method="_filter_levels",
+        # level_ids is an array column, there is no join to deduplicate.
+        distinct=False,
+    )
     available_between_at = filters.DateTimeFromToRangeFilter(
         "available_between_at",
         method="_filter_available_between_at",
     )
 
+    def filter_queryset(self, queryset: QuerySet[Activity]) -> QuerySet[Activity]:
+        # cleaned_data also holds the plain fields of ActivityListFilterForm.
+        for name, value in self.form.cleaned_data.items():
+            if name in self.filters:
+                queryset = self.filters[name].filter(queryset, value)
+        return queryset
+
+    def _filter_levels(
+        self,
+        queryset: QuerySet[Activity],
+        name: str,
+        value: list[SportLevel],
+    ) -> QuerySet[Activity]:
+        if value:
+            queryset = queryset.filter_levels(value)
+        return queryset
+
     def _filter_available_between_at(
         self,
         queryset: QuerySet[Activity],
         name: str,
         value: slice,
     ) -> QuerySet[Activity]:
+        mode = self.form.cleaned_data.get("available_between_at_mode")
+        if mode == self.AM_OVERLAP:
+            return queryset.filter(available_between_at__overlap=DateTimeTZRange(value.start, value.stop))
+        if mode == self.AM_CONTAINED_BY:
+            return queryset.filter(available_between_at__contained_by=DateTimeTZRange(value.start, value.stop))
+
         if value.start:
             queryset = queryset.filter(available_between_at__gt=(value.start, None))
         if value.stop:
@@ -31,14 +92,57 @@ class BaseActivityListFilterset(filters.FilterSet):
 
 
 class ActivityListFilterset(BaseActivityListFilterset):
+    q = filters.CharFilter(
+        method="_filter_q",
+        max_length=200,
+    )
+    joinable = filters.BooleanFilter(
+        method="_filter_joinable",
+    )
+    ranked = filters.BooleanFilter(
+        method="_filter_ranked",
+    )
+
     class Meta:
         model = Activity
+        form = RankedActivityListFilterForm
         fields = (
             "sport",
             "levels",
             "available_between_at",
+            "q",
+            "joinable",
+            "ranked",
         )
 
+    def _filter_q(
+        self,
+        queryset: QuerySet[Activity],
+        name: str,
+        value: str,
+    ) -> QuerySet[Activity]:
+        return queryset.search(value)
+
+    def _filter_joinable(
+        self,
+        queryset: QuerySet[Activity],
+        name: str,
+        value: bool,
+    ) -> QuerySet[Activity]:
+        if value:
+            queryset = queryset.filter_eligible(self.request.user.player)
+        return queryset
+
+    def _filter_ranked(
+        self,
+        queryset: QuerySet[Activity],
+        name: str,
+        value: bool,
+    ) -> QuerySet[Activity]:
+        if value:
+            queryset = queryset.rank_relevance(self.request.user.player, self.form.cleaned_data.get("ranked_at"))
+        return queryset
+
 
 class ParticipatedActivityListFilterset(BaseActivityListFilterset):
     PT_ORGANIZER = "organizer"
@@ -58,15 +162,22 @@ class ParticipatedActivityListFilterset(BaseActivityListFilterset):
         choices=PLAYER_TYPES,
         coerce=str,
     )
+    conflicts_with = filters.ModelChoiceFilter(
+        # Only the player's own activities, others' windows are not probed.
+        queryset=_player_activities,
+        method="_filter_conflicts_with",
+    )
 
     class Meta:
         model = Activity
+        form = ActivityListFilterForm
         fields = (
             "sport",
             "levels",
             "available_between_at",
             "status",
             "player_type",
+            "conflicts_with",
         )
 
     def _filter_player_type(
@@ -80,3 +191,11 @@ class ParticipatedActivityListFilterset(BaseActivityListFilterset):
         elif value == self.PT_PARTICIPANT:
             queryset = queryset.filter_participant(self.request.user.player)
         return queryset
+
+    def _filter_conflicts_with(
+        self,
+        queryset: QuerySet[Activity],
+        name: str,
+        value: Activity,
+    ) -> QuerySet[Activity]:
+        return queryset.filter_overlapping(value)
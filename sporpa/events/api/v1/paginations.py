@@ -0,0 +1,149 @@
+import json
+from typing import Any
+
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from django.contrib.postgres.fields.ranges import RangeStartsWith
+from django.core.exceptions import ValidationError
+from django.db import models
+
+
+class KeysetCursorPagination(pagination.CursorPagination):
+    """
+    A cursor pagination that keeps the values of every ordering field in the
+    cursor, so pages are fetched with a keyset comparison instead of an offset
+    and ties on the leading field need no extra rows. No count query is run.
+
+    The last ordering field must be unique.
+    """
+
+    ordering: tuple[str, ...] = ("pk",)
+
+    def annotate_queryset(self, queryset: models.QuerySet) -> models.QuerySet:
+        return queryset
+
+    def get_ordering(
+        self,
+        request: Request,
+        queryset: models.QuerySet,
+        view: APIView | None,
+    ) -> tuple[str, ...]:
+        return self.ordering
+
+    def paginate_queryset(
+        self,
+        queryset: models.QuerySet,
+        request: Request,
+        view: APIView | None = None,
+    ) -> list | None:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        queryset = self.annotate_queryset(queryset)
+        self.ordering = self.get_ordering(request, queryset, view)
+        if self.cursor is not None and self.cursor.position is not None:
+            try:
+                queryset = queryset.filter(self._get_keyset_filter(self.cursor.position, reverse=reverse))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        ordering = self._reverse_ordering(self.ordering) if reverse else self.ordering
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None and self.cursor.position is not None
+        return self.page
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        cursor = pagination.Cursor(offset=0, reverse=False, position=self._get_position(self.page[-1]))
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        cursor = pagination.Cursor(offset=0, reverse=True, position=self._get_position(self.page[0]))
+        return self.encode_cursor(cursor)
+
+    def _get_position(self, instance: Any) -> str:
+        return json.dumps([str(getattr(instance, field.lstrip("-"))) for field in self.ordering])
+
+    def _get_keyset_filter(self, position: str, *, reverse: bool) -> models.Q:
+        values = json.loads(position)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValueError("Cursor position does not match the ordering.")
+
+        keyset_filter = models.Q()
+        for index, field in enumerate(self.ordering):
+            field_name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") != reverse else "gt"
+            equal_fields = {
+                previous_field.lstrip("-"): value for previous_field, value in zip(self.ordering[:index], values)
+            }
+            keyset_filter |= models.Q(**equal_fields, **{f"{field_name}__{lookup}": values[index]})
+        return keyset_filter
+
+    @staticmethod
+    def _reverse_ordering(ordering: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
+
+
+class ActivityCursorPagination(KeysetCursorPagination):
+    ordering = ("available_from", "pk")
+
+    def paginate_queryset(
+        self,
+        queryset: models.QuerySet,
+        request: Request,
+        view: APIView | None = None,
+    ) -> list | None:
+        page = super().paginate_queryset(queryset, request, view)
+        # The links of a ranking pass its time on, so later pages rank with
+        # the same start filter and scores as the first one.
+        ranked_at = queryset.query.annotations.get("ranked_at")
+        if ranked_at is not None:
+            self.base_url = replace_query_param(self.base_url, "ranked_at", ranked_at.value.isoformat())
+        return page
+
+    def annotate_queryset(self, queryset: models.QuerySet) -> models.QuerySet:
+        return queryset.annotate(available_from=RangeStartsWith("available_between_at"))
+
+    def get_ordering(
+        self,
+        request: Request,
+        queryset: models.QuerySet,
+        view: APIView | None,
+    ) -> tuple[str, ...]:
+        # Search results are ordered by their rank, then ranked activities
+        # by their relevance to the player.
+        if "search_rank" in queryset.query.annotations:
+            return ("-search_rank", "pk")
+        if "relevance" in queryset.query.annotations:
+            return ("-relevance", "pk")
+        return super().get_ordering(request, queryset, view)
+
+
+class ActivityFeedCursorPagination(KeysetCursorPagination):
+    ordering = ("feed_available_from", "pk")
+
+
+class ParticipationRequestCursorPagination(KeysetCursorPagination):
+    ordering = ("-created_at", "-pk")
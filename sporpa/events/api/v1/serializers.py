@@ -3,16 +3,33 @@ from typing import Any
 from drf_extra_fields.fields import DateTimeRangeField
 from rest_framework import serializers
 
+from django.db import transaction
 from django.utils.translation import gettext
 
 from accounts.models import User
-from events.models import Activity
-from events.validators import validate_now_less_than_lower_value
+from chat.ws.controls import close_activity_chat
+from events.models import Activity, ActivityPlayer, ActivitySeries
+from events.validators import validate_now_less_than_lower_value, validate_now_less_than_value
+from events.ws.deltas import DeltaType, publish_activity_delta
 from participants.api.v1.fields import CurrentPlayerDefault
-from participants.api.v1.serializers import PlayerSerializer
+from participants.api.v1.serializers import PlayerSerializer, PlayerSportSerializer
 from participants.models import ParticipationRequest, Player, PlayerSport, Sport, SportLevel
 
 
+def validate_organizer_levels(organizer: Player, sport: Sport, sport_levels: list[SportLevel]) -> None:
+    try:
+        player_sport: PlayerSport = organizer.sports.get(sport=sport)
+    except PlayerSport.DoesNotExist:
+        raise serializers.ValidationError(
+            gettext(f"The player does not have {sport.get_name_display()} record."),
+        )
+
+    if player_sport.level not in sport_levels:
+        raise serializers.ValidationError(
+            gettext(f"The player does not have the requested level for {sport.get_name_display()}."),
+        )
+
+
 class ActivityCreateSerializer(serializers.ModelSerializer):
     organizer = serializers.HiddenField(
         default=CurrentPlayerDefault(),
@@ -46,22 +63,58 @@ class ActivityCreateSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
         validated_data = super().validate(attrs)
-        organizer: Player = validated_data["organizer"]
-        sport: Sport = validated_data["sport"]
-        try:
-            player_sport: PlayerSport = organizer.sports.get(sport=sport)
-        except PlayerSport.DoesNotExist:
-            raise serializers.ValidationError(
-                gettext(f"The player does not have {sport.get_name_display()} record."),
-            )
-
-        sport_levels: list[SportLevel] = validated_data["levels"]
-        if player_sport.level not in sport_levels:
-            raise serializers.ValidationError(
-                gettext(f"The player does not have the requested level for {sport.get_name_display()}."),
-            )
+        validate_organizer_levels(validated_data["organizer"], validated_data["sport"], validated_data["levels"])
         return validated_data
 
+    def create(self, validated_data: dict[str, Any]) -> Activity:
+        # ModelSerializer sets many-to-many fields after the creation, but the
+        # levels are denormalized on the creation.
+        return Activity.objects.create(**validated_data)
+
+
+class ActivitySeriesCreateSerializer(serializers.ModelSerializer):
+    organizer = serializers.HiddenField(
+        default=CurrentPlayerDefault(),
+        write_only=True,
+    )
+    starts_at = serializers.DateTimeField(
+        validators=(validate_now_less_than_value,),
+    )
+
+    class Meta:
+        model = ActivitySeries
+        fields = (
+            "pk",
+            "sport",
+            "levels",
+            "organizer",
+            "player_limit",
+            "name",
+            "about",
+            "starts_at",
+            "duration",
+            "frequency",
+            "interval",
+            "occurrence_limit",
+            "generated_count",
+        )
+        extra_kwargs = {
+            "levels": {
+                "read_only": False,
+                "queryset": SportLevel.objects.all(),
+            },
+        }
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        validated_data = super().validate(attrs)
+        validate_organizer_levels(validated_data["organizer"], validated_data["sport"], validated_data["levels"])
+        return validated_data
+
+    def create(self, validated_data: dict[str, Any]) -> ActivitySeries:
+        # ModelSerializer sets many-to-many fields after the creation, but the
+        # occurrences are generated on the creation.
+        return ActivitySeries.objects.create(**validated_data)
+
 
 class ActivityUpdateSerializer(serializers.ModelSerializer):
     available_between_at = DateTimeRangeField(
@@ -91,6 +144,18 @@ class ActivityUpdateSerializer(serializers.ModelSerializer):
         self.instance.check_player_limit(player_limit=value)
         return value
 
+    def update(self, instance: Activity, validated_data: dict[str, Any]) -> Activity:
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            instance.sync_schedule()
+            instance.refresh_feed_entries()
+            is_cancelled = instance.status == Activity.Status.CANCELLED
+            if is_cancelled:
+                ActivityPlayer.objects.clear_membership_cache([instance.pk])
+                close_activity_chat(instance.pk)
+            publish_activity_delta(instance, DeltaType.ACTIVITY_CANCELLED if is_cancelled else None)
+        return instance
+
 
 class ParticipationRequestListSerializer(serializers.ModelSerializer):
     participant = PlayerSerializer()
@@ -105,6 +170,37 @@ class ParticipationRequestListSerializer(serializers.ModelSerializer):
         )
 
 
+class ParticipationRequestDecisionSerializer(serializers.Serializer):
+    pk = serializers.IntegerField()
+    result = serializers.ChoiceField(choices=("accept", "reject"))
+
+
+class ParticipationRequestBulkApprovalSerializer(serializers.Serializer):
+    organizer = serializers.HiddenField(
+        default=CurrentPlayerDefault(),
+        write_only=True,
+    )
+    decisions = ParticipationRequestDecisionSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=100,
+        write_only=True,
+    )
+    results = serializers.ListField(read_only=True)
+
+    def create(self, validated_data: dict[str, Any]) -> dict[str, Any]:
+        decisions = {decision["pk"]: decision["result"] for decision in validated_data["decisions"]}
+        errors = Activity.objects.approve_participation_requests(
+            validated_data["organizer"],
+            {pk: result == "accept" for pk, result in decisions.items()},
+        )
+        results = [
+            {"pk": pk, "result": decisions[pk], "succeeded": error is None, "detail": error}
+            for pk, error in errors.items()
+        ]
+        return {"results": results}
+
+
 class UserInnerSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -126,7 +222,46 @@ class PlayerInnerSerializer(serializers.ModelSerializer):
         )
 
 
+class ParticipantInnerSerializer(PlayerInnerSerializer):
+    sports = PlayerSportSerializer(many=True)
+
+    class Meta:
+        model = Player
+        fields = (
+            "pk",
+            "user",
+            "sports",
+        )
+
+
+class ParticipationRequestInboxActivitySerializer(serializers.Serializer):
+    pk = serializers.IntegerField(source="activity_id")
+    name = serializers.CharField(source="activity.name")
+    available_between_at = DateTimeRangeField(source="activity.available_between_at")
+    pending_count = serializers.IntegerField(source="activity_pending_count")
+
+
+class ParticipationRequestInboxSerializer(serializers.ModelSerializer):
+    activity = ParticipationRequestInboxActivitySerializer(source="*")
+    participant = ParticipantInnerSerializer()
+
+    class Meta:
+        model = ParticipationRequest
+        fields = (
+            "pk",
+            "activity",
+            "participant",
+            "created_at",
+            "message",
+        )
+
+
 class ActivityListSerializer(serializers.ModelSerializer):
+    levels = serializers.ListField(
+        source="level_ids",
+        child=serializers.IntegerField(),
+        read_only=True,
+    )
     organizer = PlayerInnerSerializer(read_only=True)
     participants = PlayerInnerSerializer(read_only=True, many=True)
     available_between_at = DateTimeRangeField()
@@ -145,9 +280,3 @@ class ActivityListSerializer(serializers.ModelSerializer):
             "available_between_at",
             "status",
         )
-        extra_kwargs = {
-            "levels": {
-                "read_only": False,
-                "queryset": SportLevel.objects.all(),
-            },
-        }
@@ -1,10 +1,16 @@
 from django.urls import path, re_path
 
 from .views import (
+    ActivityFacetsView,
+    ActivityFeedView,
     ActivityListCreateView,
+    ActivitySeriesCreateView,
     ActivityUpdateView,
+    ParticipatedActivityExportView,
     ParticipatedActivityListView,
     ParticipationRequestApprovalView,
+    ParticipationRequestBulkApprovalView,
+    ParticipationRequestInboxView,
     ParticipationRequestListView,
 )
 
@@ -15,16 +21,41 @@ urlpatterns = [
         ActivityListCreateView.as_view(),
         name="activities",
     ),
+    path(
+        "activities/facets/",
+        ActivityFacetsView.as_view(),
+        name="activities_facets",
+    ),
+    path(
+        "activities/feed/",
+        ActivityFeedView.as_view(),
+        name="activities_feed",
+    ),
     path(
         "activities/<int:pk>/",
         ActivityUpdateView.as_view(),
         name="activities_update",
     ),
+    path(
+        "activity-series/",
+        ActivitySeriesCreateView.as_view(),
+        name="activity_series",
+    ),
     path(
         "activities/<int:activity_pk>/participation-requests/",
         ParticipationRequestListView.as_view(),
         name="participation_requests",
     ),
+    path(
+        "participation-requests/inbox/",
+        ParticipationRequestInboxView.as_view(),
+        name="participation_requests_inbox",
+    ),
+    path(
+        "participation-requests/approvals/",
+        ParticipationRequestBulkApprovalView.as_view(),
+        name="participation_requests_bulk_approval",
+    ),
     re_path(
         r"^participation-requests/(?P<pk>\d+)/(?P<result>accept|reject)/$",
         ParticipationRequestApprovalView.as_view(),
@@ -35,4 +66,9 @@ urlpatterns = [
         ParticipatedActivityListView.as_view(),
         name="participated_activities",
     ),
+    re_path(
+        r"^participated-activities/export\.(?P<export_format>ndjson|csv)$",
+        ParticipatedActivityExportView.as_view(),
+        name="participated_activities_export",
+    ),
 ]
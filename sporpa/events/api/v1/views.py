@@ -1,25 +1,36 @@
+import hashlib
 from typing import Any, Type
+from urllib.parse import urlencode
 
 from rest_framework import generics
 from rest_framework import status as http_status
 from rest_framework import views
+from rest_framework.request import Request
 from rest_framework.response import Response
 
-from django.db.models import QuerySet
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, QuerySet, Subquery
+from django.http import StreamingHttpResponse
 
 from events.models import Activity
 from participants.models import ParticipationRequest
 
+from .exports import ActivityRowEncoder, CSVActivityRowEncoder, NDJSONActivityRowEncoder
 from .filtersets import ActivityListFilterset, ParticipatedActivityListFilterset
+from .paginations import ActivityCursorPagination, ActivityFeedCursorPagination, ParticipationRequestCursorPagination
 from .serializers import (
     ActivityCreateSerializer,
     ActivityListSerializer,
+    ActivitySeriesCreateSerializer,
     ActivityUpdateSerializer,
+    ParticipationRequestBulkApprovalSerializer,
+    ParticipationRequestInboxSerializer,
     ParticipationRequestListSerializer,
 )
 
 
 class ActivityListCreateView(generics.ListCreateAPIView):
+    pagination_class = ActivityCursorPagination
     filterset_class = ActivityListFilterset
 
     def get_serializer_class(self) -> Type[ActivityListSerializer | ActivityCreateSerializer]:
@@ -27,9 +38,44 @@ class ActivityListCreateView(generics.ListCreateAPIView):
             return ActivityListSerializer
         return ActivityCreateSerializer
 
+    def get_queryset(self) -> QuerySet[Activity]:
+        return Activity.objects.filter_available(self.request.user.player).with_roster()
+
+
+class ActivityFeedView(generics.ListAPIView):
+    pagination_class = ActivityFeedCursorPagination
+    serializer_class = ActivityListSerializer
+
+    def get_queryset(self) -> QuerySet[Activity]:
+        return Activity.objects.filter_feed(self.request.user.player).with_roster()
+
+
+class ActivityFacetsView(generics.GenericAPIView):
+    filterset_class = ActivityListFilterset
+    # Seconds to cache the facet counts of a filter for, 0 disables caching.
+    cache_timeout = 30
+
     def get_queryset(self) -> QuerySet[Activity]:
         return Activity.objects.filter_available(self.request.user.player)
 
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        cache_key = "activity-facets:{}:{}".format(
+            request.user.pk,
+            hashlib.md5(urlencode(sorted(request.query_params.lists()), doseq=True).encode()).hexdigest(),
+        )
+        facet_counts = cache.get(cache_key)
+        if facet_counts is None:
+            facet_counts = self.filter_queryset(self.get_queryset()).facet_counts()
+            cache.set(cache_key, facet_counts, self.cache_timeout)
+
+        return Response(
+            {
+                "sports": [{"sport": key, "count": count} for key, count in facet_counts["sports"].items()],
+                "levels": [{"level": key, "count": count} for key, count in facet_counts["levels"].items()],
+                "days": [{"day": key, "count": count} for key, count in facet_counts["days"].items()],
+            },
+        )
+
 
 class ActivityUpdateView(generics.UpdateAPIView):
     serializer_class = ActivityUpdateSerializer
@@ -40,14 +86,40 @@ class ActivityUpdateView(generics.UpdateAPIView):
         )
 
 
+class ActivitySeriesCreateView(generics.CreateAPIView):
+    serializer_class = ActivitySeriesCreateSerializer
+
+
 class ParticipationRequestListView(generics.ListAPIView):
     serializer_class = ParticipationRequestListSerializer
     lookup_field = "activity_pk"
 
     def get_queryset(self) -> QuerySet[Activity]:
         activity_pk = self.kwargs[self.lookup_field]
-        return ParticipationRequest.objects.filter_organizer(self.request.user.player).filter(
-            activity=activity_pk,
+        return (
+            ParticipationRequest.objects.filter_organizer(self.request.user.player)
+            .filter(activity=activity_pk)
+            .prefetch_related("participant__sports")
+        )
+
+
+class ParticipationRequestInboxView(generics.ListAPIView):
+    pagination_class = ParticipationRequestCursorPagination
+    serializer_class = ParticipationRequestInboxSerializer
+
+    def get_queryset(self) -> QuerySet[ParticipationRequest]:
+        pending_counts = (
+            ParticipationRequest.objects.filter(activity=OuterRef("activity"))
+            .order_by()
+            .values("activity")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return (
+            ParticipationRequest.objects.filter_pending(self.request.user.player)
+            .annotate(activity_pending_count=Subquery(pending_counts))
+            .select_related("activity", "participant__user")
+            .prefetch_related("participant__sports")
         )
 
 
@@ -67,9 +139,44 @@ class ParticipationRequestApprovalView(views.APIView):
         return Response({}, status=http_status.HTTP_204_NO_CONTENT)
 
 
+class ParticipationRequestBulkApprovalView(generics.CreateAPIView):
+    serializer_class = ParticipationRequestBulkApprovalSerializer
+
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=http_status.HTTP_200_OK)
+
+
 class ParticipatedActivityListView(generics.ListAPIView):
+    pagination_class = ActivityCursorPagination
     serializer_class = ActivityListSerializer
     filterset_class = ParticipatedActivityListFilterset
 
+    def get_queryset(self) -> QuerySet[Activity]:
+        return Activity.objects.filter(players=self.request.user.player).with_roster()
+
+
+class ParticipatedActivityExportView(generics.GenericAPIView):
+    filterset_class = ParticipatedActivityListFilterset
+    encoder_classes: dict[str, Type[ActivityRowEncoder]] = {
+        "ndjson": NDJSONActivityRowEncoder,
+        "csv": CSVActivityRowEncoder,
+    }
+
     def get_queryset(self) -> QuerySet[Activity]:
         return Activity.objects.filter(players=self.request.user.player)
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        export_format: str = kwargs["export_format"]
+        encoder = self.encoder_classes[export_format]()
+        # Filters are validated here, the rows are read while streaming.
+        rows = encoder.get_rows(self.filter_queryset(self.get_queryset()))
+        # The stubs predate async streaming content.
+        response = StreamingHttpResponse(
+            encoder.encode(rows),  # type: ignore[arg-type]
+            content_type=encoder.content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="activities.{export_format}"'
+        return response
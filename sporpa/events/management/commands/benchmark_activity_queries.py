@@ -0,0 +1,149 @@
+import statistics
+import time
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from events.api.v1.filtersets import ActivityListFilterset
+from events.models import Activity
+from participants.models import Player, SportLevel
+
+SEED_ACTIVITIES_SQL = """
+    WITH seeded AS (
+        INSERT INTO activity (
+            is_active, created_at, organizer_id, sport_id, player_limit, player_count,
+            name, about, available_between_at, status, level_ids
+        )
+        SELECT
+            TRUE,
+            now(),
+            %(organizer)s,
+            1 + i %% 5,
+            10,
+            1 + i %% 10,
+            'Benchmark activity ' || i,
+            '',
+            tstzrange(lower_at, lower_at + interval '2 hours'),
+            CASE WHEN lower_at < now() THEN %(played)s ELSE %(open)s END,
+            ARRAY[1 + i %% 5, 1 + (i + 1) %% 5]::smallint[]
+        FROM (
+            SELECT i, now() - interval '3 years' + (random() * interval '3 years 1 month') AS lower_at
+            FROM generate_series(1, %(total)s) AS i
+        ) AS seed
+        RETURNING id, level_ids
+    )
+    INSERT INTO activity_level (activity_id, level_id)
+    SELECT id, unnest(level_ids) FROM seeded
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds synthetic historical activities inside a rolled back transaction and measures "
+        "how the latency of activity discovery queries grows with the table size."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000, 1_000_000],
+            help="Table sizes to measure at, in ascending order.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of runs per query, the median is reported.",
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Print the query plan of every query at every size.",
+        )
+
+    def get_scenarios(self, player: Player) -> dict[str, Callable[[], models.QuerySet[Activity]]]:
+        now = timezone.datetime.now()
+        window = {
+            "sport": [1],
+            "available_between_at_after": now + timezone.timedelta(days=3),
+            "available_between_at_before": now + timezone.timedelta(days=4),
+        }
+        queryset = Activity.objects.filter(status=Activity.Status.OPEN)
+        return {
+            "time_window_overlap": lambda: ActivityListFilterset(
+                data={**window, "available_between_at_mode": ActivityListFilterset.AM_OVERLAP},
+                queryset=queryset,
+            ).qs,
+            "time_window_contained_by": lambda: ActivityListFilterset(
+                data={**window, "available_between_at_mode": ActivityListFilterset.AM_CONTAINED_BY},
+                queryset=queryset,
+            ).qs,
+            "levels": lambda: ActivityListFilterset(
+                data={**window, "levels": [1, 2]},
+                queryset=queryset,
+            ).qs,
+            "levels_through_join": lambda: ActivityListFilterset(
+                data=window,
+                queryset=queryset,
+            )
+            .qs.filter(levels__in=[1, 2])
+            .distinct(),
+            "full_text_search": lambda: ActivityListFilterset(
+                data={"q": "activity 4242"},
+                queryset=queryset,
+            ).qs.order_by("-search_rank", "pk"),
+            "expired_open": lambda: Activity.objects.filter_expired(now).order_by(
+                "available_between_at__endswith",
+                "pk",
+            ),
+            "unranked": lambda: queryset.order_by("available_between_at__startswith", "pk"),
+            "ranked": lambda: queryset.rank_relevance(player, now).order_by("-relevance", "pk"),
+        }
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            player = User.objects.create_user("benchmark@sporpa.invalid", "").player
+            player.sports.create(sport_id=1, level_id=SportLevel.Level.INTERMEDIATE)
+            scenarios = self.get_scenarios(player)
+            total_seeded = Activity.all_objects.count()
+            for size in sorted(options["sizes"]):
+                if size > total_seeded:
+                    self._seed(size - total_seeded, player)
+                    total_seeded = size
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{total_seeded} activities"))
+                for name, get_queryset in scenarios.items():
+                    queryset = get_queryset()[:20]
+                    durations = []
+                    for _ in range(options["repeat"]):
+                        started_at = time.perf_counter()
+                        list(queryset.all())
+                        durations.append(time.perf_counter() - started_at)
+
+                    plan = queryset.explain()
+                    uses_index = "Seq Scan on activity" not in plan
+                    self.stdout.write(
+                        f"  {name}: {statistics.median(durations) * 1000:.2f} ms "
+                        f"({'index scan' if uses_index else 'sequential scan'})"
+                    )
+                    if options["explain"]:
+                        self.stdout.write(plan)
+            transaction.set_rollback(True)
+
+    def _seed(self, total: int, organizer: Player) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                SEED_ACTIVITIES_SQL,
+                {
+                    "total": total,
+                    "organizer": organizer.pk,
+                    "open": Activity.Status.OPEN,
+                    "played": Activity.Status.PLAYED,
+                },
+            )
+            cursor.execute(f"ANALYZE {Activity._meta.db_table}")
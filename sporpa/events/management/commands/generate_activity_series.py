@@ -0,0 +1,23 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from events.models import ActivitySeries
+
+
+class Command(BaseCommand):
+    help = "Materializes the upcoming occurrences of activity series in the rolling generation window."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=ActivitySeries.GENERATION_WINDOW.days,
+            help="Size of the generation window in days.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        until = timezone.datetime.now() + timezone.timedelta(days=options["days"])
+        total_created = ActivitySeries.objects.generate_occurrences(until)
+        self.stdout.write(self.style.SUCCESS(f"Created {total_created} activities."))
@@ -0,0 +1,22 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from events.models import ActivityFeedEntry
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the precomputed discovery feed entries of all or the given players."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--player",
+            type=int,
+            action="append",
+            dest="players",
+            help="Primary key of a player to rebuild the feed of, can be repeated.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        total_created = ActivityFeedEntry.objects.refresh(players=options["players"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the activity feed with {total_created} entries."))
@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from events.models import Activity
+from events.tasks import sweep_expired_activities
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer.")
+    return number
+
+
+class Command(BaseCommand):
+    help = "Moves the open activities which have ended to played, in bounded chunks."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=positive_int,
+            default=500,
+            help="Number of activities updated per transaction.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between chunks, gives vacuum and replicas time to catch up.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running and sweep every given seconds instead of sweeping once.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["interval"] is not None:
+            asyncio.run(
+                sweep_expired_activities(
+                    interval=options["interval"],
+                    batch_size=options["batch_size"],
+                    pause=options["pause"],
+                ),
+            )
+            return
+
+        total_updated = Activity.objects.mark_expired_as_played(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Marked {total_updated} activities as played."))
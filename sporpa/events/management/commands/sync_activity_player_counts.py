@@ -0,0 +1,44 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import models, transaction
+
+from events.models import Activity, ActivityPlayer
+
+
+class Command(BaseCommand):
+    help = "Verifies the denormalized Activity.player_count column and repairs drifted rows."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drifted activities, exit with a non-zero status if there are any.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        actual_player_count = models.Subquery(
+            ActivityPlayer.objects.filter(activity=models.OuterRef("pk"))
+            .values("activity")
+            .annotate(total=models.Count("pk"))
+            .values("total"),
+        )
+        drifted_activities = Activity.all_objects.annotate(
+            actual_player_count=models.functions.Coalesce(actual_player_count, 0),
+        ).exclude(player_count=models.F("actual_player_count"))
+
+        if options["check"]:
+            total_drifted = drifted_activities.count()
+            if total_drifted:
+                raise CommandError(f"{total_drifted} activities have a drifted player count.")
+            self.stdout.write(self.style.SUCCESS("All player counts are in sync."))
+            return
+
+        with transaction.atomic():
+            drifted_activity_ids = list(
+                drifted_activities.select_for_update(of=("self",)).values_list("pk", flat=True)
+            )
+            Activity.all_objects.filter(pk__in=drifted_activity_ids).update(
+                player_count=models.functions.Coalesce(actual_player_count, 0),
+            )
+        self.stdout.write(self.style.SUCCESS(f"Repaired player count of {len(drifted_activity_ids)} activities."))
@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+def backfill_player_count(apps, schema_editor):
+    Activity = apps.get_model("events", "Activity")
+    ActivityPlayer = apps.get_model("events", "ActivityPlayer")
+    Activity.objects.update(
+        player_count=models.functions.Coalesce(
+            models.Subquery(
+                ActivityPlayer.objects.filter(activity=models.OuterRef("pk"))
+                .values("activity")
+                .annotate(total=models.Count("pk"))
+                .values("total"),
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0002_alter_activity_available_between_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activity",
+            name="player_count",
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name="number of players"),
+        ),
+        migrations.RunPython(backfill_player_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="activity",
+            index=models.Index(
+                condition=models.Q(("player_count__lt", models.F("player_limit"))),
+                fields=["status"],
+                name="activity_has_seats_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 14:13
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0003_activity_player_count"),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddIndex(
+            model_name="activity",
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=["status", "sport", "available_between_at"], name="activity_time_window_idx"
+            ),
+        ),
+    ]
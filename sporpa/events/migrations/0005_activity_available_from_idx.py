@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 14:16
+
+import django.contrib.postgres.fields.ranges
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0004_activity_time_window_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activity",
+            index=models.Index(
+                django.contrib.postgres.fields.ranges.RangeStartsWith("available_between_at"),
+                models.F("id"),
+                name="activity_available_from_idx",
+            ),
+        ),
+    ]
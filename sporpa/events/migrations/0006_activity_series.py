@@ -0,0 +1,132 @@
+# Generated by Django 4.2 on 2026-10-18 14:47
+
+import datetime
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("participants", "0004_participationrequest_activity_participant_unique"),
+        ("events", "0005_activity_available_from_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivitySeries",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Designates whether this record should be treated as active. Unselect this instead of deleting records.",
+                        verbose_name="active",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="created at")),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Enter a datetime instead when you delete the record.",
+                        null=True,
+                        verbose_name="deleted at",
+                    ),
+                ),
+                (
+                    "player_limit",
+                    models.PositiveSmallIntegerField(
+                        default=2,
+                        validators=[
+                            django.core.validators.MinValueValidator(2),
+                            django.core.validators.MaxValueValidator(30),
+                        ],
+                        verbose_name="maximum number of players",
+                    ),
+                ),
+                ("name", models.CharField(max_length=150, verbose_name="name")),
+                ("about", models.TextField(blank=True, max_length=600, verbose_name="about")),
+                ("starts_at", models.DateTimeField(verbose_name="starts at")),
+                (
+                    "duration",
+                    models.DurationField(
+                        validators=[django.core.validators.MinValueValidator(datetime.timedelta(seconds=60))],
+                        verbose_name="duration",
+                    ),
+                ),
+                (
+                    "frequency",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "Daily"), (2, "Weekly")], default=2, verbose_name="frequency"
+                    ),
+                ),
+                (
+                    "interval",
+                    models.PositiveSmallIntegerField(
+                        default=1, validators=[django.core.validators.MinValueValidator(1)], verbose_name="interval"
+                    ),
+                ),
+                (
+                    "occurrence_limit",
+                    models.PositiveSmallIntegerField(
+                        blank=True,
+                        help_text="Leave empty for a series without an end.",
+                        null=True,
+                        validators=[django.core.validators.MinValueValidator(1)],
+                        verbose_name="number of occurrences",
+                    ),
+                ),
+                (
+                    "generated_count",
+                    models.PositiveIntegerField(
+                        default=0, editable=False, verbose_name="number of generated occurrences"
+                    ),
+                ),
+                (
+                    "levels",
+                    models.ManyToManyField(
+                        related_name="activity_series", to="participants.sportlevel", verbose_name="level"
+                    ),
+                ),
+                (
+                    "organizer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="activity_series",
+                        to="participants.player",
+                        verbose_name="organizer",
+                    ),
+                ),
+                (
+                    "sport",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="activity_series",
+                        to="participants.sport",
+                        verbose_name="sport",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "activity series",
+                "verbose_name_plural": "activity series",
+                "db_table": "activity_series",
+            },
+        ),
+        migrations.AddField(
+            model_name="activity",
+            name="series",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="activities",
+                to="events.activityseries",
+                verbose_name="series",
+            ),
+        ),
+    ]
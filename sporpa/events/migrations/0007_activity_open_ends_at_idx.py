@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 14:53
+
+import django.contrib.postgres.fields.ranges
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_activity_series"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activity",
+            index=models.Index(
+                django.contrib.postgres.fields.ranges.RangeEndsWith("available_between_at"),
+                models.F("id"),
+                condition=models.Q(("status", 1)),
+                name="activity_open_ends_at_idx",
+            ),
+        ),
+    ]
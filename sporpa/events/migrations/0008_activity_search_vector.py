@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-18 15:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+import utils.models.generated_field
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0007_activity_open_ends_at_idx"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name="activity",
+                    name="search_vector",
+                    field=utils.models.generated_field.GeneratedSearchVectorField(
+                        editable=False, null=True, verbose_name="search vector"
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql="""
+                        ALTER TABLE activity ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                            setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+                            || setweight(to_tsvector('simple', coalesce(about, '')), 'B')
+                        ) STORED
+                    """,
+                    reverse_sql="ALTER TABLE activity DROP COLUMN search_vector",
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="activity",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="activity_search_vector_idx"
+            ),
+        ),
+    ]
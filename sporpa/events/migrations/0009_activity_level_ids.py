@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-18 15:08
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import migrations, models
+
+
+def backfill_level_ids(apps, schema_editor):
+    Activity = apps.get_model("events", "Activity")
+    ActivityLevel = apps.get_model("events", "ActivityLevel")
+    Activity.objects.update(
+        level_ids=ArraySubquery(
+            ActivityLevel.objects.filter(activity=models.OuterRef("pk")).order_by("level").values("level"),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0008_activity_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activity",
+            name="level_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.PositiveSmallIntegerField(),
+                default=list,
+                editable=False,
+                help_text="Denormalized copy of levels.",
+                size=None,
+                verbose_name="level ids",
+            ),
+        ),
+        migrations.RunPython(backfill_level_ids, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="activity",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["level_ids"], name="activity_level_ids_idx"),
+        ),
+    ]
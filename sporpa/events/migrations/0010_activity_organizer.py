@@ -0,0 +1,50 @@
+# Generated by Django 4.2 on 2026-10-18 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_organizer(apps, schema_editor):
+    Activity = apps.get_model("events", "Activity")
+    ActivityPlayer = apps.get_model("events", "ActivityPlayer")
+    Activity.objects.update(
+        organizer=models.Subquery(
+            ActivityPlayer.objects.filter(activity=models.OuterRef("pk"), is_organizer=True).values("player")[:1],
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("participants", "0004_participationrequest_activity_participant_unique"),
+        ("events", "0009_activity_level_ids"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activity",
+            name="organizer",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Denormalized copy of the activity player which is the organizer.",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="organized_activities",
+                to="participants.player",
+                verbose_name="organizer",
+            ),
+        ),
+        migrations.RunPython(backfill_organizer, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="activity",
+            name="organizer",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Denormalized copy of the activity player which is the organizer.",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="organized_activities",
+                to="participants.player",
+                verbose_name="organizer",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 15:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("participants", "0004_participationrequest_activity_participant_unique"),
+        ("events", "0010_activity_organizer"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activityplayer",
+            index=models.Index(fields=["player", "activity"], name="activity_player_player_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="activityplayer",
+            index=models.Index(
+                condition=models.Q(("is_organizer", False)),
+                fields=["player", "activity"],
+                name="activity_player_joined_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="activityplayer",
+            name="player",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="activity_players",
+                to="participants.player",
+                verbose_name="player",
+            ),
+        ),
+    ]
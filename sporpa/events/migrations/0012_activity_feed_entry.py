@@ -0,0 +1,78 @@
+# Generated by Django 4.2 on 2026-10-18 15:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL_FEED_ENTRIES_SQL = """
+    INSERT INTO activity_feed_entry (player_id, activity_id, available_from)
+    SELECT player_sport.player_id, activity.id, lower(activity.available_between_at)
+    FROM activity
+    INNER JOIN player_sport
+        ON player_sport.sport_id = activity.sport_id
+        AND player_sport.level_id = ANY(activity.level_ids)
+    WHERE activity.is_active
+        AND activity.status = 1
+        AND activity.player_count < activity.player_limit
+        AND NOT EXISTS (
+            SELECT FROM activity_player
+            WHERE activity_player.activity_id = activity.id
+                AND activity_player.player_id = player_sport.player_id
+        )
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("participants", "0004_participationrequest_activity_participant_unique"),
+        ("events", "0011_activity_player_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityFeedEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "available_from",
+                    models.DateTimeField(
+                        help_text="Denormalized copy of the lower value of the activity's available_between_at.",
+                        verbose_name="available from",
+                    ),
+                ),
+                (
+                    "activity",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="feed_entries",
+                        to="events.activity",
+                        verbose_name="activity",
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="activity_feed_entries",
+                        to="participants.player",
+                        verbose_name="player",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "activity feed entry",
+                "verbose_name_plural": "activity feed entries",
+                "db_table": "activity_feed_entry",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="activityfeedentry",
+            index=models.Index(fields=["player", "available_from", "activity"], name="activity_feed_entry_player_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="activityfeedentry",
+            constraint=models.UniqueConstraint(fields=("activity", "player"), name="activity_feed_entry_unique"),
+        ),
+        migrations.RunSQL(BACKFILL_FEED_ENTRIES_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-18 15:55
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0012_activity_feed_entry"),
+        ("participants", "0005_player_exclusive_schedule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activityplayer",
+            name="available_between_at",
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(
+                editable=False,
+                help_text="Denormalized copy of the activity's available_between_at while it is open and the player has an exclusive schedule.",
+                null=True,
+                verbose_name="available between at",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="activityplayer",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(("available_between_at__isnull", False)),
+                expressions=(("player", "="), ("available_between_at", "&&")),
+                name="activity_player_exclusive_schedule",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-18 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0013_activity_player_exclusive_schedule"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="activityplayer",
+            name="activity_player_player_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="activityplayer",
+            name="activity_player_joined_idx",
+        ),
+        migrations.AddIndex(
+            model_name="activityplayer",
+            index=models.Index(
+                fields=["player", "activity"], include=("is_organizer",), name="activity_player_player_idx"
+            ),
+        ),
+    ]
@@ -1,9 +1,13 @@
 from .activity import Activity
+from .activity_feed_entry import ActivityFeedEntry
 from .activity_level import ActivityLevel
 from .activity_player import ActivityPlayer
+from .activity_series import ActivitySeries
 
 __all__ = [
     "Activity",
+    "ActivityFeedEntry",
     "ActivityLevel",
     "ActivityPlayer",
+    "ActivitySeries",
 ]
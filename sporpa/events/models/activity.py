@@ -1,31 +1,305 @@
-from typing import Any
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Iterable
 
-from django.contrib.postgres.fields import DateTimeRangeField
+from psycopg2.extras import DateTimeTZRange
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.fields import ArrayField, DateTimeRangeField
+from django.contrib.postgres.fields.ranges import RangeEndsWith, RangeStartsWith
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.core import validators
-from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db import connection, models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from chat.ws.controls import revoke_activity_chat_members
 from events.validators import validate_now_less_than_lower_value
-from participants.models import ParticipationRequest, Player, PlayerSport
-from utils.models import TrackingManagerMixin, TrackingMixin
+from events.ws.deltas import DeltaType, publish_activity_delta, publish_participation_request_delta
+from participants.models import ParticipationRequest, Player, PlayerSport, Sport, SportLevel
+from utils.models import GeneratedSearchVectorField, TrackingManagerMixin, TrackingMixin
+
+from .activity_feed_entry import ActivityFeedEntry
+from .activity_level import ActivityLevel
+from .activity_player import ActivityPlayer
+
+FACET_COUNTS_SQL = """
+    SELECT
+        activities.sport_id,
+        activity_level.level_id,
+        activities.available_from::date AS day,
+        GROUPING(activities.sport_id, activity_level.level_id, activities.available_from::date),
+        COUNT(DISTINCT activities.id)
+    FROM ({activities}) AS activities (id, sport_id, available_from)
+    LEFT JOIN {activity_level} AS activity_level ON activity_level.activity_id = activities.id
+    GROUP BY GROUPING SETS (
+        (activities.sport_id),
+        (activity_level.level_id),
+        (activities.available_from::date)
+    )
+"""
+
+# Language agnostic, names are mostly proper nouns and free text is mixed.
+SEARCH_CONFIG = "simple"
+
+# Weights of the relevance components, which are each between 0 and 1.
+RELEVANCE_WEIGHTS = {"level": 0.5, "start": 0.3, "seats": 0.2}
+
+
+def _eligible_player_sports(
+    participant: Player | int | models.F,
+    activity_path: str = "",
+) -> models.QuerySet[PlayerSport]:
+    return PlayerSport.objects.filter(
+        # level = ANY(activity.level_ids)
+        models.Func(
+            models.F("level"),
+            models.OuterRef(f"{activity_path}level_ids"),
+            template="%(expressions)s)",
+            arg_joiner=" = ANY(",
+            output_field=models.BooleanField(),
+        ),
+        player=participant,
+        sport=models.OuterRef(f"{activity_path}sport"),
+    )
+
+
+def _conflicting_activity_players(
+    participant: Player | int | models.F,
+    activity_path: str = "",
+) -> models.QuerySet[ActivityPlayer]:
+    # The time windows are compared with && on the GiST index of activity.
+    return ActivityPlayer.objects.filter(
+        player=participant,
+        activity__status__in=Activity.UPDATABLE_STATUSES,
+        activity__available_between_at__overlap=models.OuterRef(f"{activity_path}available_between_at"),
+    ).exclude(activity=models.OuterRef(f"{activity_path}pk"))
+
+
+def _overlap(range1: DateTimeTZRange, range2: DateTimeTZRange) -> bool:
+    # Like && of the time windows, for windows not stored yet.
+    def precedes(range1: DateTimeTZRange, range2: DateTimeTZRange) -> bool:
+        if range1.upper_inf or range2.lower_inf:
+            return False
+        return range1.upper < range2.lower or (
+            range1.upper == range2.lower and not (range1.upper_inc and range2.lower_inc)
+        )
+
+    return not (range1.isempty or range2.isempty or precedes(range1, range2) or precedes(range2, range1))
+
+
+def _level_distance(level: models.Expression | models.F) -> models.Func:
+    # (SELECT MIN(ABS(activity_level - level))
+    #  FROM unnest(level_ids) AS activity_level)
+    return models.Func(
+        level,
+        models.F("level_ids"),
+        template="(SELECT MIN(ABS(activity_level - %(expressions)s) AS activity_level)",
+        arg_joiner=")) FROM unnest(",
+        output_field=models.IntegerField(),
+    )
+
+
+def ineligibility_expression(
+    participant: Player | int | models.F,
+    activity_path: str = "",
+) -> models.Case:
+    """
+    Returns the first reason why the participant cannot join the activity, or
+    None if they can. `activity_path` is the lookup from the queried model to
+    the activity, e.g. "activity__" for participation requests, whose
+    participant can then be passed as OuterRef("participant").
+    """
+    Ineligibility = Activity.Ineligibility
+    participant_players = ActivityPlayer.objects.filter(
+        activity=models.OuterRef(f"{activity_path}pk"),
+        player=participant,
+    )
+    # The organizer is compared in the outer query itself, not in a subquery.
+    organizer = models.F(participant.name) if isinstance(participant, models.OuterRef) else participant
+    return models.Case(
+        models.When(
+            ~models.Q(**{f"{activity_path}status__in": Activity.UPDATABLE_STATUSES}),
+            then=models.Value(Ineligibility.NOT_UPDATABLE),
+        ),
+        models.When(
+            models.Q(**{f"{activity_path}player_limit__lte": models.F(f"{activity_path}player_count")}),
+            then=models.Value(Ineligibility.FULLY_BOOKED),
+        ),
+        models.When(
+            models.Q(**{f"{activity_path}organizer": organizer}),
+            then=models.Value(Ineligibility.ORGANIZER),
+        ),
+        models.When(
+            models.Exists(participant_players),
+            then=models.Value(Ineligibility.ALREADY_JOINED),
+        ),
+        models.When(
+            ~models.Exists(
+                PlayerSport.objects.filter(player=participant, sport=models.OuterRef(f"{activity_path}sport")),
+            ),
+            then=models.Value(Ineligibility.NO_SPORT),
+        ),
+        models.When(
+            ~models.Exists(_eligible_player_sports(participant, activity_path)),
+            then=models.Value(Ineligibility.INELIGIBLE_LEVEL),
+        ),
+        models.When(
+            models.Exists(_conflicting_activity_players(participant, activity_path)),
+            then=models.Value(Ineligibility.SCHEDULE_CONFLICT),
+        ),
+        default=None,
+        output_field=models.CharField(choices=Ineligibility.choices),
+    )
 
 
 class ActivityManager(TrackingManagerMixin):
     def create(self, **kwargs: Any) -> "Activity":
         organizer: Player = kwargs.pop("organizer")
-        activity: Activity = super().create(**kwargs)
-        activity.players.add(organizer, through_defaults={"is_organizer": True})
+        levels: Iterable[SportLevel | int] = kwargs.pop("levels", [])
+        level_ids = sorted({level if isinstance(level, int) else level.pk for level in levels})
+        with transaction.atomic():
+            activity: Activity = super().create(organizer=organizer, player_count=1, level_ids=level_ids, **kwargs)
+            activity.players.add(organizer, through_defaults={"is_organizer": True})
+            ActivityPlayer.objects.clear_membership_cache([activity.pk])
+            if organizer.exclusive_schedule:
+                activity.activity_players.sync_schedule()
+            ActivityLevel.objects.bulk_create(
+                ActivityLevel(activity=activity, level_id=level_id) for level_id in level_ids
+            )
+            ActivityFeedEntry.objects.refresh(activities=[activity])
+            publish_activity_delta(activity, DeltaType.ACTIVITY_CREATED)
         return activity
 
+    def mark_expired_as_played(self, batch_size: int = 500, pause: float = 0) -> int:
+        """
+        Moves the open activities which have ended to played in chunks of
+        `batch_size`, each in its own short transaction, and returns the
+        number of the updated activities. Rows locked by other transactions
+        are skipped until the next run, so the sweep never waits on a lock and
+        can be stopped and resumed at any time.
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1.")
+        now = timezone.datetime.now()
+        total_updated = 0
+        while True:
+            with transaction.atomic():
+                activity_ids = list(
+                    self.filter_expired(now)
+                    .select_for_update(skip_locked=True)
+                    .order_by("available_between_at__endswith", "pk")
+                    .values_list("pk", flat=True)[:batch_size],
+                )
+                total_updated += self.filter(pk__in=activity_ids).update(status=self.model.Status.PLAYED)
+                ActivityFeedEntry.objects.filter(activity__in=activity_ids).delete()
+                ActivityPlayer.objects.filter(
+                    activity__in=activity_ids,
+                    available_between_at__isnull=False,
+                ).update(available_between_at=None)
+            if len(activity_ids) < batch_size:
+                return total_updated
+            time.sleep(pause)
+
+    def approve_participation_requests(
+        self,
+        organizer: Player | int,
+        decisions: dict[int, bool],
+    ) -> dict[int, str | None]:
+        """
+        Accepts (True) or rejects (False) the organizer's participation
+        requests in a single transaction. Returns the error of every request,
+        or None if its decision is applied.
+        """
+        errors: dict[int, str | None] = {pk: gettext("Not found.") for pk in decisions}
+        with transaction.atomic():
+            activities: dict[int, Activity] = {
+                activity.pk: activity
+                for activity in self.filter_organizer(organizer)
+                .filter(participation_requests__in=decisions)
+                .select_for_update(of=("self",))
+                .order_by("pk")
+            }
+            participation_requests = (
+                ParticipationRequest.objects.filter(
+                    pk__in=decisions,
+                    activity__in=activities,
+                )
+                .annotate(
+                    ineligibility=ineligibility_expression(models.OuterRef("participant"), "activity__"),
+                )
+                .in_bulk()
+            )
+
+            seats_left = {activity.pk: activity.seats_left for activity in activities.values()}
+            # The ineligibility is read before any request is accepted, so
+            # accepted requests of the batch are checked against each other.
+            accepted_windows: dict[int, list[DateTimeTZRange]] = {}
+            new_activity_players: list[ActivityPlayer] = []
+            for pk, accept in decisions.items():
+                if pk not in participation_requests:
+                    continue
+
+                participation_request = participation_requests[pk]
+                activity = activities[participation_request.activity_id]
+                if not accept:
+                    publish_participation_request_delta(
+                        participation_request,
+                        DeltaType.PARTICIPATION_REQUEST_REJECTED,
+                        activity.organizer_id,
+                    )
+                else:
+                    ineligibility = participation_request.ineligibility
+                    participant_windows = accepted_windows.setdefault(participation_request.participant_id, [])
+                    if ineligibility is None and not seats_left[activity.pk]:
+                        ineligibility = Activity.Ineligibility.FULLY_BOOKED
+                    if ineligibility is None and any(
+                        _overlap(window, activity.available_between_at) for window in participant_windows
+                    ):
+                        ineligibility = Activity.Ineligibility.SCHEDULE_CONFLICT
+                    if ineligibility is not None:
+                        errors[pk] = activity.get_ineligibility_message(ineligibility)
+                        continue
+
+                    seats_left[activity.pk] -= 1
+                    participant_windows.append(activity.available_between_at)
+                    new_activity_players.append(
+                        ActivityPlayer(activity=activity, player_id=participation_request.participant_id),
+                    )
+                    publish_participation_request_delta(
+                        participation_request,
+                        DeltaType.PARTICIPATION_REQUEST_ACCEPTED,
+                        activity.organizer_id,
+                    )
+                errors[pk] = None
+
+            for activity_pk, total in Counter(
+                activity_player.activity_id for activity_player in new_activity_players
+            ).items():
+                activities[activity_pk]._reserve_seats(total)
+                publish_activity_delta(activities[activity_pk])
+            ActivityPlayer.objects.bulk_create(new_activity_players)
+            ActivityPlayer.objects.clear_membership_cache(
+                {activity_player.activity_id for activity_player in new_activity_players},
+            )
+            ActivityPlayer.objects.filter(
+                pk__in=[activity_player.pk for activity_player in new_activity_players],
+                player__exclusive_schedule=True,
+            ).sync_schedule()
+            ActivityFeedEntry.objects.refresh(
+                activities={activity_player.activity_id for activity_player in new_activity_players},
+            )
+            ParticipationRequest.objects.filter(pk__in=[pk for pk, error in errors.items() if error is None]).delete()
+        return errors
+
 
 class ActivityQueryset(models.QuerySet):
     def filter_organizer(self, organizer: Player | int) -> "models.QuerySet[Activity]":
-        return self.filter(
-            activity_players__is_organizer=True,
-            players=organizer,
-        )
+        return self.filter(organizer=organizer)
 
     def filter_participant(self, participant: Player | int) -> "models.QuerySet[Activity]":
         return self.filter(
@@ -33,20 +307,147 @@ class ActivityQueryset(models.QuerySet):
             players=participant,
         )
 
+    def search(self, text: str) -> "models.QuerySet[Activity]":
+        """
+        Filters the activities whose name or about match the web search
+        style `text` and annotates them with `search_rank`, name matches
+        rank higher.
+        """
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        return self.filter(search_vector=query).annotate(
+            # ts_rank returns a real, which does not equal itself as the
+            # double precision cursors compare it with.
+            search_rank=models.functions.Cast(SearchRank(models.F("search_vector"), query), models.FloatField()),
+        )
+
+    def filter_expired(self, now: datetime | None = None) -> "models.QuerySet[Activity]":
+        return self.filter(
+            status=self.model.Status.OPEN,
+            available_between_at__endswith__lte=now or timezone.datetime.now(),
+        )
+
+    def filter_overlapping(self, activity: "Activity") -> "models.QuerySet[Activity]":
+        """
+        Filters the other activities whose time window overlaps the time
+        window of `activity`.
+        """
+        return self.filter(available_between_at__overlap=activity.available_between_at).exclude(pk=activity.pk)
+
     def filter_available(self, participant: Player | int) -> "models.QuerySet[Activity]":
-        return (
-            self.annotate(
-                total_players=models.Count("players"),
+        return self.exclude(
+            players=participant,
+        ).filter(
+            status__in=self.model.UPDATABLE_STATUSES,
+            player_limit__gt=models.F("player_count"),
+        )
+
+    def filter_eligible(self, participant: Player | int) -> "models.QuerySet[Activity]":
+        return self.filter(
+            models.Exists(_eligible_player_sports(participant)),
+        )
+
+    def filter_joinable(self, participant: Player | int) -> "models.QuerySet[Activity]":
+        return self.filter_available(participant).filter_eligible(participant)
+
+    def rank_relevance(self, player: Player | int, now: datetime | None = None) -> "models.QuerySet[Activity]":
+        """
+        Filters the activities in the sports of the player which start within
+        the ranking horizon and annotates them with `relevance`, a weighted
+        score of how close the player's level is to the activity's levels,
+        how soon it starts and how many of its seats are left.
+
+        The start filter and score are relative to `now`, which is kept as
+        the `ranked_at` alias, so later pages of the ranking can pass it
+        again.
+        """
+        now = now or timezone.datetime.now()
+        max_level_distance = SportLevel.Level.EXPERT - SportLevel.Level.BEGINNER
+        days_until_start = models.functions.Greatest(
+            models.functions.Extract(
+                RangeStartsWith("available_between_at") - models.Value(now),
+                "epoch",
+                output_field=models.FloatField(),
             )
-            .exclude(
-                players=participant,
+            / 86400,
+            0,
+        )
+        level_relevance = 1 - models.functions.Coalesce(
+            _level_distance(models.F("sport__player_sports__level")),
+            max_level_distance,
+        ) / models.Value(float(max_level_distance))
+        start_relevance = 1 / (1 + days_until_start)
+        seats_relevance = models.functions.Cast(
+            models.F("player_limit") - models.F("player_count"),
+            models.FloatField(),
+        ) / models.F("player_limit")
+        return (
+            self.filter(
+                sport__player_sports__player=player,
+                available_between_at__startswith__gte=now,
+                available_between_at__startswith__lt=now + self.model.RANKING_HORIZON,
             )
-            .filter(
-                status__in=self.model.UPDATABLE_STATUSES,
-                player_limit__gt=models.F("total_players"),
+            .alias(ranked_at=models.Value(now, output_field=models.DateTimeField()))
+            .annotate(
+                relevance=models.ExpressionWrapper(
+                    RELEVANCE_WEIGHTS["level"] * level_relevance
+                    + RELEVANCE_WEIGHTS["start"] * start_relevance
+                    + RELEVANCE_WEIGHTS["seats"] * seats_relevance,
+                    output_field=models.FloatField(),
+                ),
             )
         )
 
+    def filter_feed(self, player: Player | int) -> "models.QuerySet[Activity]":
+        """
+        Filters the precomputed joinable activities of the player and
+        annotates them with `feed_available_from`, which orders them along
+        the feed index.
+        """
+        return self.filter(feed_entries__player=player).annotate(
+            feed_available_from=models.F("feed_entries__available_from"),
+        )
+
+    def annotate_eligibility(self, participant: Player | int) -> "models.QuerySet[Activity]":
+        """
+        Annotates every activity with `ineligibility` which is the first
+        reason why the participant cannot join it, or None if they can.
+        """
+        return self.annotate(ineligibility=ineligibility_expression(participant))
+
+    def facet_counts(self) -> dict[str, dict[Any, int]]:
+        """
+        Counts the activities per sport, per level and per starting day in a
+        single query grouped by GROUPING SETS.
+        """
+        activities = self.order_by().values("pk", "sport", available_from=RangeStartsWith("available_between_at"))
+        facet_counts: dict[str, dict[Any, int]] = {"sports": {}, "levels": {}, "days": {}}
+        try:
+            activities_sql, params = activities.query.sql_with_params()
+        except EmptyResultSet:
+            return facet_counts
+
+        sql = FACET_COUNTS_SQL.format(activities=activities_sql, activity_level=ActivityLevel._meta.db_table)
+        facets = {0b011: "sports", 0b101: "levels", 0b110: "days"}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for sport_id, level_id, day, grouping, total in cursor.fetchall():
+                facet = facets[grouping]
+                key = {"sports": sport_id, "levels": level_id, "days": day}[facet]
+                if key is not None:
+                    facet_counts[facet][key] = total
+        return facet_counts
+
+    def filter_levels(self, levels: Iterable[SportLevel | int]) -> "models.QuerySet[Activity]":
+        return self.filter(level_ids__overlap=[level if isinstance(level, int) else level.pk for level in levels])
+
+    def with_roster(self) -> "models.QuerySet[Activity]":
+        return self.prefetch_related(
+            models.Prefetch(
+                "activity_players",
+                queryset=ActivityPlayer.objects.select_related("player__user").order_by("pk"),
+            ),
+        ).select_related("organizer__user")
+
 
 class Activity(TrackingMixin):
     class Status(models.IntegerChoices):
@@ -54,8 +455,27 @@ class Activity(TrackingMixin):
         PLAYED = 2, _("Played")
         CANCELLED = 3, _("Cancelled")
 
+    class Ineligibility(models.TextChoices):
+        NOT_UPDATABLE = "not_updatable", _("Not updatable")
+        FULLY_BOOKED = "fully_booked", _("Fully booked")
+        ORGANIZER = "organizer", _("Organizer")
+        ALREADY_JOINED = "already_joined", _("Already joined")
+        NO_SPORT = "no_sport", _("No sport record")
+        INELIGIBLE_LEVEL = "ineligible_level", _("Ineligible level")
+        SCHEDULE_CONFLICT = "schedule_conflict", _("Schedule conflict")
+
     UPDATABLE_STATUSES = (Status.OPEN,)
+    # How far ahead relevance ranked activities can start.
+    RANKING_HORIZON = timezone.timedelta(weeks=4)
 
+    organizer = models.ForeignKey(
+        "participants.Player",
+        verbose_name=_("organizer"),
+        on_delete=models.CASCADE,
+        related_name="organized_activities",
+        editable=False,
+        help_text=_("Denormalized copy of the activity player which is the organizer."),
+    )
     sport = models.ForeignKey(
         "participants.Sport",
         verbose_name=_("sport"),
@@ -84,6 +504,18 @@ class Activity(TrackingMixin):
             validators.MaxValueValidator(30),
         ),
     )
+    player_count = models.PositiveSmallIntegerField(
+        _("number of players"),
+        default=0,
+        editable=False,
+    )
+    level_ids = ArrayField(
+        models.PositiveSmallIntegerField(),
+        verbose_name=_("level ids"),
+        help_text=_("Denormalized copy of levels."),
+        default=list,
+        editable=False,
+    )
     name = models.CharField(
         _("name"),
         max_length=150,
@@ -102,8 +534,21 @@ class Activity(TrackingMixin):
         choices=Status.choices,
         default=Status.OPEN,
     )
+    search_vector = GeneratedSearchVectorField(
+        _("search vector"),
+    )
+    series = models.ForeignKey(
+        "events.ActivitySeries",
+        verbose_name=_("series"),
+        on_delete=models.SET_NULL,
+        related_name="activities",
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     objects = ActivityManager.from_queryset(ActivityQueryset)()
+    all_objects = ActivityManager.from_queryset(ActivityQueryset)(all_objects=True)
 
     class Meta:
         db_table = "activity"
@@ -121,18 +566,58 @@ class Activity(TrackingMixin):
                 violation_error_message=gettext("available_between_at upper value cannot be infinite."),
             ),
         )
+        indexes = (
+            models.Index(
+                fields=("status",),
+                condition=models.Q(player_count__lt=models.F("player_limit")),
+                name="activity_has_seats_idx",
+            ),
+            GistIndex(
+                fields=("status", "sport", "available_between_at"),
+                name="activity_time_window_idx",
+            ),
+            models.Index(
+                RangeStartsWith("available_between_at"),
+                models.F("id"),
+                name="activity_available_from_idx",
+            ),
+            GinIndex(
+                fields=("level_ids",),
+                name="activity_level_ids_idx",
+            ),
+            GinIndex(
+                fields=("search_vector",),
+                name="activity_search_vector_idx",
+            ),
+            models.Index(
+                RangeEndsWith("available_between_at"),
+                models.F("id"),
+                condition=models.Q(status=1),  # Status.OPEN, not accessible from Meta.
+                name="activity_open_ends_at_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.name
 
     @property
-    def organizer(self) -> Player:
-        return self.players.get(activity_players__is_organizer=True)
+    def _has_prefetched_roster(self) -> bool:
+        return "activity_players" in getattr(self, "_prefetched_objects_cache", {})
 
     @property
-    def participants(self) -> models.QuerySet[Player]:
+    def participants(self) -> models.QuerySet[Player] | list[Player]:
+        if self._has_prefetched_roster:
+            return [
+                activity_player.player
+                for activity_player in self.activity_players.all()
+                if not activity_player.is_organizer
+            ]
         return self.players.filter(activity_players__is_organizer=False)
 
+    @property
+    def seats_left(self) -> int:
+        return max(self.player_limit - self.player_count, 0)
+
     def check_player_limit(
         self,
         *,
@@ -140,44 +625,149 @@ class Activity(TrackingMixin):
         total_players: int | None = None,
     ) -> None:
         player_limit = player_limit if player_limit is not None else self.player_limit
-        total_players = total_players if total_players is not None else self.players.count()
+        total_players = total_players if total_players is not None else self.player_count
 
         if player_limit < total_players:
             raise ValidationError(gettext("Player limit cannot be less than total players."))
 
+    def get_ineligibility_message(self, ineligibility: str) -> str:
+        messages = {
+            self.Ineligibility.NOT_UPDATABLE: gettext(
+                f"The activity is already {self.get_status_display().lower()}.",
+            ),
+            self.Ineligibility.FULLY_BOOKED: gettext("The activity is fully booked."),
+            self.Ineligibility.ORGANIZER: gettext("You cannot send a participation request to your own activity."),
+            self.Ineligibility.ALREADY_JOINED: gettext("You already joined the activity."),
+            self.Ineligibility.NO_SPORT: gettext(
+                f"The player does not have {Sport.Name(self.sport_id).label} record.",
+            ),
+            self.Ineligibility.INELIGIBLE_LEVEL: gettext("Your level is not eligible for the activity."),
+            self.Ineligibility.SCHEDULE_CONFLICT: gettext("You have another activity at the same time."),
+        }
+        return messages[self.Ineligibility(ineligibility)]
+
     def check_participant(self, participant: Player) -> None:
-        if self.status not in self.UPDATABLE_STATUSES:
-            raise ValidationError(
-                gettext(f"The activity is already {self.get_status_display().lower()}."),
-            )
+        ineligibility = (
+            self.__class__.all_objects.filter(pk=self.pk)
+            .annotate_eligibility(participant)
+            .values_list("ineligibility", flat=True)
+            .get()
+        )
+        if ineligibility is not None:
+            raise ValidationError(self.get_ineligibility_message(ineligibility))
+
+    def set_levels(self, levels: Iterable[SportLevel | int]) -> None:
+        with transaction.atomic():
+            self.levels.set(levels)
+            self.sync_level_ids()
+            self.refresh_feed_entries()
+
+    def sync_level_ids(self) -> None:
+        """
+        Copies the levels of the activity into `level_ids`, which is what
+        the eligibility checks and level filters read.
+        """
+        self.__class__.all_objects.filter(pk=self.pk).update(
+            level_ids=ArraySubquery(
+                ActivityLevel.objects.filter(activity=models.OuterRef("pk")).order_by("level").values("level"),
+            ),
+        )
+        self.refresh_from_db(fields=("level_ids",))
+
+    def refresh_feed_entries(self) -> None:
+        """
+        Recomputes which players can join the activity, to be called after
+        its status, time, player limit or levels change.
+        """
+        ActivityFeedEntry.objects.refresh(activities=[self])
+
+    def sync_schedule(self) -> None:
+        """
+        Copies the time window of the activity into the rows of its players
+        with an exclusive schedule, to be called after its status or time
+        changes. Raises ValidationError if one of them has another open
+        activity at the same time.
+        """
+        self.activity_players.filter(player__exclusive_schedule=True).sync_schedule()
+
+    def _update_player_count(self, delta: int) -> None:
+        self.__class__.all_objects.filter(pk=self.pk).update(player_count=models.F("player_count") + delta)
+        self.refresh_from_db(fields=("player_count",))
 
-        if self.player_limit <= self.players.count():
+    def _reserve_seats(self, total: int) -> None:
+        total_reserved = self.__class__.all_objects.filter(
+            pk=self.pk,
+            player_count__lte=models.F("player_limit") - total,
+        ).update(player_count=models.F("player_count") + total)
+        if not total_reserved:
             raise ValidationError(
                 gettext("The activity is fully booked."),
             )
+        self.refresh_from_db(fields=("player_count",))
 
-        if participant == self.organizer:
-            raise ValidationError(
-                gettext("You cannot send a participation request to your own activity."),
-            )
+    def add_participants(self, *participants: Player) -> None:
+        with transaction.atomic():
+            # Concurrent additions to the same activity wait here, so the
+            # roster below cannot change until this transaction ends.
+            self.__class__.all_objects.select_for_update().filter(pk=self.pk).values_list("pk").get()
 
-        try:
-            participant_sport = participant.sports.get(sport=self.sport)
-        except PlayerSport.DoesNotExist:
-            raise ValidationError(
-                gettext(f"The player does not have {self.sport.get_name_display()} record."),
+            existing_player_ids = set(
+                self.activity_players.filter(player__in=participants).values_list("player", flat=True),
             )
+            new_participants = {
+                participant.pk: participant
+                for participant in participants
+                if participant.pk not in existing_player_ids
+            }
+            if not new_participants:
+                return
 
-        if participant_sport.level not in self.levels.all():
-            raise ValidationError(
-                gettext("Your level is not eligible for the activity."),
+            self._reserve_seats(len(new_participants))
+            ActivityPlayer.objects.bulk_create(
+                ActivityPlayer(activity=self, player=participant) for participant in new_participants.values()
             )
+            ActivityPlayer.objects.clear_membership_cache([self.pk])
+            exclusive_player_ids = [
+                participant.pk for participant in new_participants.values() if participant.exclusive_schedule
+            ]
+            if exclusive_player_ids:
+                self.activity_players.filter(player__in=exclusive_player_ids).sync_schedule()
+            feed_entries = self.feed_entries.all()
+            if self.seats_left:
+                feed_entries = feed_entries.filter(player__in=new_participants)
+            feed_entries.delete()
+            publish_activity_delta(self)
+
+    def remove_participant(self, participant: Player) -> None:
+        with transaction.atomic():
+            total_deleted, _ = self.activity_players.filter(player=participant, is_organizer=False).delete()
+            if total_deleted:
+                self._update_player_count(-total_deleted)
+                ActivityPlayer.objects.clear_membership_cache([self.pk])
+                revoke_activity_chat_members(self.pk, [participant.pk])
+                # A fully booked activity has no feed entries, the rest only
+                # miss the participant who left.
+                ActivityFeedEntry.objects.refresh(
+                    activities=[self],
+                    players=None if self.seats_left == total_deleted else [participant],
+                )
+                publish_activity_delta(self)
 
     def accept_participation_request(self, participation_request: ParticipationRequest) -> None:
         self.check_participant(participation_request.participant)
         with transaction.atomic():
-            self.players.add(participation_request.participant)
+            self.add_participants(participation_request.participant)
+            publish_participation_request_delta(
+                participation_request,
+                DeltaType.PARTICIPATION_REQUEST_ACCEPTED,
+                self.organizer_id,
+            )
             participation_request.delete()
 
     def reject_participation_request(self, participation_request: ParticipationRequest) -> None:
+        publish_participation_request_delta(
+            participation_request,
+            DeltaType.PARTICIPATION_REQUEST_REJECTED,
+            self.organizer_id,
+        )
         participation_request.delete()
@@ -0,0 +1,120 @@
+from typing import Iterable
+
+from django.db import connection, models, transaction
+from django.utils.translation import gettext_lazy as _
+
+from events import models as events_models
+from participants.models import Player, PlayerSport
+
+FEED_ENTRIES_SQL = """
+    INSERT INTO {activity_feed_entry} (player_id, activity_id, available_from)
+    SELECT player_sport.player_id, activity.id, lower(activity.available_between_at)
+    FROM {activity} AS activity
+    INNER JOIN {player_sport} AS player_sport
+        ON player_sport.sport_id = activity.sport_id
+        AND player_sport.level_id = ANY(activity.level_ids)
+    WHERE activity.is_active
+        AND activity.status = ANY(%(statuses)s)
+        AND activity.player_count < activity.player_limit
+        AND NOT EXISTS (
+            SELECT FROM {activity_player} AS activity_player
+            WHERE activity_player.activity_id = activity.id
+                AND activity_player.player_id = player_sport.player_id
+        )
+        {scope}
+    ON CONFLICT DO NOTHING
+"""
+
+
+class ActivityFeedEntryManager(models.Manager):
+    def refresh(
+        self,
+        activities: Iterable["events_models.Activity | int"] | None = None,
+        players: Iterable[Player | int] | None = None,
+    ) -> int:
+        """
+        Replaces the feed entries of the given activities and players, or of
+        all of them if neither is given, with the activities each player can
+        join. Returns the number of the created entries.
+        """
+        Activity = events_models.Activity
+        entries = self.all()
+        scope = []
+        params: dict[str, list[int]] = {"statuses": list(Activity.UPDATABLE_STATUSES)}
+        if activities is not None:
+            params["activity_ids"] = [
+                activity if isinstance(activity, int) else activity.pk for activity in activities
+            ]
+            entries = entries.filter(activity__in=params["activity_ids"])
+            scope.append("AND activity.id = ANY(%(activity_ids)s)")
+        if players is not None:
+            params["player_ids"] = [player if isinstance(player, int) else player.pk for player in players]
+            entries = entries.filter(player__in=params["player_ids"])
+            scope.append("AND player_sport.player_id = ANY(%(player_ids)s)")
+
+        sql = FEED_ENTRIES_SQL.format(
+            activity_feed_entry=self.model._meta.db_table,
+            activity=Activity._meta.db_table,
+            player_sport=PlayerSport._meta.db_table,
+            activity_player=events_models.ActivityPlayer._meta.db_table,
+            scope="\n        ".join(scope),
+        )
+        # Callers mostly refresh inside their own transaction.
+        with transaction.atomic(savepoint=False):
+            entries.delete()
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.rowcount
+
+
+class ActivityFeedEntry(models.Model):
+    """
+    A precomputed pair of a player and an activity they can join, which is
+    what the discovery feed pages through instead of recomputing
+    `filter_joinable` on every request. Entries are kept in sync by the
+    methods which change joinability and can be rebuilt with the
+    `rebuild_activity_feed` command.
+    """
+
+    player = models.ForeignKey(
+        "participants.Player",
+        verbose_name=_("player"),
+        on_delete=models.CASCADE,
+        related_name="activity_feed_entries",
+        # Covered by activity_feed_entry_player_idx.
+        db_index=False,
+    )
+    activity = models.ForeignKey(
+        "events.Activity",
+        verbose_name=_("activity"),
+        on_delete=models.CASCADE,
+        related_name="feed_entries",
+        # Covered by activity_feed_entry_unique.
+        db_index=False,
+    )
+    available_from = models.DateTimeField(
+        _("available from"),
+        help_text=_("Denormalized copy of the lower value of the activity's available_between_at."),
+    )
+
+    objects = ActivityFeedEntryManager()
+
+    class Meta:
+        db_table = "activity_feed_entry"
+        verbose_name = _("activity feed entry")
+        verbose_name_plural = _("activity feed entries")
+        constraints = (
+            models.UniqueConstraint(
+                fields=("activity", "player"),
+                name="activity_feed_entry_unique",
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=("player", "available_from", "activity"),
+                name="activity_feed_entry_player_idx",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.player} - {self.activity}"
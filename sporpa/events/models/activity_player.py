@@ -1,6 +1,114 @@
-from django.db import models
+import uuid
+from typing import Iterable
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from events import models as events_models
+from participants.models import Player
+
+
+class ActivityPlayerManager(models.Manager):
+    # Seconds to cache the player ids of an activity for, changes of the
+    # roster clear them sooner.
+    membership_cache_timeout = 300
+
+    @staticmethod
+    def get_membership_version_cache_key(activity_pk: int) -> str:
+        return f"activity-players-version:{activity_pk}"
+
+    @staticmethod
+    def get_membership_cache_key(activity_pk: int, version: str) -> str:
+        return f"activity-players:{activity_pk}:{version}"
+
+    def get_membership_version(self, activity_pk: int) -> str:
+        version_cache_key = self.get_membership_version_cache_key(activity_pk)
+        version = cache.get(version_cache_key)
+        if version is None:
+            # Another process may add its version first, `add` keeps it.
+            cache.add(version_cache_key, uuid.uuid4().hex, None)
+            version = cache.get(version_cache_key)
+        return version
+
+    def get_membership(self, activity_pk: int) -> tuple[frozenset[int], bool]:
+        """
+        Returns the ids of the players of the activity, including the
+        organizer, and whether it is cancelled, from the cache or from a
+        single query on a miss.
+        """
+        cache_key = self.get_membership_cache_key(activity_pk, self.get_membership_version(activity_pk))
+        membership = cache.get(cache_key)
+        if membership is None:
+            rows = list(self.filter(activity=activity_pk).values_list("player", "activity__status"))
+            # Every activity has its organizer row, so rows share the status.
+            is_cancelled = bool(rows) and rows[0][1] == events_models.Activity.Status.CANCELLED
+            membership = ([player_id for player_id, status in rows], is_cancelled)
+            cache.set(cache_key, membership, self.membership_cache_timeout)
+        player_ids, is_cancelled = membership
+        return frozenset(player_ids), is_cancelled
+
+    def get_player_ids(self, activity_pk: int) -> frozenset[int]:
+        return self.get_membership(activity_pk)[0]
+
+    def is_member(self, activity_pk: int, player_pk: int, *, include_cancelled: bool = True) -> bool:
+        player_ids, is_cancelled = self.get_membership(activity_pk)
+        return player_pk in player_ids and (include_cancelled or not is_cancelled)
+
+    async def ais_member(self, activity_pk: int, player_pk: int, *, include_cancelled: bool = True) -> bool:
+        return await sync_to_async(self.is_member)(activity_pk, player_pk, include_cancelled=include_cancelled)
+
+    def clear_membership_cache(self, activity_pks: Iterable[int]) -> None:
+        """
+        Drops the cached membership versions of the activities once the
+        transaction commits. A concurrent miss which read the roster before
+        the commit caches it under the dropped version, which is never read
+        again, so it cannot outlive the change.
+        """
+        version_cache_keys = [self.get_membership_version_cache_key(activity_pk) for activity_pk in activity_pks]
+        transaction.on_commit(lambda: cache.delete_many(version_cache_keys))
+
+
+class ActivityPlayerQueryset(models.QuerySet):
+    def sync_schedule(self) -> int:
+        """
+        Copies `available_between_at` of the open activities into the rows of
+        the players with an exclusive schedule and clears it from the rest,
+        so activity_player_exclusive_schedule rejects overlapping activities
+        of those players. Returns the number of the updated rows.
+        """
+        Activity = events_models.Activity
+        try:
+            # Callers mostly sync inside their own transaction, which a
+            # conflict rolls back.
+            with transaction.atomic(savepoint=False):
+                return self.update(
+                    available_between_at=models.Case(
+                        models.When(
+                            models.Exists(
+                                Player.objects.filter(pk=models.OuterRef("player"), exclusive_schedule=True)
+                            ),
+                            then=models.Subquery(
+                                Activity.all_objects.filter(
+                                    pk=models.OuterRef("activity"),
+                                    status__in=Activity.UPDATABLE_STATUSES,
+                                ).values("available_between_at"),
+                            ),
+                        ),
+                        default=None,
+                    ),
+                )
+        except IntegrityError as error:
+            if "activity_player_exclusive_schedule" not in str(error):
+                raise
+            raise ValidationError(gettext("You have another activity at the same time."))
+
 
 class ActivityPlayer(models.Model):
     activity = models.ForeignKey(
@@ -14,10 +122,23 @@ class ActivityPlayer(models.Model):
         verbose_name=_("player"),
         on_delete=models.CASCADE,
         related_name="activity_players",
+        # Covered by activity_player_player_idx.
+        db_index=False,
     )
     is_organizer = models.BooleanField(
         default=False,
     )
+    available_between_at = DateTimeRangeField(
+        _("available between at"),
+        null=True,
+        editable=False,
+        help_text=_(
+            "Denormalized copy of the activity's available_between_at while it is open and the player has an "
+            "exclusive schedule.",
+        ),
+    )
+
+    objects = ActivityPlayerManager.from_queryset(ActivityPlayerQueryset)()
 
     class Meta:
         db_table = "activity_player"
@@ -29,6 +150,23 @@ class ActivityPlayer(models.Model):
                 condition=models.Q(is_organizer=True),
                 name="only_one_organizer",
             ),
+            ExclusionConstraint(
+                name="activity_player_exclusive_schedule",
+                expressions=(
+                    ("player", RangeOperators.EQUAL),
+                    ("available_between_at", RangeOperators.OVERLAPS),
+                ),
+                condition=models.Q(available_between_at__isnull=False),
+            ),
+        )
+        indexes = (
+            # Membership checks and the activities a player organizes or
+            # joined, is_organizer is included for index only scans.
+            models.Index(
+                fields=("player", "activity"),
+                include=("is_organizer",),
+                name="activity_player_player_idx",
+            ),
         )
 
     def __str__(self) -> str:
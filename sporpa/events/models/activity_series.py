@@ -0,0 +1,205 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from psycopg2.extras import DateTimeTZRange
+
+from django.core import validators
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from events.ws.deltas import DeltaType, publish_activity_delta
+from participants.models import Player, SportLevel
+from utils.models import TrackingManagerMixin, TrackingMixin
+
+from .activity import Activity
+from .activity_feed_entry import ActivityFeedEntry
+from .activity_level import ActivityLevel
+from .activity_player import ActivityPlayer
+
+
+class ActivitySeriesManager(TrackingManagerMixin):
+    def create(self, **kwargs: Any) -> "ActivitySeries":
+        levels: list[SportLevel] = kwargs.pop("levels")
+        with transaction.atomic():
+            series: ActivitySeries = super().create(**kwargs)
+            series.levels.set(levels)
+            series.generate_occurrences()
+        return series
+
+
+class ActivitySeriesQueryset(models.QuerySet):
+    def filter_organizer(self, organizer: Player | int) -> "models.QuerySet[ActivitySeries]":
+        return self.filter(organizer=organizer)
+
+    def filter_unfinished(self) -> "models.QuerySet[ActivitySeries]":
+        return self.exclude(occurrence_limit__lte=models.F("generated_count"))
+
+    def generate_occurrences(self, until: datetime | None = None) -> int:
+        """
+        Materializes the pending occurrences of every unfinished series in
+        the rolling window and returns the number of the created activities.
+        """
+        total = 0
+        for series in self.filter_unfinished().prefetch_related("levels"):
+            total += len(series.generate_occurrences(until))
+        return total
+
+
+class ActivitySeries(TrackingMixin):
+    """
+    A template of an activity which recurs every `interval` days or weeks,
+    starting at `starts_at`. Occurrences are materialized lazily, only as far
+    as the generation window reaches.
+    """
+
+    class Frequency(models.IntegerChoices):
+        DAILY = 1, _("Daily")
+        WEEKLY = 2, _("Weekly")
+
+    GENERATION_WINDOW = timedelta(weeks=4)
+
+    organizer = models.ForeignKey(
+        "participants.Player",
+        verbose_name=_("organizer"),
+        on_delete=models.CASCADE,
+        related_name="activity_series",
+    )
+    sport = models.ForeignKey(
+        "participants.Sport",
+        verbose_name=_("sport"),
+        on_delete=models.PROTECT,
+        related_name="activity_series",
+    )
+    levels = models.ManyToManyField(
+        "participants.SportLevel",
+        verbose_name=_("level"),
+        related_name="activity_series",
+    )
+    player_limit = models.PositiveSmallIntegerField(
+        _("maximum number of players"),
+        default=2,
+        validators=(
+            validators.MinValueValidator(2),
+            validators.MaxValueValidator(30),
+        ),
+    )
+    name = models.CharField(
+        _("name"),
+        max_length=150,
+    )
+    about = models.TextField(
+        _("about"),
+        max_length=600,
+        blank=True,
+    )
+    starts_at = models.DateTimeField(
+        _("starts at"),
+    )
+    duration = models.DurationField(
+        _("duration"),
+        validators=(validators.MinValueValidator(timedelta(minutes=1)),),
+    )
+    frequency = models.PositiveSmallIntegerField(
+        _("frequency"),
+        choices=Frequency.choices,
+        default=Frequency.WEEKLY,
+    )
+    interval = models.PositiveSmallIntegerField(
+        _("interval"),
+        default=1,
+        validators=(validators.MinValueValidator(1),),
+    )
+    occurrence_limit = models.PositiveSmallIntegerField(
+        _("number of occurrences"),
+        help_text=_("Leave empty for a series without an end."),
+        null=True,
+        blank=True,
+        validators=(validators.MinValueValidator(1),),
+    )
+    generated_count = models.PositiveIntegerField(
+        _("number of generated occurrences"),
+        default=0,
+        editable=False,
+    )
+
+    objects = ActivitySeriesManager.from_queryset(ActivitySeriesQueryset)()
+    all_objects = ActivitySeriesManager.from_queryset(ActivitySeriesQueryset)(all_objects=True)
+
+    class Meta:
+        db_table = "activity_series"
+        verbose_name = _("activity series")
+        verbose_name_plural = _("activity series")
+
+    def __str__(self) -> str:
+        return self.name
+
+    def get_occurrence_range(self, index: int) -> DateTimeTZRange:
+        days = self.interval * (7 if self.frequency == self.Frequency.WEEKLY else 1)
+        lower = self.starts_at + timedelta(days=days * index)
+        return DateTimeTZRange(lower, lower + self.duration)
+
+    def generate_occurrences(self, until: datetime | None = None) -> list[Activity]:
+        """
+        Creates the activities of the occurrences which start before `until`,
+        by default the end of the generation window. Occurrences which have
+        already started are skipped.
+        """
+        now = timezone.datetime.now()
+        until = until or now + self.GENERATION_WINDOW
+        with transaction.atomic():
+            self.generated_count = (
+                self.__class__.all_objects.select_for_update()
+                .filter(pk=self.pk)
+                .values_list("generated_count", flat=True)
+                .get()
+            )
+            levels = list(self.levels.all())
+            level_ids = sorted(level.pk for level in levels)
+            occurrences: list[Activity] = []
+            index = self.generated_count
+            while not (self.occurrence_limit is not None and index >= self.occurrence_limit):
+                available_between_at = self.get_occurrence_range(index)
+                if available_between_at.lower >= until:
+                    break
+
+                index += 1
+                if available_between_at.lower <= now:
+                    continue
+
+                occurrences.append(
+                    Activity(
+                        series=self,
+                        organizer_id=self.organizer_id,
+                        sport_id=self.sport_id,
+                        player_limit=self.player_limit,
+                        player_count=1,
+                        name=self.name,
+                        about=self.about,
+                        available_between_at=available_between_at,
+                        level_ids=level_ids,
+                    ),
+                )
+
+            if index == self.generated_count:
+                return occurrences
+
+            Activity.objects.bulk_create(occurrences)
+            ActivityLevel.objects.bulk_create(
+                ActivityLevel(activity=activity, level=level) for activity in occurrences for level in levels
+            )
+            ActivityPlayer.objects.bulk_create(
+                ActivityPlayer(activity=activity, player_id=self.organizer_id, is_organizer=True)
+                for activity in occurrences
+            )
+            ActivityPlayer.objects.clear_membership_cache(activity.pk for activity in occurrences)
+            ActivityPlayer.objects.filter(
+                activity__in=occurrences,
+                player__exclusive_schedule=True,
+            ).sync_schedule()
+            ActivityFeedEntry.objects.refresh(activities=occurrences)
+            for activity in occurrences:
+                publish_activity_delta(activity, DeltaType.ACTIVITY_CREATED)
+            self.__class__.all_objects.filter(pk=self.pk).update(generated_count=index)
+            self.generated_count = index
+        return occurrences
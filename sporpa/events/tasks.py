@@ -0,0 +1,22 @@
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+
+from events.models import Activity
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_expired_activities(interval: float = 300, batch_size: int = 500, pause: float = 0) -> None:
+    """
+    Periodically moves the open activities which have ended to played. Meant
+    to be run as a long-living asyncio task, e.g. next to the ASGI server.
+    """
+    while True:
+        total_updated = await sync_to_async(Activity.objects.mark_expired_as_played)(
+            batch_size=batch_size,
+            pause=pause,
+        )
+        logger.info("Marked %d expired activities as played.", total_updated)
+        await asyncio.sleep(interval)
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from psycopg2.extras import DateTimeTZRange
 
 from django.core.exceptions import ValidationError
@@ -8,3 +10,8 @@ from django.utils.translation import gettext
 def validate_now_less_than_lower_value(value: DateTimeTZRange) -> None:
     if value.lower <= timezone.datetime.now():
         raise ValidationError(gettext("Please select a further date."))
+
+
+def validate_now_less_than_value(value: datetime) -> None:
+    if value <= timezone.datetime.now():
+        raise ValidationError(gettext("Please select a further date."))
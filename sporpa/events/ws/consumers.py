@@ -0,0 +1,39 @@
+import json
+
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from participants.models import PlayerSport
+
+from .deltas import get_player_group_name, get_sport_group_name
+
+
+class ActivityDeltaConsumer(AsyncWebsocketConsumer):
+    """
+    Pushes the deltas of the activities in the sports of the player, and of
+    the participation requests they sent or received, so clients do not need
+    to poll the activity lists. The sports are read on connect, clients
+    reconnect after the player adds a sport.
+    """
+
+    async def connect(self) -> None:
+        self.group_names: list[str] = []
+        self.user = self.scope.get("user")
+        if not self.user or not self.user.pk:
+            await self.close()
+            return
+
+        player = self.user.player
+        self.group_names.append(get_player_group_name(player.pk))
+        async for sport_pk in PlayerSport.objects.filter_player(player).values_list("sport", flat=True):
+            self.group_names.append(get_sport_group_name(sport_pk))
+
+        for group_name in self.group_names:
+            await self.channel_layer.group_add(group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code: int) -> None:
+        for group_name in self.group_names:
+            await self.channel_layer.group_discard(group_name, self.channel_name)
+
+    async def activity_delta(self, event: dict) -> None:
+        await self.send(text_data=json.dumps(event["delta"]))
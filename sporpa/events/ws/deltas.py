@@ -0,0 +1,95 @@
+from typing import TYPE_CHECKING, Any, Iterable
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from psycopg2.extras import DateTimeTZRange, Range
+
+from django.db import models, transaction
+
+if TYPE_CHECKING:
+    from events.models import Activity
+    from participants.models import ParticipationRequest
+
+
+class DeltaType(models.TextChoices):
+    ACTIVITY_CREATED = "activity.created"
+    ACTIVITY_UPDATED = "activity.updated"
+    ACTIVITY_FILLED = "activity.filled"
+    ACTIVITY_CANCELLED = "activity.cancelled"
+    PARTICIPATION_REQUEST_CREATED = "participation_request.created"
+    PARTICIPATION_REQUEST_ACCEPTED = "participation_request.accepted"
+    PARTICIPATION_REQUEST_REJECTED = "participation_request.rejected"
+
+
+def get_sport_group_name(sport_pk: int) -> str:
+    return f"activity_deltas_sport_{sport_pk}"
+
+
+def get_player_group_name(player_pk: int) -> str:
+    return f"activity_deltas_player_{player_pk}"
+
+
+def _send(group_names: Iterable[str], delta: dict[str, Any]) -> None:
+    channel_layer = get_channel_layer()
+    for group_name in group_names:
+        async_to_sync(channel_layer.group_send)(group_name, {"type": "activity_delta", "delta": delta})
+
+
+def _publish(group_names: list[str], delta: dict[str, Any]) -> None:
+    # Deltas are only a hint to refetch, a channel layer failure must not
+    # fail the committed change.
+    transaction.on_commit(lambda: _send(group_names, delta), robust=True)  # type: ignore[call-arg]
+
+
+def publish_activity_delta(activity: "Activity", delta_type: DeltaType | None = None) -> None:
+    """
+    Sends the current state of the activity to the players of its sport once
+    the transaction commits. Without `delta_type` the activity is reported
+    as updated, or as filled if no seats are left.
+    """
+    if delta_type is None:
+        delta_type = DeltaType.ACTIVITY_FILLED if not activity.seats_left else DeltaType.ACTIVITY_UPDATED
+    available_between_at = activity.available_between_at
+    # Range fields also accept (lower, upper) pairs.
+    if not isinstance(available_between_at, Range):
+        available_between_at = DateTimeTZRange(*available_between_at)
+    delta = {
+        "type": delta_type,
+        "activity": {
+            "pk": activity.pk,
+            "sport": activity.sport_id,
+            "levels": list(activity.level_ids),
+            "name": activity.name,
+            "status": activity.status,
+            "player_limit": activity.player_limit,
+            "player_count": activity.player_count,
+            "available_between_at": [
+                available_between_at.lower.isoformat(),
+                available_between_at.upper.isoformat(),
+            ],
+        },
+    }
+    _publish([get_sport_group_name(activity.sport_id)], delta)
+
+
+def publish_participation_request_delta(
+    participation_request: "ParticipationRequest",
+    delta_type: DeltaType,
+    organizer_pk: int,
+) -> None:
+    """
+    Sends the new state of the participation request to the organizer if it
+    was created, otherwise to the participant, once the transaction commits.
+    """
+    player_pk = (
+        organizer_pk if delta_type == DeltaType.PARTICIPATION_REQUEST_CREATED else participation_request.participant_id
+    )
+    delta = {
+        "type": delta_type,
+        "participation_request": {
+            "pk": participation_request.pk,
+            "activity": participation_request.activity_id,
+            "participant": participation_request.participant_id,
+        },
+    }
+    _publish([get_player_group_name(player_pk)], delta)
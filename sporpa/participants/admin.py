@@ -1,11 +1,32 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils.translation import gettext_lazy as _
 
 from participants.models import Player, PlayerSport, Sport, SportLevel
 
 
 @admin.register(Player)
 class PlayerAdmin(admin.ModelAdmin):
-    pass
+    list_display = ("user", "exclusive_schedule")
+    readonly_fields = ("exclusive_schedule",)
+    actions = ("enable_exclusive_schedule", "disable_exclusive_schedule")
+
+    @admin.action(description=_("Enable exclusive schedule"))
+    def enable_exclusive_schedule(self, request: HttpRequest, queryset: QuerySet[Player]) -> None:
+        self._set_exclusive_schedule(request, queryset, True)
+
+    @admin.action(description=_("Disable exclusive schedule"))
+    def disable_exclusive_schedule(self, request: HttpRequest, queryset: QuerySet[Player]) -> None:
+        self._set_exclusive_schedule(request, queryset, False)
+
+    def _set_exclusive_schedule(self, request: HttpRequest, queryset: QuerySet[Player], enabled: bool) -> None:
+        for player in queryset:
+            try:
+                player.set_exclusive_schedule(enabled)
+            except ValidationError as error:
+                self.message_user(request, f"{player}: {error.messages[0]}", messages.ERROR)
 
 
 @admin.register(PlayerSport)
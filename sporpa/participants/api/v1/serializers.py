@@ -5,6 +5,7 @@ from rest_framework import serializers
 from django.utils.translation import gettext
 
 from events.models import Activity
+from events.ws.deltas import DeltaType, publish_participation_request_delta
 from participants.models import ParticipationRequest, Player, PlayerSport, Sport, SportLevel
 
 from .fields import CurrentPlayerDefault
@@ -120,3 +121,12 @@ class ParticipationRequestListCreateSerializer(serializers.ModelSerializer):
 
         activity.check_participant(participant=participant)
         return validated_data
+
+    def create(self, validated_data: dict[str, Any]) -> ParticipationRequest:
+        participation_request = super().create(validated_data)
+        publish_participation_request_delta(
+            participation_request,
+            DeltaType.PARTICIPATION_REQUEST_CREATED,
+            participation_request.activity.organizer_id,
+        )
+        return participation_request
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("participants", "0004_participationrequest_activity_participant_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="player",
+            name="exclusive_schedule",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Designates whether the database rejects overlapping activities of the player.",
+                verbose_name="exclusive schedule",
+            ),
+        ),
+    ]
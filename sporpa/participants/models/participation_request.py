@@ -10,10 +10,16 @@ class ParticipationRequestManager(models.Manager):
         return self.filter(participant=participant)
 
     def filter_organizer(self, organizer: "participants_models.Player | int") -> models.QuerySet:
-        return self.filter(
-            activity__activity_players__is_organizer=True,
-            activity__players=organizer,
-        )
+        return self.filter(activity__organizer=organizer)
+
+    def filter_pending(self, organizer: "participants_models.Player | int") -> models.QuerySet:
+        """
+        Filters the requests to the organizer's activities which can still
+        be joined.
+        """
+        from events.models import Activity
+
+        return self.filter_organizer(organizer).filter(activity__status__in=Activity.UPDATABLE_STATUSES)
 
 
 class ParticipationRequest(models.Model):
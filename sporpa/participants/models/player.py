@@ -1,7 +1,7 @@
 from typing import Any
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from participants import models as participant_models
@@ -16,6 +16,12 @@ class Player(models.Model):
         limit_choices_to=models.Q(is_active=True),
         primary_key=True,
     )
+    exclusive_schedule = models.BooleanField(
+        _("exclusive schedule"),
+        default=False,
+        editable=False,
+        help_text=_("Designates whether the database rejects overlapping activities of the player."),
+    )
 
     class Meta:
         db_table = "player"
@@ -26,4 +32,21 @@ class Player(models.Model):
         return f"{self.user}"
 
     def create_sport(self, data: dict[str, Any]) -> "participant_models.PlayerSport":
-        return participant_models.PlayerSport.objects.create(**data)
+        from events.models import ActivityFeedEntry
+
+        with transaction.atomic():
+            player_sport = participant_models.PlayerSport.objects.create(**data)
+            ActivityFeedEntry.objects.refresh(players=[self])
+        return player_sport
+
+    def set_exclusive_schedule(self, exclusive_schedule: bool) -> None:
+        """
+        Turns the exclusive schedule on or off. Raises ValidationError if it
+        is turned on while the player has overlapping open activities.
+        """
+        from events.models import ActivityPlayer
+
+        with transaction.atomic():
+            self.exclusive_schedule = exclusive_schedule
+            self.save(update_fields=("exclusive_schedule",))
+            ActivityPlayer.objects.filter(player=self).sync_schedule()
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from participants import models as participant_models
@@ -49,5 +49,9 @@ class PlayerSport(models.Model):
         return f"{self.player} - {self.sport} - {self.level}"
 
     def update_level(self, level: "participant_models.SportLevel") -> None:
+        from events.models import ActivityFeedEntry
+
         self.level = level
-        self.save()
+        with transaction.atomic():
+            self.save()
+            ActivityFeedEntry.objects.refresh(players=[self.player_id])
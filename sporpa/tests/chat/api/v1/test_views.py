@@ -0,0 +1,93 @@
+from typing import Callable
+
+import pytest
+from rest_framework import status as http_status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from django.urls import reverse
+
+from accounts.models import User
+from chat.api.v1.views import ActivityMessageListView, ConversationListView, DirectMessageListView
+from chat.models import ActivityMessage, DirectMessage
+from events.models import Activity
+from tests.accounts.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+request_factory = APIRequestFactory()
+
+
+class TestActivityMessageListView:
+    def test_list(self, django_assert_num_queries: Callable, activity_with_participants: Activity) -> None:
+        activity = activity_with_participants
+        user = activity.participants[0].user
+        activity_messages = [
+            ActivityMessage.objects.create(sender=user, activity=activity, content=f"Message {index}")
+            for index in range(3)
+        ]
+        request = request_factory.get(
+            reverse("chat:activity_messages", kwargs={"activity_pk": activity.pk}),
+        )
+        force_authenticate(request, user=user)
+        user.player
+
+        # The membership is cached after the first page.
+        for total_queries in (2, 1):
+            with django_assert_num_queries(total_queries):
+                response = ActivityMessageListView.as_view()(request, activity_pk=activity.pk)
+                response.render()
+
+            assert response.status_code == http_status.HTTP_200_OK
+            assert [data["pk"] for data in response.data["results"]] == [
+                activity_message.pk for activity_message in reversed(activity_messages)
+            ]
+
+    def test_list_when_user_is_not_player(self, user2: User, activity_without_participants: Activity) -> None:
+        request = request_factory.get(
+            reverse("chat:activity_messages", kwargs={"activity_pk": activity_without_participants.pk}),
+        )
+        force_authenticate(request, user=user2)
+        response = ActivityMessageListView.as_view()(request, activity_pk=activity_without_participants.pk)
+
+        assert response.status_code == http_status.HTTP_403_FORBIDDEN
+
+
+class TestConversationListView:
+    def test_list(self, django_assert_num_queries: Callable, user: User, user2: User) -> None:
+        user3 = UserFactory()
+        DirectMessage.objects.create(sender=user, receiver=user2, content="Hi")
+        latest_with_user2 = DirectMessage.objects.create(sender=user2, receiver=user, content="Hello")
+        latest_with_user3 = DirectMessage.objects.create(sender=user, receiver=user3, content="Hey")
+        DirectMessage.objects.create(sender=user2, receiver=user3, content="Hey")
+        request = request_factory.get(
+            reverse("chat:conversations"),
+        )
+        force_authenticate(request, user=user)
+
+        with django_assert_num_queries(1):
+            response = ConversationListView.as_view()(request)
+            response.render()
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert [data["pk"] for data in response.data["results"]] == [latest_with_user3.pk, latest_with_user2.pk]
+        assert response.data["results"][1]["sender"] == user2.pk
+        assert response.data["results"][1]["content"] == "Hello"
+
+
+class TestDirectMessageListView:
+    def test_list(self, user: User, user2: User) -> None:
+        direct_messages = [
+            DirectMessage.objects.create(sender=sender, receiver=receiver, content=f"Message {index}")
+            for index, (sender, receiver) in enumerate([(user, user2), (user2, user), (user, user2)])
+        ]
+        DirectMessage.objects.create(sender=user, receiver=UserFactory())
+        request = request_factory.get(
+            reverse("chat:direct_messages", kwargs={"user_pk": user2.pk}),
+        )
+        force_authenticate(request, user=user)
+
+        response = DirectMessageListView.as_view()(request, user_pk=user2.pk)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert [data["pk"] for data in response.data["results"]] == [
+            direct_message.pk for direct_message in reversed(direct_messages)
+        ]
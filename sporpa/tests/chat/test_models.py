@@ -0,0 +1,28 @@
+import pytest
+
+from accounts.models import User
+from chat.models import DirectMessage
+from tests.accounts.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestDirectMessageManager:
+    def test_conversation_key(self, user: User, user2: User) -> None:
+        sent = DirectMessage.objects.create(sender=user, receiver=user2)
+        received = DirectMessage.objects.create(sender=user2, receiver=user)
+
+        conversation_key = DirectMessage.get_conversation_key(user.pk, user2.pk)
+        assert conversation_key == DirectMessage.get_conversation_key(user2.pk, user.pk)
+        assert sent.conversation_key == received.conversation_key == conversation_key
+        assert list(DirectMessage.objects.filter_conversation(user2.pk, user.pk).order_by("pk")) == [sent, received]
+
+    def test_filter_latest(self, user: User, user2: User) -> None:
+        user3 = UserFactory()
+        DirectMessage.objects.create(sender=user, receiver=user2)
+        latest_with_user2 = DirectMessage.objects.create(sender=user2, receiver=user)
+        DirectMessage.objects.create(sender=user3, receiver=user)
+        latest_with_user3 = DirectMessage.objects.create(sender=user, receiver=user3)
+        DirectMessage.objects.create(sender=user2, receiver=user3)
+
+        assert set(DirectMessage.objects.filter_latest(user.pk)) == {latest_with_user2, latest_with_user3}
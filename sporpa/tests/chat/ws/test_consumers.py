@@ -0,0 +1,372 @@
+import asyncio
+import threading
+from typing import Any, Callable
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import BaseChannelLayer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+
+from django.db import connection
+
+from accounts.models import User
+from chat.models import ActivityMessage, DirectMessage
+from chat.ws.consumers import ActivityMessageConsumer, send_activity_message
+from chat.ws.controls import get_activity_chat_group_name
+from chat.ws.routing import websocket_urlpatterns
+from chat.ws.writers import ActivityMessageWriter
+from events.api.v1.serializers import ActivityUpdateSerializer
+from events.models import Activity
+
+pytestmark = pytest.mark.django_db
+
+
+class TestActivityMessageConsumer:
+    @pytest.mark.parametrize("write_behind", [False, True])
+    def test_receive(
+        self,
+        settings: Any,
+        channel_layer: BaseChannelLayer,
+        activity_with_participants: Activity,
+        write_behind: bool,
+    ) -> None:
+        settings.CHAT_WRITE_BEHIND = write_behind
+        activity = activity_with_participants
+        sender = activity.organizer.user
+
+        @async_to_sync
+        async def run() -> tuple[dict, bool]:
+            communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/chat/{activity.pk}/")
+            communicator.scope["user"] = sender
+            connected, _ = await communicator.connect()
+            assert connected
+
+            await communicator.send_json_to({"message": "Hello"})
+            data = await communicator.receive_json_from()
+            stored_before_disconnect = await ActivityMessage.objects.aexists()
+            await communicator.disconnect()
+            return data, stored_before_disconnect
+
+        data, stored_before_disconnect = run()
+
+        assert stored_before_disconnect is not write_behind
+        activity_message = ActivityMessage.objects.get()
+        assert data["pk"] == activity_message.pk
+        assert data["sender"] == sender.pk
+        assert data["activity"] == activity.pk
+        assert data["content"] == "Hello"
+
+    def test_connect_since(
+        self,
+        channel_layer: BaseChannelLayer,
+        activity_with_participants: Activity,
+    ) -> None:
+        activity = activity_with_participants
+        sender = activity.organizer.user
+        activity_messages = [
+            ActivityMessage.objects.create(sender=sender, activity=activity, content=f"Message {index}")
+            for index in range(3)
+        ]
+
+        @async_to_sync
+        async def run() -> tuple[list[dict], dict, bool]:
+            communicator = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns),
+                f"/chat/{activity.pk}/?since={activity_messages[0].pk}",
+            )
+            communicator.scope["user"] = sender
+            connected, _ = await communicator.connect()
+            assert connected
+
+            replayed = [await communicator.receive_json_from() for _ in range(2)]
+            # Sent live while the replay was read.
+            await channel_layer.group_send(
+                get_activity_chat_group_name(activity.pk),
+                {"type": "chat_message", "activity_message": replayed[-1]},
+            )
+            await communicator.send_json_to({"message": "Hello"})
+            live = await communicator.receive_json_from()
+            received_nothing = await communicator.receive_nothing()
+            await communicator.disconnect()
+            return replayed, live, received_nothing
+
+        replayed, live, received_nothing = run()
+
+        assert [data["pk"] for data in replayed] == [activity_message.pk for activity_message in activity_messages[1:]]
+        assert live["content"] == "Hello"
+        assert received_nothing
+
+    def test_connect_since_when_write_behind(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        settings: Any,
+        channel_layer: BaseChannelLayer,
+        activity_with_participants: Activity,
+    ) -> None:
+        settings.CHAT_WRITE_BEHIND = True
+        activity = activity_with_participants
+        sender = activity.organizer.user
+        writer, other_writer = (ActivityMessageWriter(batch_size=100, flush_interval=60) for _ in range(2))
+        monkeypatch.setattr("chat.ws.consumers.get_activity_message_writer", lambda: writer)
+
+        @async_to_sync
+        async def run() -> dict:
+            activity_messages = [
+                ActivityMessage(
+                    pk=await message_writer.get_next_pk(),
+                    sender=sender,
+                    activity=activity,
+                    content=f"Message {index}",
+                )
+                for index, message_writer in enumerate((other_writer, writer))
+            ]
+            # Sent by the other process but only pending there, with a lower
+            # pk than the last message the client received.
+            await other_writer.add(activity_messages[0])
+            await writer.add(activity_messages[1])
+            await writer.flush()
+
+            communicator = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns),
+                f"/chat/{activity.pk}/?since={activity_messages[1].pk}",
+            )
+            communicator.scope["user"] = sender
+            connected, _ = await communicator.connect()
+            assert connected
+            output = await communicator.receive_output()
+            await other_writer.flush()
+            return output
+
+        assert run() == {"type": "websocket.close", "code": ActivityMessageConsumer.REPLAY_UNAVAILABLE_CLOSE_CODE}
+        assert not channel_layer.groups
+
+    def test_connect_since_when_replay_is_too_large(
+        self,
+        settings: Any,
+        channel_layer: BaseChannelLayer,
+        activity_with_participants: Activity,
+    ) -> None:
+        settings.CHAT_REPLAY_LIMIT = 1
+        activity = activity_with_participants
+        sender = activity.organizer.user
+        activity_messages = [
+            ActivityMessage.objects.create(sender=sender, activity=activity, content=f"Message {index}")
+            for index in range(3)
+        ]
+
+        @async_to_sync
+        async def run() -> dict:
+            communicator = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns),
+                f"/chat/{activity.pk}/?since={activity_messages[0].pk}",
+            )
+            communicator.scope["user"] = sender
+            connected, _ = await communicator.connect()
+            assert connected
+            return await communicator.receive_output()
+
+        assert run() == {"type": "websocket.close", "code": ActivityMessageConsumer.REPLAY_TOO_LARGE_CLOSE_CODE}
+        assert not channel_layer.groups
+
+    def test_connect_when_user_is_not_player(
+        self,
+        channel_layer: BaseChannelLayer,
+        user2: User,
+        activity_without_participants: Activity,
+    ) -> None:
+        @async_to_sync
+        async def run() -> bool:
+            communicator = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns),
+                f"/chat/{activity_without_participants.pk}/",
+            )
+            communicator.scope["user"] = user2
+            connected, _ = await communicator.connect()
+            return connected
+
+        assert not run()
+
+    def test_chat_revoke(
+        self,
+        django_capture_on_commit_callbacks: Callable,
+        channel_layer: BaseChannelLayer,
+        activity_with_participants: Activity,
+    ) -> None:
+        activity = activity_with_participants
+        participant = activity.participants[0]
+        users = [activity.organizer.user, participant.user]
+
+        def remove_participant() -> None:
+            with django_capture_on_commit_callbacks(execute=True):
+                activity.remove_participant(participant)
+
+        @async_to_sync
+        async def run() -> tuple[dict, dict, bool]:
+            communicators = []
+            for user in users:
+                communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/chat/{activity.pk}/")
+                communicator.scope["user"] = user
+                connected, _ = await communicator.connect()
+                assert connected
+                communicators.append(communicator)
+            organizer_communicator, participant_communicator = communicators
+
+            await sync_to_async(remove_participant)()
+            output = await participant_communicator.receive_output()
+            await organizer_communicator.send_json_to({"message": "Hello"})
+            data = await organizer_communicator.receive_json_from()
+            received_nothing = await participant_communicator.receive_nothing()
+            await organizer_communicator.disconnect()
+            return output, data, received_nothing
+
+        output, data, received_nothing = run()
+
+        assert output == {"type": "websocket.close", "code": ActivityMessageConsumer.REVOKED_CLOSE_CODE}
+        assert data["content"] == "Hello"
+        assert received_nothing
+
+    def test_chat_close(
+        self,
+        django_capture_on_commit_callbacks: Callable,
+        channel_layer: BaseChannelLayer,
+        activity_with_participants: Activity,
+    ) -> None:
+        activity = activity_with_participants
+        users = [activity.organizer.user, activity.participants[0].user]
+
+        def cancel() -> None:
+            serializer = ActivityUpdateSerializer(
+                instance=activity,
+                data={"status": Activity.Status.CANCELLED},
+                partial=True,
+            )
+            assert serializer.is_valid()
+            with django_capture_on_commit_callbacks(execute=True):
+                serializer.save()
+
+        @async_to_sync
+        async def run() -> tuple[list[dict], bool]:
+            communicators = []
+            for user in users:
+                communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/chat/{activity.pk}/")
+                communicator.scope["user"] = user
+                connected, _ = await communicator.connect()
+                assert connected
+                communicators.append(communicator)
+
+            await sync_to_async(cancel)()
+            outputs = [await communicator.receive_output() for communicator in communicators]
+
+            communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/chat/{activity.pk}/")
+            communicator.scope["user"] = users[0]
+            connected, _ = await communicator.connect()
+            return outputs, connected
+
+        outputs, connected = run()
+
+        assert outputs == [{"type": "websocket.close", "code": ActivityMessageConsumer.CLOSED_CLOSE_CODE}] * 2
+        assert not channel_layer.groups
+        assert not connected
+
+
+class _RecordingChannelLayer:
+    """Records the pks of the sent activity messages, the first one late."""
+
+    def __init__(self) -> None:
+        self.first_send_started = threading.Event()
+        self.sent_pks: list[int] = []
+
+    async def group_send(self, group: str, message: dict) -> None:
+        if not self.first_send_started.is_set():
+            self.first_send_started.set()
+            await asyncio.sleep(0.2)
+        self.sent_pks.append(message["activity_message"]["pk"])
+
+
+# Restores the sports of the data migrations, which the flush after
+# another transactional test drops.
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_send_activity_message_when_concurrent(
+    monkeypatch: pytest.MonkeyPatch,
+    activity_with_participants: Activity,
+) -> None:
+    activity = activity_with_participants
+    senders = [activity.organizer.user, activity.participants[0].user]
+    channel_layer = _RecordingChannelLayer()
+    monkeypatch.setattr("chat.ws.consumers.get_channel_layer", lambda: channel_layer)
+
+    def send(sender: User, wait: bool) -> None:
+        try:
+            # The second sender stores its message while the first one is
+            # being sent, as another process would.
+            if wait:
+                channel_layer.first_send_started.wait()
+            send_activity_message(sender, activity.pk, f"Message from {sender.pk}")
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=send, args=(sender, index > 0)) for index, sender in enumerate(senders)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stored_pks = list(ActivityMessage.objects.order_by("created_at").values_list("pk", flat=True))
+    assert channel_layer.sent_pks == sorted(stored_pks)
+    assert stored_pks == sorted(stored_pks)
+
+
+class TestDirectMessageConsumer:
+    def test_receive(self, channel_layer: BaseChannelLayer, user: User, user2: User) -> None:
+        @async_to_sync
+        async def run() -> tuple[dict, dict]:
+            communicators = []
+            for receiver in (user, user2):
+                communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/chat/direct/")
+                communicator.scope["user"] = receiver
+                connected, _ = await communicator.connect()
+                assert connected
+                communicators.append(communicator)
+            sender_communicator, receiver_communicator = communicators
+
+            await sender_communicator.send_json_to({"receiver": user2.pk, "message": "Hello"})
+            sent = await sender_communicator.receive_json_from()
+            received = await receiver_communicator.receive_json_from()
+            for communicator in communicators:
+                await communicator.disconnect()
+            return sent, received
+
+        sent, received = run()
+
+        direct_message = DirectMessage.objects.get()
+        assert sent == received
+        assert received["pk"] == direct_message.pk
+        assert received["sender"] == user.pk
+        assert received["receiver"] == user2.pk
+        assert received["content"] == "Hello"
+
+    def test_receive_when_receiver_is_sender(self, channel_layer: BaseChannelLayer, user: User) -> None:
+        @async_to_sync
+        async def run() -> dict:
+            communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/chat/direct/")
+            communicator.scope["user"] = user
+            connected, _ = await communicator.connect()
+            assert connected
+
+            await communicator.send_json_to({"receiver": user.pk, "message": "Hello"})
+            data = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return data
+
+        assert run() == {"errors": {"receiver": ["You cannot send a message to yourself."]}}
+        assert not DirectMessage.objects.exists()
+
+    def test_connect_when_user_is_anonymous(self, channel_layer: BaseChannelLayer) -> None:
+        @async_to_sync
+        async def run() -> bool:
+            communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/chat/direct/")
+            connected, _ = await communicator.connect()
+            return connected
+
+        assert not run()
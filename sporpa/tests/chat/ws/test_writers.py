@@ -0,0 +1,141 @@
+import asyncio
+from collections import deque
+from typing import Callable
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from django.db import DatabaseError, connection
+
+from chat.models import ActivityMessage
+from chat.ws.writers import ActivityMessageWriter
+from events.models import Activity
+
+pytestmark = pytest.mark.django_db
+
+
+def _build_activity_messages(writer: ActivityMessageWriter, activity: Activity, total: int) -> list[ActivityMessage]:
+    return [
+        ActivityMessage(
+            pk=async_to_sync(writer.get_next_pk)(),
+            sender=activity.organizer.user,
+            activity=activity,
+            content=f"Message {index}",
+        )
+        for index in range(total)
+    ]
+
+
+class TestActivityMessageWriter:
+    def test_get_next_pk(self, activity_without_participants: Activity, django_assert_num_queries: Callable) -> None:
+        writer = ActivityMessageWriter(batch_size=2, flush_interval=1)
+
+        with django_assert_num_queries(1):
+            first_pk, second_pk = async_to_sync(writer.get_next_pk)(), async_to_sync(writer.get_next_pk)()
+        with django_assert_num_queries(1):
+            third_pk = async_to_sync(writer.get_next_pk)()
+
+        assert first_pk < second_pk < third_pk
+        activity_message = ActivityMessage.objects.create(
+            sender=activity_without_participants.organizer.user,
+            activity=activity_without_participants,
+        )
+        assert activity_message.pk > third_pk + 1
+
+    def test_get_next_pk_after_flush(self, activity_without_participants: Activity) -> None:
+        writer = ActivityMessageWriter(batch_size=10, flush_interval=1)
+        first_pk = async_to_sync(writer.get_next_pk)()
+
+        async_to_sync(writer.flush)()
+
+        assert writer.reserved_pks == deque()
+        assert async_to_sync(writer.get_next_pk)() == first_pk + 10
+
+    def test_add_when_batch_is_full(self, activity_without_participants: Activity) -> None:
+        writer = ActivityMessageWriter(batch_size=3, flush_interval=60)
+        activity_messages = _build_activity_messages(writer, activity_without_participants, 3)
+
+        @async_to_sync
+        async def add(activity_messages: list[ActivityMessage]) -> None:
+            for activity_message in activity_messages:
+                await writer.add(activity_message)
+
+        add(activity_messages[:2])
+        assert not ActivityMessage.objects.exists()
+
+        add(activity_messages[2:])
+        assert list(ActivityMessage.objects.order_by("pk")) == activity_messages
+        assert writer.pending == []
+
+    def test_add_when_flush_interval_passes(self, activity_without_participants: Activity) -> None:
+        writer = ActivityMessageWriter(batch_size=100, flush_interval=0.01)
+        activity_messages = _build_activity_messages(writer, activity_without_participants, 2)
+
+        @async_to_sync
+        async def add() -> bool:
+            for activity_message in activity_messages:
+                await writer.add(activity_message)
+            stored_before_interval = await ActivityMessage.objects.aexists()
+            await asyncio.sleep(0.1)
+            return stored_before_interval
+
+        assert not add()
+        assert list(ActivityMessage.objects.order_by("pk")) == activity_messages
+
+    def test_flush_sync_keeps_created_at(self, activity_without_participants: Activity) -> None:
+        writer = ActivityMessageWriter(batch_size=100, flush_interval=60, synchronous_commit="off")
+        activity_messages = _build_activity_messages(writer, activity_without_participants, 2)
+        writer.pending = list(activity_messages)
+
+        writer.flush_sync()
+
+        assert list(ActivityMessage.objects.order_by("pk").values_list("created_at", flat=True)) == [
+            activity_message.created_at for activity_message in activity_messages
+        ]
+
+    def test_write_when_activity_message_is_invalid(
+        self, activity_without_participants: Activity, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # Foreign keys are checked at the end of the writer's transaction,
+        # not of the test's.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        writer = ActivityMessageWriter(batch_size=100, flush_interval=60, max_attempts=2)
+        activity_messages = _build_activity_messages(writer, activity_without_participants, 2)
+        activity_messages[0].activity_id = 0
+
+        assert writer.write(activity_messages) == activity_messages[:1]
+        assert list(ActivityMessage.objects.all()) == [activity_messages[1]]
+        assert writer.failed_attempts == {activity_messages[0].pk: 1}
+        assert not caplog.records
+
+        assert writer.write(activity_messages[:1]) == []
+        assert writer.failed_attempts == {}
+        assert caplog.messages == [
+            f"Dropped activity message {activity_messages[0].pk} of activity 0 after 2 attempts.",
+        ]
+
+    def test_flush_when_write_fails_once(
+        self, activity_without_participants: Activity, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        writer = ActivityMessageWriter(batch_size=100, flush_interval=60)
+        activity_messages = _build_activity_messages(writer, activity_without_participants, 2)
+        bulk_create = writer._bulk_create
+        failures = [DatabaseError()] * 3
+
+        def _bulk_create(activity_messages: list[ActivityMessage]) -> None:
+            if failures:
+                raise failures.pop()
+            bulk_create(activity_messages)
+
+        monkeypatch.setattr(writer, "_bulk_create", _bulk_create)
+        writer.pending = list(activity_messages)
+
+        async_to_sync(writer.flush)()
+        assert writer.pending == activity_messages
+        assert not ActivityMessage.objects.exists()
+
+        writer.flush_sync()
+        assert writer.pending == []
+        assert writer.failed_attempts == {}
+        assert list(ActivityMessage.objects.order_by("pk")) == activity_messages
@@ -1,27 +1,71 @@
 import io
+import random
+import re
 import tempfile
+from typing import Any, Callable
 
 import pytest
 from _pytest.fixtures import SubRequest
+from channels.layers import BaseChannelLayer, get_channel_layer
 from faker import Faker
 from PIL import Image
 
+from django.db import connection
+from django.db.models import QuerySet
+
 from accounts.models import User
-from events.models import Activity
-from participants.models import ParticipationRequest
+from events.models import Activity, ActivitySeries
+from participants.models import ParticipationRequest, Player, Sport
 from tests.accounts.factories import UserFactory
-from tests.events.factories import ActivityFactory
+from tests.events.factories import ActivityFactory, ActivitySeriesFactory
 from tests.participants.factories import ParticipationRequestFactory
 
 fake = Faker()
 pytestmark = pytest.mark.django_db
 
+SEED_ACTIVITY_PLAYERS_SQL = """
+    WITH seeded AS (
+        INSERT INTO activity (
+            is_active, created_at, organizer_id, sport_id, player_limit, player_count,
+            name, about, available_between_at, status, level_ids
+        )
+        SELECT
+            TRUE,
+            now(),
+            (%(players)s::integer[])[1 + i %% cardinality(%(players)s::integer[])],
+            %(sport)s,
+            10,
+            4,
+            'Seeded activity ' || i,
+            '',
+            tstzrange(now() + i * interval '1 minute', now() + i * interval '1 minute' + interval '2 hours'),
+            %(status)s,
+            '{}'
+        FROM generate_series(1, %(total)s) AS i
+        RETURNING id, organizer_id
+    )
+    INSERT INTO activity_player (activity_id, player_id, is_organizer)
+    SELECT id, organizer_id, TRUE FROM seeded
+    UNION ALL
+    SELECT
+        id,
+        (%(players)s::integer[])[
+            1 + (array_position(%(players)s::integer[], organizer_id) + k) %% cardinality(%(players)s::integer[])
+        ],
+        FALSE
+    FROM seeded, generate_series(1, 3) AS k
+"""
+
 
 def _activity_with_participants(user: User, data: dict) -> Activity:
     total_participants = data.pop("total_participants", 1)
+    data.setdefault(
+        "player_limit",
+        random.randint(total_participants + 2, Activity.player_limit.field.validators[1].limit_value),
+    )
     activity: Activity = ActivityFactory(organizer=user.player, **data)
     for i in range(total_participants):
-        activity.players.add(
+        activity.add_participants(
             UserFactory(
                 player__sports__level=activity.levels.first(),
                 player_sports_size=1,
@@ -61,6 +105,12 @@ def image_file() -> tempfile._TemporaryFileWrapper:
     return tmp_file
 
 
+@pytest.fixture
+def channel_layer(settings: Any) -> BaseChannelLayer:
+    settings.CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+    return get_channel_layer()
+
+
 @pytest.fixture
 def activity_without_participants(request: SubRequest, user: User) -> Activity:
     data = getattr(request, "param", {})
@@ -73,6 +123,12 @@ def activity_with_participants(request: SubRequest, user: User) -> Activity:
     return _activity_with_participants(user=user, data=data)
 
 
+@pytest.fixture
+def activity_series(request: SubRequest, user: User) -> ActivitySeries:
+    data = getattr(request, "param", {})
+    return ActivitySeriesFactory(organizer=user.player, **data)
+
+
 @pytest.fixture
 def participation_request(activity_without_participants: Activity) -> ParticipationRequest:
     participant_user = UserFactory(
@@ -94,3 +150,48 @@ def activities_with_participants(request: SubRequest, user: User) -> list[Activi
     for i in range(total_activities):
         activities.append(_activity_with_participants(user=user, data=data))
     return activities
+
+
+@pytest.fixture
+def seeded_activity_players() -> list[Player]:
+    """
+    Seeds 20,000 activities of 2,000 players, each activity with an
+    organizer and three participants, and analyzes the tables, so a player
+    has about 40 roster rows and the planner picks the indexes on its own.
+    """
+    users = User.objects.bulk_create(User(email=f"seeded{i}@example.com") for i in range(2_000))
+    players = Player.objects.bulk_create(Player(user=user) for user in users)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SEED_ACTIVITY_PLAYERS_SQL,
+            {
+                "players": [player.pk for player in players],
+                "sport": Sport.objects.values_list("pk", flat=True).first(),
+                "status": Activity.Status.OPEN,
+                "total": 20_000,
+            },
+        )
+        cursor.execute('ANALYZE "user", player, activity, activity_player')
+    return players
+
+
+@pytest.fixture
+def assert_index_scans() -> Callable[..., None]:
+    """
+    Returns a callable which asserts that the query plan of the queryset or
+    SQL reads the activity and activity_player tables through indexes only,
+    and uses every one of the given indexes.
+    """
+
+    def _assert_index_scans(query: QuerySet | str, *index_names: str) -> None:
+        if isinstance(query, str):
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {query}")
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+        else:
+            plan = query.explain()
+        assert not re.search(r"Seq Scan on (activity|activity_player)\b", plan), plan
+        for index_name in index_names:
+            assert re.search(rf"\b(using|on) {index_name}\b", plan), plan
+
+    return _assert_index_scans
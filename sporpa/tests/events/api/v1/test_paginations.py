@@ -0,0 +1,134 @@
+from typing import Callable
+
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from django.urls import reverse
+
+from accounts.models import User
+from events.api.v1.paginations import ActivityCursorPagination
+from events.models import Activity
+from tests.events.factories import ActivityFactory
+
+pytestmark = pytest.mark.django_db
+request_factory = APIRequestFactory()
+
+
+def _paginate(url: str, page_size: int = 2) -> tuple[list[Activity], ActivityCursorPagination]:
+    paginator = ActivityCursorPagination()
+    paginator.page_size = page_size
+    page = paginator.paginate_queryset(Activity.objects.all(), Request(request_factory.get(url)))
+    assert page is not None
+    return page, paginator
+
+
+class TestActivityCursorPagination:
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [{"total_activities": 5, "total_participants": 1}],
+        indirect=["activities_with_participants"],
+    )
+    def test_paginate_queryset(
+        self,
+        activities_with_participants: list[Activity],
+        django_assert_num_queries: Callable,
+    ) -> None:
+        expected_activities = list(Activity.objects.order_by("available_between_at__startswith", "pk"))
+        url: str | None = reverse("events:activities")
+        pages = []
+        while url:
+            with django_assert_num_queries(1):
+                page, paginator = _paginate(url)
+            pages.append(page)
+            url = paginator.get_next_link()
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [activity for page in pages for activity in page] == expected_activities
+
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [{"total_activities": 5, "total_participants": 1}],
+        indirect=["activities_with_participants"],
+    )
+    def test_paginate_queryset_when_previous(self, activities_with_participants: list[Activity]) -> None:
+        expected_activities = list(Activity.objects.order_by("available_between_at__startswith", "pk"))
+        first_page, paginator = _paginate(reverse("events:activities"))
+        next_link = paginator.get_next_link()
+        assert paginator.get_previous_link() is None
+        assert next_link
+
+        second_page, paginator = _paginate(next_link)
+        previous_link = paginator.get_previous_link()
+        assert previous_link
+
+        previous_page, paginator = _paginate(previous_link)
+
+        assert first_page == expected_activities[:2]
+        assert second_page == expected_activities[2:4]
+        assert previous_page == first_page
+        assert paginator.get_previous_link() is None
+        assert paginator.get_next_link()
+
+    def test_paginate_queryset_when_search(self, user: User) -> None:
+        activities = [
+            ActivityFactory(organizer=user.player, name=name, about="")
+            for name in ("Squash", "Squash squash", "Squash squash squash", "Chess")
+        ]
+        url: str | None = reverse("events:activities")
+        pages = []
+        while url:
+            paginator = ActivityCursorPagination()
+            paginator.page_size = 2
+            page = paginator.paginate_queryset(Activity.objects.search("squash"), Request(request_factory.get(url)))
+            assert page is not None
+            pages.append(page)
+            url = paginator.get_next_link()
+
+        assert [activity for page in pages for activity in page] == activities[2::-1]
+
+    def test_paginate_queryset_when_search_ranks_are_tied(self, user: User) -> None:
+        activities = [ActivityFactory(organizer=user.player, name="Squash", about="") for _ in range(7)]
+        url: str | None = reverse("events:activities")
+        pages = []
+        while url:
+            paginator = ActivityCursorPagination()
+            paginator.page_size = 2
+            page = paginator.paginate_queryset(Activity.objects.search("squash"), Request(request_factory.get(url)))
+            assert page is not None
+            pages.append(page)
+            url = paginator.get_next_link()
+
+        assert [len(page) for page in pages] == [2, 2, 2, 1]
+        assert [activity for page in pages for activity in page] == activities
+
+    def test_paginate_queryset_when_ranked(self, user: User, user2: User) -> None:
+        player_sport = user.player.sports.first()
+        activities = [ActivityFactory(organizer=user.player, player_sport=player_sport) for _ in range(5)]
+        user2.player.sports.all().delete()
+        user2.player.sports.create(sport=player_sport.sport, level=player_sport.level)
+        queryset = Activity.objects.rank_relevance(user2.player)
+        expected_activities = list(queryset.order_by("-relevance", "pk"))
+        url: str | None = reverse("events:activities")
+        pages = []
+        while url:
+            paginator = ActivityCursorPagination()
+            paginator.page_size = 2
+            page = paginator.paginate_queryset(queryset, Request(request_factory.get(url)))
+            assert page is not None
+            pages.append(page)
+            url = paginator.get_next_link()
+
+        assert len(expected_activities) == len(activities)
+        assert [activity for page in pages for activity in page] == expected_activities
+
+    @pytest.mark.parametrize("position", ["[1]", "not-json", '["not-a-date", "1"]'])
+    def test_paginate_queryset_when_cursor_is_invalid(self, position: str) -> None:
+        paginator = ActivityCursorPagination()
+        paginator.base_url = reverse("events:activities")
+        url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+        with pytest.raises(NotFound):
+            _paginate(url)
@@ -5,15 +5,18 @@ from faker import Faker
 from rest_framework.test import APIRequestFactory
 
 from django.urls import reverse
+from django.utils import timezone
 
 from accounts.models import User
 from events.api.v1.serializers import (
     ActivityCreateSerializer,
     ActivityListSerializer,
+    ActivitySeriesCreateSerializer,
     ActivityUpdateSerializer,
+    ParticipationRequestBulkApprovalSerializer,
     ParticipationRequestListSerializer,
 )
-from events.models import Activity
+from events.models import Activity, ActivityFeedEntry, ActivitySeries
 from participants.models import ParticipationRequest, PlayerSport, Sport, SportLevel
 
 fake = Faker()
@@ -156,6 +159,86 @@ class TestActivityCreateSerializer:
         assert serializer.is_valid() is False
 
 
+class TestActivitySeriesCreateSerializer:
+    def test_create(self, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.first()
+        starts_at = fake.date_time_between(start_date="+1d", end_date="+6d")
+        data = {
+            "name": fake.text(max_nb_chars=ActivitySeries.name.field.max_length),
+            "sport": player_sport.sport.pk,
+            "levels": [player_sport.level.pk],
+            "starts_at": starts_at,
+            "duration": "02:00:00",
+            "frequency": ActivitySeries.Frequency.WEEKLY,
+            "occurrence_limit": 3,
+        }
+        request = request_factory.post(
+            reverse("events:activity_series"),
+            data=data,
+        )
+        request.user = user
+        context = {
+            "request": request,
+        }
+        serializer = ActivitySeriesCreateSerializer(data=data, context=context)
+        assert serializer.is_valid()
+
+        activity_series: ActivitySeries = serializer.save()
+
+        assert activity_series.organizer == user.player
+        assert activity_series.starts_at == starts_at
+        assert activity_series.generated_count == 3
+        assert serializer.data["generated_count"] == 3
+        assert activity_series.activities.count() == 3
+
+    def test_create_when_user_does_not_have_sport_level(self, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.first()
+        sport_levels = SportLevel.objects.exclude(pk=player_sport.level.pk).values_list(flat=True)
+        data = {
+            "name": fake.text(max_nb_chars=ActivitySeries.name.field.max_length),
+            "sport": player_sport.sport.pk,
+            "levels": list(sport_levels),
+            "starts_at": fake.date_time_between(start_date="+1d", end_date="+6d"),
+            "duration": "02:00:00",
+        }
+        request = request_factory.post(
+            reverse("events:activity_series"),
+            data=data,
+        )
+        request.user = user
+        context = {
+            "request": request,
+        }
+        serializer = ActivitySeriesCreateSerializer(data=data, context=context)
+
+        assert not serializer.is_valid()
+        assert serializer.errors["non_field_errors"][0] == (
+            f"The player does not have the requested level for {player_sport.sport.get_name_display()}."
+        )
+
+    def test_create_when_starts_at_less_than_now(self, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.first()
+        data = {
+            "name": fake.text(max_nb_chars=ActivitySeries.name.field.max_length),
+            "sport": player_sport.sport.pk,
+            "levels": [player_sport.level.pk],
+            "starts_at": fake.date_time_between(start_date="-6d", end_date="-1d"),
+            "duration": "02:00:00",
+        }
+        request = request_factory.post(
+            reverse("events:activity_series"),
+            data=data,
+        )
+        request.user = user
+        context = {
+            "request": request,
+        }
+        serializer = ActivitySeriesCreateSerializer(data=data, context=context)
+
+        assert not serializer.is_valid()
+        assert serializer.errors["starts_at"][0] == "Please select a further date."
+
+
 class TestActivityUpdateSerializer:
     def test_update(self, activity_without_participants: Activity) -> None:
         player_limit = random.randint(
@@ -221,6 +304,24 @@ class TestActivityUpdateSerializer:
         assert updated_activity_without_participants.available_between_at.upper == available_between_at["upper"]
         assert updated_activity_without_participants.status == status
 
+    def test_update_when_cancelled(self, user2: User, activity_without_participants: Activity) -> None:
+        activity = activity_without_participants
+        ActivityFeedEntry.objects.create(
+            player=user2.player,
+            activity=activity,
+            available_from=timezone.datetime.now(),
+        )
+        serializer = ActivityUpdateSerializer(
+            instance=activity,
+            data={"status": Activity.Status.CANCELLED},
+            partial=True,
+        )
+        assert serializer.is_valid()
+
+        serializer.save()
+
+        assert not activity.feed_entries.exists()
+
 
 class TestParticipationRequestListSerializer:
     def test_data(self, participation_request: ParticipationRequest) -> None:
@@ -236,6 +337,50 @@ class TestParticipationRequestListSerializer:
             assert data["level"] == participant_sport.level.pk
 
 
+class TestParticipationRequestBulkApprovalSerializer:
+    def test_create(self, participation_request: ParticipationRequest) -> None:
+        activity = participation_request.activity
+        data = {
+            "decisions": [
+                {"pk": participation_request.pk, "result": "accept"},
+                {"pk": 0, "result": "reject"},
+            ],
+        }
+        request = request_factory.post(
+            reverse("events:participation_requests_bulk_approval"),
+            data=data,
+        )
+        request.user = activity.organizer.user
+        context = {
+            "request": request,
+        }
+        serializer = ParticipationRequestBulkApprovalSerializer(data=data, context=context)
+        assert serializer.is_valid()
+
+        serializer.save()
+
+        assert serializer.data["results"] == [
+            {"pk": participation_request.pk, "result": "accept", "succeeded": True, "detail": None},
+            {"pk": 0, "result": "reject", "succeeded": False, "detail": "Not found."},
+        ]
+        assert activity.players.contains(participation_request.participant)
+
+    def test_validate_when_decisions_are_empty(self, user: User) -> None:
+        data: dict[str, list] = {"decisions": []}
+        request = request_factory.post(
+            reverse("events:participation_requests_bulk_approval"),
+            data=data,
+        )
+        request.user = user
+        context = {
+            "request": request,
+        }
+        serializer = ParticipationRequestBulkApprovalSerializer(data=data, context=context)
+
+        assert not serializer.is_valid()
+        assert "decisions" in serializer.errors
+
+
 class TestActivityListSerializer:
     def test_data(self, activity_with_participants: Activity) -> None:
         activity_with_participants.refresh_from_db()
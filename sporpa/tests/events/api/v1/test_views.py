@@ -1,22 +1,50 @@
+import csv
+import json
 import random
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Iterator
+from urllib.parse import parse_qs, urlparse
 
 import pytest
+from asgiref.sync import async_to_sync
 from faker import Faker
+from psycopg2.extras import DateTimeTZRange
 from rest_framework import status as http_status
 from rest_framework.test import APIRequestFactory, force_authenticate
 
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models.sql import compiler
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from accounts.models import User
+from events.api.v1.paginations import (
+    ActivityCursorPagination,
+    ActivityFeedCursorPagination,
+    ParticipationRequestCursorPagination,
+)
 from events.api.v1.views import (
+    ActivityFacetsView,
+    ActivityFeedView,
     ActivityListCreateView,
+    ActivitySeriesCreateView,
     ActivityUpdateView,
+    ParticipatedActivityExportView,
     ParticipatedActivityListView,
     ParticipationRequestApprovalView,
+    ParticipationRequestBulkApprovalView,
+    ParticipationRequestInboxView,
     ParticipationRequestListView,
 )
-from events.models import Activity
-from participants.models import ParticipationRequest, PlayerSport, Sport, SportLevel
+from events.models import Activity, ActivityFeedEntry, ActivitySeries
+from participants.models import ParticipationRequest, Player, PlayerSport, Sport, SportLevel
+from tests.accounts.factories import UserFactory
+from tests.events.factories import ActivityFactory
+from tests.participants.factories import ParticipationRequestFactory
 
 fake = Faker()
 pytestmark = pytest.mark.django_db
@@ -162,7 +190,10 @@ class TestActivityListCreateView:
 
         for data, activity in zip(
             response.data["results"],
-            activities_with_participants[1:],
+            Activity.objects.filter(pk__in=[activity.pk for activity in activities_with_participants[1:]]).order_by(
+                "available_between_at__startswith",
+                "pk",
+            ),
         ):
             organizer = activity.organizer
             participants = activity.participants
@@ -188,6 +219,243 @@ class TestActivityListCreateView:
             assert data["about"] == activity.about
             assert data["status"] == activity.status
 
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [
+            {"total_activities": 2, "total_participants": 2},
+            {"total_activities": 8, "total_participants": 4},
+        ],
+        indirect=["activities_with_participants"],
+    )
+    def test_list_num_queries(
+        self,
+        user2: User,
+        activities_with_participants: list[Activity],
+        django_assert_num_queries: Callable,
+    ) -> None:
+        request = request_factory.get(
+            reverse("events:activities"),
+        )
+        force_authenticate(request, user=user2)
+        user2.player
+
+        with django_assert_num_queries(2):
+            response = ActivityListCreateView.as_view()(request)
+            response.render()
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert len(response.data["results"]) == len(activities_with_participants)
+
+    @pytest.mark.parametrize(
+        "available_between_at_mode, expected_indexes",
+        [
+            ("overlap", [1, 2]),
+            ("contained_by", [1]),
+        ],
+    )
+    def test_list_when_available_between_at_mode(
+        self,
+        user: User,
+        user2: User,
+        available_between_at_mode: str,
+        expected_indexes: list[int],
+    ) -> None:
+        now = timezone.datetime.now()
+        activities = [
+            ActivityFactory(
+                organizer=user.player,
+                available_between_at=(now + timezone.timedelta(days=lower), now + timezone.timedelta(days=upper)),
+            )
+            for lower, upper in ((2, 3), (5, 6), (9, 12))
+        ]
+        request = request_factory.get(
+            reverse("events:activities"),
+            data={
+                "available_between_at_after": now + timezone.timedelta(days=4),
+                "available_between_at_before": now + timezone.timedelta(days=10),
+                "available_between_at_mode": available_between_at_mode,
+            },
+        )
+        force_authenticate(request, user=user2)
+        response = ActivityListCreateView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert sorted(data["pk"] for data in response.data["results"]) == [
+            activities[index].pk for index in expected_indexes
+        ]
+
+    @pytest.mark.parametrize(
+        "user, user2",
+        [
+            (
+                {"player__sports__level_id": 4, "player_sports_size": 1, "player__sports__sport_id": 5},
+                {"player__sports__level_id": 2, "player_sports_size": 1, "player__sports__sport_id": 5},
+            ),
+        ],
+        indirect=["user", "user2"],
+    )
+    def test_list_when_joinable(self, user: User, user2: User) -> None:
+        joinable_activity = ActivityFactory(organizer=user.player, levels=(2, 4))
+        ActivityFactory(organizer=user.player, levels=(4,))
+        request = request_factory.get(
+            reverse("events:activities"),
+            data={"joinable": True},
+        )
+        force_authenticate(request, user=user2)
+        response = ActivityListCreateView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert [data["pk"] for data in response.data["results"]] == [joinable_activity.pk]
+
+    def test_list_when_q(self, user: User, user2: User) -> None:
+        name_match = ActivityFactory(organizer=user.player, name="Evening padel", about="")
+        about_match = ActivityFactory(organizer=user.player, name="Evening game", about="Padel for beginners")
+        ActivityFactory(organizer=user.player, name="Evening run", about="")
+        request = request_factory.get(
+            reverse("events:activities"),
+            data={"q": "padel"},
+        )
+        force_authenticate(request, user=user2)
+        response = ActivityListCreateView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert [data["pk"] for data in response.data["results"]] == [name_match.pk, about_match.pk]
+
+    def test_list_when_ranked(self, user: User) -> None:
+        player_sport, other_player_sport = user.player.sports.all()[:2]
+        activities = [ActivityFactory(organizer=user.player, player_sport=player_sport) for _ in range(3)]
+        ActivityFactory(organizer=user.player, player_sport=other_player_sport)
+        participant = UserFactory(
+            player__sports__sport=player_sport.sport,
+            player__sports__level=player_sport.level,
+            player_sports_size=1,
+        )
+        expected_activities = list(
+            Activity.objects.filter(pk__in=[activity.pk for activity in activities])
+            .rank_relevance(participant.player)
+            .order_by("-relevance", "pk"),
+        )
+        request = request_factory.get(
+            reverse("events:activities"),
+            data={"ranked": True},
+        )
+        force_authenticate(request, user=participant)
+        response = ActivityListCreateView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert [data["pk"] for data in response.data["results"]] == [activity.pk for activity in expected_activities]
+
+    def test_list_when_ranked_pages(self, monkeypatch: pytest.MonkeyPatch, user: User) -> None:
+        monkeypatch.setattr(ActivityCursorPagination, "page_size", 2)
+        player_sport = user.player.sports.first()
+        activities = [ActivityFactory(organizer=user.player, player_sport=player_sport) for _ in range(5)]
+        participant = UserFactory(
+            player__sports__sport=player_sport.sport,
+            player__sports__level=player_sport.level,
+            player_sports_size=1,
+        )
+        url: str | None = reverse("events:activities") + "?ranked=true"
+        pks: list[int] = []
+        ranked_ats: set[str] = set()
+        while url:
+            request = request_factory.get(url)
+            force_authenticate(request, user=participant)
+            response = ActivityListCreateView.as_view()(request)
+            assert response.status_code == http_status.HTTP_200_OK
+            pks.extend(data["pk"] for data in response.data["results"])
+            url = response.data["next"]
+            if url:
+                ranked_ats.update(parse_qs(urlparse(url).query)["ranked_at"])
+
+        # Every page ranked with the time of the first one.
+        (ranked_at,) = ranked_ats
+        expected_activities = (
+            Activity.objects.filter(pk__in=[activity.pk for activity in activities])
+            .rank_relevance(participant.player, datetime.fromisoformat(ranked_at))
+            .order_by("-relevance", "pk")
+        )
+        assert pks == [activity.pk for activity in expected_activities]
+
+
+class TestActivityFeedView:
+    def test_list(self, monkeypatch: pytest.MonkeyPatch, user: User, user2: User) -> None:
+        monkeypatch.setattr(ActivityFeedCursorPagination, "page_size", 2)
+        player_sport: PlayerSport = user.player.sports.first()
+        activities = [ActivityFactory(organizer=user.player, player_sport=player_sport) for _ in range(3)]
+        ActivityFactory(organizer=user.player, player_sport=player_sport, status=Activity.Status.CANCELLED)
+        user2.player.create_sport({"player": user2.player, "sport": player_sport.sport, "level": player_sport.level})
+        activities = sorted(
+            Activity.objects.filter(pk__in=[activity.pk for activity in activities]),
+            key=lambda activity: (activity.available_between_at.lower, activity.pk),
+        )
+
+        request = request_factory.get(reverse("events:activities_feed"))
+        force_authenticate(request, user=user2)
+        response = ActivityFeedView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert [data["pk"] for data in response.data["results"]] == [activity.pk for activity in activities[:2]]
+        assert response.data["next"]
+
+        request = request_factory.get(response.data["next"])
+        force_authenticate(request, user=user2)
+        response = ActivityFeedView.as_view()(request)
+
+        assert [data["pk"] for data in response.data["results"]] == [activities[2].pk]
+        assert response.data["next"] is None
+
+    def test_list_num_queries(
+        self,
+        user: User,
+        user2: User,
+        django_assert_num_queries: Callable,
+    ) -> None:
+        for _ in range(3):
+            activity = ActivityFactory(organizer=user.player)
+            ActivityFeedEntry.objects.create(
+                player=user2.player,
+                activity=activity,
+                available_from=timezone.datetime.now(),
+            )
+        request = request_factory.get(reverse("events:activities_feed"))
+        force_authenticate(request, user=user2)
+        user2.player
+
+        with django_assert_num_queries(2):
+            response = ActivityFeedView.as_view()(request)
+
+        assert len(response.data["results"]) == 3
+
+
+class TestActivityFacetsView:
+    def test_get(self, django_assert_num_queries: Callable, user: User, user2: User) -> None:
+        cache.clear()
+        player_sport: PlayerSport = user.player.sports.first()
+        activities = [ActivityFactory(organizer=user.player, player_sport=player_sport) for _ in range(2)]
+        ActivityFactory(organizer=user2.player)
+        day = activities[0].available_between_at[0].date()
+        request = request_factory.get(
+            reverse("events:activities_facets"),
+            data={"sport": player_sport.sport_id},
+        )
+        force_authenticate(request, user=user2)
+        response = ActivityFacetsView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert response.data["sports"] == [{"sport": player_sport.sport_id, "count": 2}]
+        assert {"level": player_sport.level_id, "count": 2} in response.data["levels"]
+        assert sum(data["count"] for data in response.data["days"]) == 2
+        assert day in [data["day"] for data in response.data["days"]]
+
+        request = request_factory.get(
+            reverse("events:activities_facets"),
+            data={"sport": player_sport.sport_id},
+        )
+        force_authenticate(request, user=user2)
+        with django_assert_num_queries(0):
+            cached_response = ActivityFacetsView.as_view()(request)
+        assert cached_response.data == response.data
+
 
 class TestActivityUpdateView:
     def test_update(self, activity_without_participants: Activity) -> None:
@@ -257,6 +525,31 @@ class TestActivityUpdateView:
         assert response.data["status"] == status
 
 
+class TestActivitySeriesCreateView:
+    def test_create(self, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.first()
+        data = {
+            "name": fake.text(max_nb_chars=ActivitySeries.name.field.max_length),
+            "sport": player_sport.sport.pk,
+            "levels": [player_sport.level.pk],
+            "starts_at": timezone.datetime.now() + timezone.timedelta(days=1),
+            "duration": "01:30:00",
+            "frequency": ActivitySeries.Frequency.DAILY,
+            "interval": 2,
+        }
+        request = request_factory.post(
+            reverse("events:activity_series"),
+            data=data,
+        )
+        force_authenticate(request, user=user)
+        response = ActivitySeriesCreateView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_201_CREATED
+        activity_series = ActivitySeries.objects.get(pk=response.data["pk"])
+        assert activity_series.organizer == user.player
+        assert response.data["generated_count"] == activity_series.activities.count() == 14
+
+
 class TestParticipationRequestListView:
     def test_list(self, participation_request: ParticipationRequest) -> None:
         organizer = participation_request.activity.organizer
@@ -286,6 +579,96 @@ class TestParticipationRequestListView:
                 assert data_["level"] == participant_sport.level.pk
 
 
+class TestParticipationRequestInboxView:
+    @staticmethod
+    def _create_participation_requests(activity: Activity, total: int) -> list[ParticipationRequest]:
+        return [
+            ParticipationRequestFactory(
+                activity=activity,
+                participant=UserFactory(
+                    player__sports__sport=activity.sport,
+                    player__sports__level=activity.levels.first(),
+                    player_sports_size=1,
+                ).player,
+            )
+            for _ in range(total)
+        ]
+
+    def test_list(self, user: User, user2: User) -> None:
+        activity, other_activity, cancelled_activity = [ActivityFactory(organizer=user.player) for _ in range(3)]
+        participation_requests = [
+            *self._create_participation_requests(activity, 2),
+            *self._create_participation_requests(other_activity, 1),
+        ]
+        self._create_participation_requests(cancelled_activity, 1)
+        Activity.objects.filter(pk=cancelled_activity.pk).update(status=Activity.Status.CANCELLED)
+        self._create_participation_requests(ActivityFactory(organizer=user2.player), 1)
+        request = request_factory.get(
+            reverse("events:participation_requests_inbox"),
+        )
+        force_authenticate(request, user=user)
+        response = ParticipationRequestInboxView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        results = response.data["results"]
+        assert [data["pk"] for data in results] == [
+            participation_request.pk for participation_request in reversed(participation_requests)
+        ]
+        assert [(data["activity"]["pk"], data["activity"]["pending_count"]) for data in results] == [
+            (other_activity.pk, 1),
+            (activity.pk, 2),
+            (activity.pk, 2),
+        ]
+        participant = participation_requests[-1].participant
+        participant_sport = participant.sports.get()
+        assert results[0]["activity"]["name"] == other_activity.name
+        assert results[0]["participant"]["pk"] == participant.pk
+        assert results[0]["participant"]["user"]["first_name"] == participant.user.first_name
+        assert results[0]["participant"]["sports"] == [
+            {"sport": participant_sport.sport_id, "level": participant_sport.level_id},
+        ]
+
+    @pytest.mark.parametrize("total_requests", [2, 8])
+    def test_list_num_queries(
+        self,
+        user: User,
+        django_assert_num_queries: Callable,
+        total_requests: int,
+    ) -> None:
+        for _ in range(2):
+            self._create_participation_requests(ActivityFactory(organizer=user.player), total_requests // 2)
+        request = request_factory.get(
+            reverse("events:participation_requests_inbox"),
+        )
+        force_authenticate(request, user=user)
+        user.player
+
+        with django_assert_num_queries(2):
+            response = ParticipationRequestInboxView.as_view()(request)
+            response.render()
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert len(response.data["results"]) == total_requests
+
+    def test_list_when_paginated(self, user: User, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(ParticipationRequestCursorPagination, "page_size", 2)
+        activity = ActivityFactory(organizer=user.player)
+        participation_requests = self._create_participation_requests(activity, 3)
+        ParticipationRequest.objects.update(created_at=timezone.datetime.now())
+
+        url = reverse("events:participation_requests_inbox")
+        pks = []
+        while url:
+            request = request_factory.get(url)
+            force_authenticate(request, user=user)
+            response = ParticipationRequestInboxView.as_view()(request)
+            assert response.status_code == http_status.HTTP_200_OK
+            pks += [data["pk"] for data in response.data["results"]]
+            url = response.data["next"]
+
+        assert pks == [participation_request.pk for participation_request in reversed(participation_requests)]
+
+
 class TestParticipationRequestApprovalView:
     def test_post_when_result_is_accept(self, participation_request: ParticipationRequest) -> None:
         activity = participation_request.activity
@@ -328,6 +711,56 @@ class TestParticipationRequestApprovalView:
             participation_request.refresh_from_db()
 
 
+class TestParticipationRequestBulkApprovalView:
+    def test_post(self, participation_request: ParticipationRequest) -> None:
+        activity = participation_request.activity
+        organizer = activity.organizer
+        participant = participation_request.participant
+        data = {
+            "decisions": [
+                {"pk": participation_request.pk, "result": "accept"},
+            ],
+        }
+
+        request = request_factory.post(
+            reverse("events:participation_requests_bulk_approval"),
+            data=data,
+            format="json",
+        )
+        force_authenticate(request, user=organizer.user)
+        response = ParticipationRequestBulkApprovalView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert response.data["results"] == [
+            {"pk": participation_request.pk, "result": "accept", "succeeded": True, "detail": None},
+        ]
+        assert activity.players.contains(participant)
+        with pytest.raises(ParticipationRequest.DoesNotExist):
+            participation_request.refresh_from_db()
+
+    def test_post_when_user_is_not_organizer(self, participation_request: ParticipationRequest) -> None:
+        participant = participation_request.participant
+        data = {
+            "decisions": [
+                {"pk": participation_request.pk, "result": "accept"},
+            ],
+        }
+
+        request = request_factory.post(
+            reverse("events:participation_requests_bulk_approval"),
+            data=data,
+            format="json",
+        )
+        force_authenticate(request, user=participant.user)
+        response = ParticipationRequestBulkApprovalView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert response.data["results"] == [
+            {"pk": participation_request.pk, "result": "accept", "succeeded": False, "detail": "Not found."},
+        ]
+        assert ParticipationRequest.objects.filter(pk=participation_request.pk).exists()
+
+
 class TestParticipatedActivityListView:
     def test_list(self, activity_with_participants: Activity) -> None:
         user = activity_with_participants.organizer.user
@@ -342,7 +775,7 @@ class TestParticipatedActivityListView:
 
         for data, activity in zip(
             response.data["results"],
-            user.player.activities.all(),
+            user.player.activities.order_by("available_between_at__startswith", "pk"),
         ):
             organizer = activity.organizer
             participants = activity.participants
@@ -367,3 +800,233 @@ class TestParticipatedActivityListView:
             assert data["name"] == activity.name
             assert data["about"] == activity.about
             assert data["status"] == activity.status
+
+    def test_list_when_conflicts_with(self, user: User, user2: User) -> None:
+        lower = timezone.datetime.now() + timedelta(days=1)
+        activity, overlapping_activity, _ = [
+            ActivityFactory(
+                organizer=user.player,
+                available_between_at=DateTimeTZRange(
+                    lower + timedelta(hours=hours), lower + timedelta(hours=hours + 2)
+                ),
+            )
+            for hours in (0, 1, 2)
+        ]
+        ActivityFactory(
+            organizer=user2.player,
+            available_between_at=DateTimeTZRange(lower, lower + timedelta(hours=2)),
+        )
+        request = request_factory.get(
+            reverse("events:participated_activities"),
+            data={"conflicts_with": activity.pk},
+        )
+        force_authenticate(request, user=user)
+        response = ParticipatedActivityListView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert [data["pk"] for data in response.data["results"]] == [overlapping_activity.pk]
+
+    def test_list_when_conflicts_with_activity_of_other_player(self, user: User, user2: User) -> None:
+        other_activity = ActivityFactory(organizer=user2.player)
+        request = request_factory.get(
+            reverse("events:participated_activities"),
+            data={"conflicts_with": other_activity.pk},
+        )
+        force_authenticate(request, user=user)
+        response = ParticipatedActivityListView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_400_BAD_REQUEST
+        assert "conflicts_with" in response.data
+
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [
+            {"total_activities": 2, "total_participants": 2},
+            {"total_activities": 8, "total_participants": 4},
+        ],
+        indirect=["activities_with_participants"],
+    )
+    def test_list_num_queries(
+        self,
+        user: User,
+        activities_with_participants: list[Activity],
+        django_assert_num_queries: Callable,
+    ) -> None:
+        request = request_factory.get(
+            reverse("events:participated_activities"),
+        )
+        force_authenticate(request, user=user)
+        user.player
+
+        with django_assert_num_queries(2):
+            response = ParticipatedActivityListView.as_view()(request)
+            response.render()
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert len(response.data["results"]) == len(activities_with_participants)
+
+    def test_list_query_plans(self, seeded_activity_players: list[Player], assert_index_scans: Callable) -> None:
+        request = request_factory.get(
+            reverse("events:participated_activities"),
+        )
+        user = seeded_activity_players[0].user
+        force_authenticate(request, user=user)
+        user.player
+
+        with CaptureQueriesContext(connection) as context:
+            response = ParticipatedActivityListView.as_view()(request)
+
+        assert response.status_code == http_status.HTTP_200_OK
+        activities_query, activity_players_query = [query["sql"] for query in context.captured_queries]
+        assert_index_scans(activities_query, "activity_player_player_idx", "activity_pkey")
+        # The foreign key index of activity_player.activity.
+        assert_index_scans(activity_players_query, "activity_player_activity_id_d7f6a53e")
+
+
+class TestParticipatedActivityExportView:
+    def _request(self, user: User, export_format: str, data: dict | None = None) -> StreamingHttpResponse:
+        request = request_factory.get(
+            reverse("events:participated_activities_export", kwargs={"export_format": export_format}),
+            data=data,
+        )
+        force_authenticate(request, user=user)
+        return ParticipatedActivityExportView.as_view()(request, export_format=export_format)
+
+    def _get(self, user: User, export_format: str, data: dict | None = None) -> tuple[int, str, str]:
+        response = self._request(user, export_format, data)
+
+        @async_to_sync
+        async def read() -> bytes:
+            return b"".join([part async for part in response])
+
+        content = read().decode() if response.streaming else ""
+        return response.status_code, response["Content-Type"], content
+
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [{"total_activities": 5, "total_participants": 2}],
+        indirect=["activities_with_participants"],
+    )
+    def test_get_ndjson(self, user: User, user2: User, activities_with_participants: list[Activity]) -> None:
+        ActivityFactory(organizer=user2.player)
+        activities = user.player.activities.order_by("available_between_at__startswith", "pk")
+
+        status_code, content_type, content = self._get(user, "ndjson")
+
+        assert status_code == http_status.HTTP_200_OK
+        assert content_type == "application/x-ndjson"
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert [row["pk"] for row in rows] == [activity.pk for activity in activities]
+        activity = activities[0]
+        assert rows[0] == {
+            "pk": activity.pk,
+            "sport": activity.sport_id,
+            "levels": activity.level_ids,
+            "organizer": user.player.pk,
+            "player_limit": activity.player_limit,
+            "player_count": activity.player_count,
+            "name": activity.name,
+            "status": activity.status,
+            "available_from": DjangoJSONEncoder().default(activity.available_between_at.lower),
+            "available_to": DjangoJSONEncoder().default(activity.available_between_at.upper),
+        }
+
+    def test_get_csv(self, activity_with_participants: Activity) -> None:
+        activity = activity_with_participants
+        activity.refresh_from_db()
+
+        status_code, content_type, content = self._get(activity.organizer.user, "csv")
+
+        assert status_code == http_status.HTTP_200_OK
+        assert content_type == "text/csv"
+        header, *rows = csv.reader(content.splitlines())
+        assert header == list(ParticipatedActivityExportView.encoder_classes["csv"].fields)
+        assert rows == [
+            [
+                str(activity.pk),
+                str(activity.sport_id),
+                " ".join(map(str, activity.level_ids)),
+                str(activity.organizer_id),
+                str(activity.player_limit),
+                str(activity.player_count),
+                activity.name,
+                str(activity.status),
+                str(activity.available_between_at.lower),
+                str(activity.available_between_at.upper),
+            ],
+        ]
+
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [{"total_activities": 3, "total_participants": 1}],
+        indirect=["activities_with_participants"],
+    )
+    def test_get_when_filtered(self, user: User, activities_with_participants: list[Activity]) -> None:
+        played_activity = activities_with_participants[1]
+        Activity.objects.filter(pk=played_activity.pk).update(status=Activity.Status.PLAYED)
+
+        status_code, _, content = self._get(user, "ndjson", {"status": Activity.Status.PLAYED})
+
+        assert status_code == http_status.HTTP_200_OK
+        assert [json.loads(line)["pk"] for line in content.splitlines()] == [played_activity.pk]
+
+        status_code, _, _ = self._get(user, "ndjson", {"status": 9})
+
+        assert status_code == http_status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [{"total_activities": 5, "total_participants": 2}],
+        indirect=["activities_with_participants"],
+    )
+    def test_get_num_queries(
+        self,
+        user: User,
+        activities_with_participants: list[Activity],
+        django_assert_num_queries: Callable,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(ParticipatedActivityExportView.encoder_classes["ndjson"], "chunk_size", 2)
+        user.player
+
+        with django_assert_num_queries(1):
+            _, _, content = self._get(user, "ndjson")
+
+        assert len(content.splitlines()) == 5
+
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [{"total_activities": 5, "total_participants": 1}],
+        indirect=["activities_with_participants"],
+    )
+    def test_get_streams_chunks(
+        self,
+        user: User,
+        activities_with_participants: list[Activity],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(ParticipatedActivityExportView.encoder_classes["ndjson"], "chunk_size", 2)
+        fetched_chunks = []
+        cursor_iter = compiler.cursor_iter
+
+        def _cursor_iter(*args: Any) -> Iterator[list]:
+            for rows in cursor_iter(*args):
+                fetched_chunks.append(rows)
+                yield rows
+
+        monkeypatch.setattr(compiler, "cursor_iter", _cursor_iter)
+        response = self._request(user, "ndjson")
+
+        @async_to_sync
+        async def read() -> tuple[int, list[bytes]]:
+            parts: AsyncIterator[bytes] = aiter(response)  # type: ignore[arg-type]
+            first_part = await anext(parts)
+            fetched_chunks_before_first_part = len(fetched_chunks)
+            return fetched_chunks_before_first_part, [first_part] + [part async for part in parts]
+
+        fetched_chunks_before_first_part, parts = read()
+
+        assert response.is_async
+        assert fetched_chunks_before_first_part == 1
+        assert [len(rows) for rows in fetched_chunks] == [2, 2, 1]
+        assert len(parts) == 5
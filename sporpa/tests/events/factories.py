@@ -1,10 +1,11 @@
 import random
+from datetime import timedelta
 from typing import Any, Sequence
 
 import factory
 import factory.django
 
-from events.models import Activity
+from events.models import Activity, ActivitySeries
 from participants.models import Player, PlayerSport, SportLevel
 
 
@@ -52,6 +53,27 @@ class ActivityFactory(factory.django.DjangoModelFactory):
             kwargs["player_limit"] = random.randint(min_value, max_value)
 
         activity: Activity = super()._create(model_class, *args, **kwargs)
-        activity.levels.set(sport_levels)
-        activity.players.add(*participants)
+        activity.set_levels(sport_levels)
+        activity.add_participants(*participants)
         return activity
+
+
+class ActivitySeriesFactory(factory.django.DjangoModelFactory):
+    name = factory.Faker("name")
+    about = factory.Faker("text", max_nb_chars=ActivitySeries.about.field.max_length)
+    starts_at = factory.Faker("date_time_between", start_date="+1d", end_date="+6d")
+    duration = timedelta(hours=2)
+
+    class Meta:
+        model = ActivitySeries
+
+    @classmethod
+    def _create(cls, model_class: ActivitySeries, *args: Any, **kwargs: Any) -> ActivitySeries:
+        organizer: Player = kwargs["organizer"]
+        player_sport: PlayerSport = kwargs.pop(
+            "player_sport",
+            random.choice(organizer.sports.all()),
+        )
+        kwargs["sport"] = player_sport.sport
+        kwargs.setdefault("levels", [player_sport.level])
+        return super()._create(model_class, *args, **kwargs)
@@ -0,0 +1,18 @@
+import io
+
+import pytest
+
+from django.core.management import call_command
+
+from events.models import ActivitySeries
+
+pytestmark = pytest.mark.django_db
+
+
+def test_generate_activity_series(activity_series: ActivitySeries) -> None:
+    stdout = io.StringIO()
+
+    call_command("generate_activity_series", "--days", "56", stdout=stdout)
+
+    assert activity_series.activities.count() == 8
+    assert "Created 4 activities." in stdout.getvalue()
@@ -0,0 +1,38 @@
+import io
+
+import pytest
+
+from django.core.management import call_command
+
+from accounts.models import User
+from events.models import Activity, ActivityFeedEntry
+
+pytestmark = pytest.mark.django_db
+
+
+def test_rebuild_activity_feed(user2: User, activity_without_participants: Activity) -> None:
+    activity = activity_without_participants
+    user2.player.sports.all().delete()
+    user2.player.sports.create(sport=activity.sport, level=activity.levels.first())
+    stdout = io.StringIO()
+
+    call_command("rebuild_activity_feed", stdout=stdout)
+
+    assert list(ActivityFeedEntry.objects.values_list("player", "activity")) == [(user2.player.pk, activity.pk)]
+    assert "Rebuilt the activity feed with 1 entries." in stdout.getvalue()
+
+
+def test_rebuild_activity_feed_when_player(user2: User, activity_without_participants: Activity) -> None:
+    activity = activity_without_participants
+    user2.player.sports.all().delete()
+    user2.player.sports.create(sport=activity.sport, level=activity.levels.first())
+    ActivityFeedEntry.objects.create(player=activity.organizer, activity=activity, available_from=activity.created_at)
+    stdout = io.StringIO()
+
+    call_command("rebuild_activity_feed", "--player", str(user2.player.pk), stdout=stdout)
+
+    assert set(ActivityFeedEntry.objects.values_list("player", "activity")) == {
+        (user2.player.pk, activity.pk),
+        (activity.organizer.pk, activity.pk),
+    }
+    assert "Rebuilt the activity feed with 1 entries." in stdout.getvalue()
@@ -0,0 +1,31 @@
+import io
+
+import pytest
+from psycopg2.extras import DateTimeTZRange
+
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from events.models import Activity
+
+pytestmark = pytest.mark.django_db
+
+
+def test_sweep_expired_activities(activity_without_participants: Activity) -> None:
+    now = timezone.datetime.now()
+    Activity.objects.filter(pk=activity_without_participants.pk).update(
+        available_between_at=DateTimeTZRange(now - timezone.timedelta(hours=3), now - timezone.timedelta(hours=1)),
+    )
+    stdout = io.StringIO()
+
+    call_command("sweep_expired_activities", "--batch-size", "10", stdout=stdout)
+
+    activity_without_participants.refresh_from_db()
+    assert activity_without_participants.status == Activity.Status.PLAYED
+    assert "Marked 1 activities as played." in stdout.getvalue()
+
+
+@pytest.mark.parametrize("batch_size", ["0", "-1"])
+def test_sweep_expired_activities_when_batch_size_is_not_positive(batch_size: str) -> None:
+    with pytest.raises(CommandError, match="is not a positive integer"):
+        call_command("sweep_expired_activities", "--batch-size", batch_size)
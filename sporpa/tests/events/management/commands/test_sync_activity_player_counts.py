@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+from django.core.management import CommandError, call_command
+
+from events.models import Activity
+
+pytestmark = pytest.mark.django_db
+
+
+def test_sync_activity_player_counts(activities_with_participants: list[Activity]) -> None:
+    activity = activities_with_participants[0]
+    Activity.objects.filter(pk=activity.pk).update(player_count=0)
+    stdout = io.StringIO()
+
+    call_command("sync_activity_player_counts", stdout=stdout)
+
+    activity.refresh_from_db()
+    assert activity.player_count == activity.players.count()
+    assert "Repaired player count of 1 activities." in stdout.getvalue()
+
+
+def test_sync_activity_player_counts_when_check(activities_with_participants: list[Activity]) -> None:
+    stdout = io.StringIO()
+
+    call_command("sync_activity_player_counts", "--check", stdout=stdout)
+
+    assert "All player counts are in sync." in stdout.getvalue()
+
+
+def test_sync_activity_player_counts_when_check_and_drifted(activities_with_participants: list[Activity]) -> None:
+    activity = activities_with_participants[0]
+    Activity.objects.filter(pk=activity.pk).update(player_count=5)
+
+    with pytest.raises(CommandError, match="1 activities have a drifted player count."):
+        call_command("sync_activity_player_counts", "--check")
+
+    activity.refresh_from_db()
+    assert activity.player_count == 5
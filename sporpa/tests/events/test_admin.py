@@ -0,0 +1,85 @@
+import pytest
+
+from django.contrib import admin
+from django.forms import modelform_factory
+from django.http import HttpRequest
+from django.test import RequestFactory
+
+from accounts.models import User
+from events.admin import ActivityLevelAdmin, ActivityPlayerAdmin
+from events.models import Activity, ActivityLevel, ActivityPlayer
+from tests.accounts.factories import UserFactory
+from tests.events.factories import ActivityFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin_request() -> HttpRequest:
+    request = RequestFactory().get("/")
+    request.user = UserFactory(is_staff=True, is_superuser=True)
+    return request
+
+
+class TestActivityLevelAdmin:
+    def test_save_model_when_activity_changes(
+        self,
+        admin_request: HttpRequest,
+        user: User,
+        activity_without_participants: Activity,
+    ) -> None:
+        activity = activity_without_participants
+        other_activity = ActivityFactory(organizer=user.player)
+        other_activity.set_levels([])
+        activity_level = activity.activity_levels.first()
+        form = modelform_factory(ActivityLevel, fields=("activity", "level"))(instance=activity_level)
+        activity_level.activity = other_activity
+
+        ActivityLevelAdmin(ActivityLevel, admin.site).save_model(admin_request, activity_level, form, change=True)
+
+        activity.refresh_from_db()
+        other_activity.refresh_from_db()
+        assert activity_level.level_id not in activity.level_ids
+        assert other_activity.level_ids == [activity_level.level_id]
+
+    def test_delete_queryset(self, admin_request: HttpRequest, activity_without_participants: Activity) -> None:
+        activity = activity_without_participants
+        assert activity.level_ids
+
+        ActivityLevelAdmin(ActivityLevel, admin.site).delete_queryset(
+            admin_request,
+            ActivityLevel.objects.filter(activity=activity),
+        )
+
+        activity.refresh_from_db()
+        assert activity.level_ids == []
+
+
+class TestActivityPlayerAdmin:
+    def test_permissions(self, admin_request: HttpRequest, activity_with_participants: Activity) -> None:
+        activity_player_admin = ActivityPlayerAdmin(ActivityPlayer, admin.site)
+        organizer_row = activity_with_participants.activity_players.get(is_organizer=True)
+        participant_row = activity_with_participants.activity_players.get(is_organizer=False)
+
+        assert not activity_player_admin.has_add_permission(admin_request)
+        assert not activity_player_admin.has_change_permission(admin_request, participant_row)
+        assert not activity_player_admin.has_delete_permission(admin_request, organizer_row)
+        assert activity_player_admin.has_delete_permission(admin_request, participant_row)
+
+    @pytest.mark.parametrize(
+        "activity_with_participants",
+        [{"total_participants": 2}],
+        indirect=["activity_with_participants"],
+    )
+    def test_delete_queryset(self, admin_request: HttpRequest, activity_with_participants: Activity) -> None:
+        activity = activity_with_participants
+
+        ActivityPlayerAdmin(ActivityPlayer, admin.site).delete_queryset(
+            admin_request,
+            ActivityPlayer.objects.filter(activity=activity),
+        )
+
+        activity.refresh_from_db()
+        assert activity.player_count == 1
+        assert list(activity.players.all()) == [activity.organizer]
+        assert ActivityPlayer.objects.is_member(activity.pk, activity.organizer_id)
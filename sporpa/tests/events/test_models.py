@@ -1,18 +1,33 @@
 import random
+import threading
+from collections import Counter
+from datetime import timedelta
+from typing import Callable
 
 import pytest
 from faker import Faker
+from psycopg2.extras import DateTimeTZRange
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.utils import timezone
 
 from accounts.models import User
-from events.models import Activity
+from events.models import Activity, ActivityFeedEntry, ActivityPlayer, ActivitySeries
 from participants.models import ParticipationRequest, Player, PlayerSport, Sport, SportLevel
+from tests.accounts.factories import UserFactory
+from tests.events.factories import ActivityFactory, ActivitySeriesFactory
+from tests.participants.factories import ParticipationRequestFactory
 
 fake = Faker()
 pytestmark = pytest.mark.django_db
 
 
+def _create_player(sport: Sport, level: SportLevel) -> Player:
+    return UserFactory(player__sports__sport=sport, player__sports__level=level, player_sports_size=1).player
+
+
 class TestActivityManager:
     def test_create(self, user: User) -> None:
         player_sport: PlayerSport = user.player.sports.first()
@@ -42,14 +57,34 @@ class TestActivityManager:
         activity.levels.set(sport_levels)
 
         assert activity.pk
+        assert activity.organizer == user.player
         assert activity.players.get(activity_players__is_organizer=True) == user.player
         assert activity.name == name
         assert activity.about == about
         assert activity.sport == sport
         assert list(activity.levels.all()) == list(sport_levels)
         assert activity.available_between_at == available_between_at
+        assert activity.player_count == 1
         assert Activity.objects.count() == 1
 
+    def test_create_when_levels(self, django_assert_num_queries: Callable, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.select_related("sport").first()
+        data = {
+            "organizer": user.player,
+            "name": fake.text(max_nb_chars=Activity.name.field.max_length),
+            "sport": player_sport.sport,
+            "levels": [SportLevel(level=4), 2],
+            "available_between_at": (
+                fake.date_time_between(start_date="+1d", end_date="+15d"),
+                fake.date_time_between(start_date="+16d", end_date="+30d"),
+            ),
+        }
+        with django_assert_num_queries(8):
+            activity = Activity.objects.create(**data)
+
+        assert activity.level_ids == [2, 4]
+        assert list(activity.levels.values_list(flat=True)) == [2, 4]
+
     def test_create_when_activity_does_not_have_organizer(self, user: User) -> None:
         player_sport: PlayerSport = user.player.sports.first()
         sport: Sport = player_sport.sport
@@ -76,6 +111,156 @@ class TestActivityManager:
         with pytest.raises(KeyError):
             Activity.objects.create(**data)
 
+    def test_mark_expired_as_played(self, user: User, user2: User) -> None:
+        now = timezone.datetime.now()
+        activities = [ActivityFactory(organizer=user.player) for _ in range(5)]
+        expired_activities, upcoming_activity, cancelled_activity = activities[:3], activities[3], activities[4]
+        Activity.objects.filter(pk__in=[activity.pk for activity in expired_activities + [cancelled_activity]]).update(
+            available_between_at=DateTimeTZRange(now - timezone.timedelta(days=2), now - timezone.timedelta(days=1)),
+        )
+        Activity.objects.filter(pk=cancelled_activity.pk).update(status=Activity.Status.CANCELLED)
+        ActivityFeedEntry.objects.bulk_create(
+            ActivityFeedEntry(player=user2.player, activity=activity, available_from=now) for activity in activities
+        )
+
+        total_updated = Activity.objects.mark_expired_as_played(batch_size=2)
+
+        assert total_updated == 3
+        assert set(Activity.objects.filter(status=Activity.Status.PLAYED)) == set(expired_activities)
+        upcoming_activity.refresh_from_db()
+        assert upcoming_activity.status == Activity.Status.OPEN
+        cancelled_activity.refresh_from_db()
+        assert cancelled_activity.status == Activity.Status.CANCELLED
+        assert set(ActivityFeedEntry.objects.values_list("activity", flat=True)) == {
+            upcoming_activity.pk,
+            cancelled_activity.pk,
+        }
+        assert Activity.objects.mark_expired_as_played(batch_size=2) == 0
+
+    @pytest.mark.parametrize("batch_size", [0, -1])
+    def test_mark_expired_as_played_when_batch_size_is_not_positive(self, batch_size: int) -> None:
+        with pytest.raises(ValueError):
+            Activity.objects.mark_expired_as_played(batch_size=batch_size)
+
+    @pytest.mark.parametrize(
+        "activity_without_participants",
+        [{"player_limit": 3}],
+        indirect=["activity_without_participants"],
+    )
+    def test_approve_participation_requests(
+        self,
+        django_assert_max_num_queries: Callable,
+        user2: User,
+        activity_without_participants: Activity,
+    ) -> None:
+        activity = activity_without_participants
+        participation_requests = [
+            ParticipationRequestFactory(
+                activity=activity,
+                participant=UserFactory(
+                    player__sports__sport=activity.sport,
+                    player__sports__level=activity.levels.first(),
+                    player_sports_size=1,
+                ).player,
+            )
+            for _ in range(4)
+        ]
+        other_participation_request = ParticipationRequestFactory(
+            activity=ActivityFactory(organizer=user2.player),
+            participant=participation_requests[0].participant,
+        )
+        decisions = {
+            participation_requests[0].pk: True,
+            participation_requests[1].pk: False,
+            participation_requests[2].pk: True,
+            participation_requests[3].pk: True,
+            other_participation_request.pk: True,
+        }
+        organizer = activity.organizer
+
+        with django_assert_max_num_queries(11):
+            errors = Activity.objects.approve_participation_requests(organizer, decisions)
+
+        assert errors == {
+            participation_requests[0].pk: None,
+            participation_requests[1].pk: None,
+            participation_requests[2].pk: None,
+            participation_requests[3].pk: "The activity is fully booked.",
+            other_participation_request.pk: "Not found.",
+        }
+        activity.refresh_from_db()
+        assert activity.player_count == 3
+        assert set(activity.participants) == {
+            participation_requests[0].participant,
+            participation_requests[2].participant,
+        }
+        assert list(ParticipationRequest.objects.order_by("pk")) == [
+            participation_requests[3],
+            other_participation_request,
+        ]
+
+    def test_approve_participation_requests_when_participant_is_not_eligible(
+        self,
+        participation_request: ParticipationRequest,
+    ) -> None:
+        activity = participation_request.activity
+        activity.status = Activity.Status.CANCELLED
+        activity.save()
+
+        errors = Activity.objects.approve_participation_requests(
+            activity.organizer,
+            {participation_request.pk: True},
+        )
+
+        assert errors == {participation_request.pk: "The activity is already cancelled."}
+        assert not activity.players.contains(participation_request.participant)
+        assert ParticipationRequest.objects.filter(pk=participation_request.pk).exists()
+
+    @pytest.mark.parametrize(
+        "activity_without_participants",
+        [{"player_limit": 3}],
+        indirect=["activity_without_participants"],
+    )
+    def test_approve_participation_requests_when_accepted_requests_overlap(
+        self,
+        activity_without_participants: Activity,
+    ) -> None:
+        activity = activity_without_participants
+        activity.refresh_from_db()
+        participant = _create_player(activity.sport, activity.levels.first())
+        participant.set_exclusive_schedule(True)
+        lower, upper = activity.available_between_at.lower, activity.available_between_at.upper
+        overlapping_activity, adjacent_activity = (
+            ActivityFactory(
+                organizer=activity.organizer,
+                player_sport=activity.organizer.sports.get(sport=activity.sport),
+                levels=activity.level_ids,
+                available_between_at=available_between_at,
+                player_limit=3,
+            )
+            for available_between_at in (
+                (lower + timedelta(minutes=30), upper + timedelta(minutes=30)),
+                (upper, upper + timedelta(hours=1)),
+            )
+        )
+        participation_requests = [
+            ParticipationRequestFactory(activity=requested_activity, participant=participant)
+            for requested_activity in (activity, overlapping_activity, adjacent_activity)
+        ]
+
+        errors = Activity.objects.approve_participation_requests(
+            activity.organizer,
+            {participation_request.pk: True for participation_request in participation_requests},
+        )
+
+        assert errors == {
+            participation_requests[0].pk: None,
+            participation_requests[1].pk: "You have another activity at the same time.",
+            participation_requests[2].pk: None,
+        }
+        assert list(participant.activities.order_by("pk")) == [activity, adjacent_activity]
+        assert list(ParticipationRequest.objects.all()) == [participation_requests[1]]
+
 
 class TestActivityQueryset:
     @pytest.mark.parametrize(
@@ -89,6 +274,78 @@ class TestActivityQueryset:
 
         assert activities.count() == 3
         assert list(activities) == list(activities_with_participants)
+        assert "activity_player" not in str(activities.query)
+
+    def test_facet_counts(self, django_assert_num_queries: Callable, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.first()
+        tomorrow = timezone.datetime.combine(timezone.datetime.now().date(), timezone.datetime.min.time())
+        tomorrow += timezone.timedelta(days=1, hours=10)
+        day_after = tomorrow + timezone.timedelta(days=1)
+        expected_level_counts: Counter = Counter()
+        for lower, levels in ((tomorrow, {1, 2}), (tomorrow, {2}), (day_after, {3})):
+            activity = ActivityFactory(
+                organizer=user.player,
+                player_sport=player_sport,
+                levels=levels,
+                available_between_at=(lower, lower + timezone.timedelta(hours=2)),
+            )
+            expected_level_counts.update(activity.levels.values_list(flat=True))
+
+        with django_assert_num_queries(1):
+            facet_counts = Activity.objects.facet_counts()
+
+        assert facet_counts["sports"] == {player_sport.sport_id: 3}
+        assert facet_counts["levels"] == dict(expected_level_counts)
+        assert facet_counts["days"] == {tomorrow.date(): 2, day_after.date(): 1}
+
+    def test_facet_counts_when_empty(self) -> None:
+        assert Activity.objects.none().facet_counts() == {"sports": {}, "levels": {}, "days": {}}
+
+    def test_filter_levels(self, user: User) -> None:
+        activity = ActivityFactory(organizer=user.player)
+        activity.set_levels([1, 3])
+        ActivityFactory(organizer=user.player).set_levels([2])
+
+        assert list(Activity.objects.filter_levels([3, 5])) == [activity]
+        assert list(Activity.objects.filter_levels([SportLevel(level=1)])) == [activity]
+
+    def test_search(self, user: User) -> None:
+        name_match = ActivityFactory(organizer=user.player, name="Sunday tennis doubles", about="")
+        about_match = ActivityFactory(organizer=user.player, name="Sunday match", about="Casual tennis, bring rackets")
+        ActivityFactory(organizer=user.player, name="Sunday football", about="")
+
+        activities = Activity.objects.search("tennis").order_by("-search_rank")
+
+        assert list(activities) == [name_match, about_match]
+        assert activities[0].search_rank > activities[1].search_rank
+
+    def test_search_when_activity_is_renamed(self, activity_without_participants: Activity) -> None:
+        activity_without_participants.name = "Midnight badminton"
+        activity_without_participants.save()
+
+        assert list(Activity.objects.search("badminton")) == [activity_without_participants]
+
+    def test_filter_expired(self, activity_without_participants: Activity) -> None:
+        activity_without_participants.refresh_from_db()
+        upper = activity_without_participants.available_between_at.upper
+
+        assert not Activity.objects.filter_expired().exists()
+        assert list(Activity.objects.filter_expired(upper)) == [activity_without_participants]
+
+    def test_filter_overlapping(self, user: User) -> None:
+        lower = timezone.datetime.now() + timedelta(days=1)
+        activity, overlapping_activity, _ = [
+            ActivityFactory(
+                organizer=user.player,
+                available_between_at=DateTimeTZRange(
+                    lower + timedelta(hours=hours), lower + timedelta(hours=hours + 2)
+                ),
+            )
+            for hours in (0, 1, 2)
+        ]
+        activity.refresh_from_db()
+
+        assert list(Activity.objects.filter_overlapping(activity)) == [overlapping_activity]
 
     @pytest.mark.parametrize(
         "activities_with_participants",
@@ -100,7 +357,48 @@ class TestActivityQueryset:
         activities = Activity.objects.filter_available(participant)
 
         assert activities.count() == 6
-        assert list(activities) == list(activities_with_participants[1:])
+        assert list(activities.order_by("pk")) == list(activities_with_participants[1:])
+
+    @pytest.mark.parametrize(
+        "user, user2, activity_with_participants",
+        [
+            (
+                {"player__sports__level_id": 4, "player_sports_size": 1, "player__sports__sport_id": 5},
+                {"player__sports__level_id": 4, "player_sports_size": 1, "player__sports__sport_id": 5},
+                {"player_limit": 2},
+            ),
+        ],
+        indirect=["user", "user2", "activity_with_participants"],
+    )
+    def test_filter_available_when_activity_is_fully_booked(
+        self,
+        user2: User,
+        activity_with_participants: Activity,
+    ) -> None:
+        assert not Activity.objects.filter_available(user2.player).exists()
+
+    @pytest.mark.parametrize(
+        "activities_with_participants",
+        [{"total_activities": 3, "total_participants": 2}],
+        indirect=["activities_with_participants"],
+    )
+    def test_with_roster(
+        self,
+        activities_with_participants: list[Activity],
+        django_assert_num_queries: Callable,
+    ) -> None:
+        with django_assert_num_queries(2):
+            activities = list(Activity.objects.with_roster().order_by("pk"))
+            for activity in activities:
+                assert activity.organizer.user
+                assert [participant.user for participant in activity.participants]
+                assert activity.level_ids
+
+        for activity, activity_ in zip(activities, activities_with_participants):
+            assert activity.organizer == activity_.organizer
+            assert activity.participants == list(
+                activity_.players.filter(activity_players__is_organizer=False).order_by("activity_players"),
+            )
 
     @pytest.mark.parametrize(
         "activities_with_participants",
@@ -114,6 +412,161 @@ class TestActivityQueryset:
         assert activities.count() == 1
         assert list(activities) == list(activities_with_participants[:1])
 
+    @pytest.mark.parametrize(
+        "user, user2",
+        [
+            (
+                {"player__sports__level_id": 4, "player_sports_size": 1, "player__sports__sport_id": 5},
+                {"player__sports__level_id": 2, "player_sports_size": 1, "player__sports__sport_id": 5},
+            ),
+        ],
+        indirect=["user", "user2"],
+    )
+    def test_filter_joinable(self, user: User, user2: User) -> None:
+        joinable_activity = ActivityFactory(organizer=user.player, levels=(2, 4))
+        ActivityFactory(organizer=user.player, levels=(4,))
+        ActivityFactory(organizer=user.player, levels=(2, 4), status=Activity.Status.CANCELLED)
+        ActivityFactory(organizer=user.player, levels=(2, 4), participants=(user2.player,))
+
+        assert list(Activity.objects.filter_joinable(user2.player)) == [joinable_activity]
+
+    @pytest.mark.parametrize(
+        "user, user2",
+        [
+            (
+                {"player__sports__level_id": 4, "player_sports_size": 1, "player__sports__sport_id": 5},
+                {"player__sports__level_id": 2, "player_sports_size": 1, "player__sports__sport_id": 5},
+            ),
+        ],
+        indirect=["user", "user2"],
+    )
+    def test_annotate_eligibility(
+        self,
+        user: User,
+        user2: User,
+        user_without_sport: User,
+        django_assert_num_queries: Callable,
+    ) -> None:
+        # The factory time windows overlap, the activities of user2 are later.
+        lower = timezone.datetime.now() + timedelta(days=40)
+        joined_at = DateTimeTZRange(lower, lower + timedelta(hours=2))
+        activities = [
+            ActivityFactory(organizer=user.player, levels=(2, 4)),
+            ActivityFactory(organizer=user.player, levels=(4,)),
+            ActivityFactory(organizer=user.player, levels=(2, 4), status=Activity.Status.PLAYED),
+            ActivityFactory(
+                organizer=user.player,
+                levels=(2, 4),
+                player_limit=2,
+                participants=(user2.player,),
+                available_between_at=joined_at,
+            ),
+            ActivityFactory(
+                organizer=user.player,
+                levels=(2, 4),
+                player_limit=3,
+                participants=(user2.player,),
+                available_between_at=joined_at,
+            ),
+            ActivityFactory(organizer=user2.player, levels=(2, 4), available_between_at=joined_at),
+            ActivityFactory(
+                organizer=user.player,
+                levels=(2, 4),
+                available_between_at=DateTimeTZRange(lower + timedelta(hours=1), lower + timedelta(hours=3)),
+            ),
+        ]
+
+        with django_assert_num_queries(1):
+            ineligibilities = dict(
+                Activity.objects.annotate_eligibility(user2.player).values_list("pk", "ineligibility"),
+            )
+
+        assert [ineligibilities[activity.pk] for activity in activities] == [
+            None,
+            Activity.Ineligibility.INELIGIBLE_LEVEL,
+            Activity.Ineligibility.NOT_UPDATABLE,
+            Activity.Ineligibility.FULLY_BOOKED,
+            Activity.Ineligibility.ALREADY_JOINED,
+            Activity.Ineligibility.ORGANIZER,
+            Activity.Ineligibility.SCHEDULE_CONFLICT,
+        ]
+        assert set(
+            Activity.objects.annotate_eligibility(user_without_sport.player)
+            .filter(status=Activity.Status.OPEN, player_limit__gt=models.F("player_count"))
+            .values_list("ineligibility", flat=True),
+        ) == {Activity.Ineligibility.NO_SPORT}
+
+    def test_rank_relevance(self, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.select_related("sport").first()
+        organizer = _create_player(player_sport.sport, player_sport.level)
+        now = timezone.datetime.now()
+
+        def create_activity(levels: list[int], starts_in: timedelta, player_limit: int = 10) -> Activity:
+            activity = ActivityFactory(organizer=organizer, player_sport=player_sport, player_limit=player_limit)
+            activity.set_levels(levels)
+            lower = now + starts_in
+            Activity.objects.filter(pk=activity.pk).update(
+                available_between_at=DateTimeTZRange(lower, lower + timezone.timedelta(hours=2)),
+            )
+            return activity
+
+        level = player_sport.level_id
+        other_level = 1 if level > 3 else 5
+        matching_level = create_activity([level], timezone.timedelta(days=2))
+        other_level_sooner = create_activity([other_level], timezone.timedelta(days=1))
+        fully_booked = create_activity([level], timezone.timedelta(days=2), player_limit=2)
+        fully_booked.add_participants(_create_player(player_sport.sport, player_sport.level))
+        create_activity([level], timezone.timedelta(minutes=-10))
+        create_activity([level], Activity.RANKING_HORIZON + timezone.timedelta(days=1))
+
+        activities = list(Activity.objects.rank_relevance(user.player, now).order_by("-relevance", "pk"))
+
+        def relevance(level_distance: int, days_until_start: float, seats_left: int, player_limit: int) -> float:
+            return 0.5 * (1 - level_distance / 4) + 0.3 / (1 + days_until_start) + 0.2 * seats_left / player_limit
+
+        assert activities == [matching_level, fully_booked, other_level_sooner]
+        assert [activity.relevance for activity in activities] == pytest.approx(
+            [
+                relevance(0, 2, 9, 10),
+                relevance(0, 2, 0, 2),
+                relevance(abs(level - other_level), 1, 9, 10),
+            ],
+        )
+
+    def test_filter_feed(self, user: User, user2: User) -> None:
+        now = timezone.datetime.now()
+        activities = [ActivityFactory(organizer=user.player) for _ in range(2)]
+        ActivityFeedEntry.objects.bulk_create(
+            ActivityFeedEntry(player=user2.player, activity=activity, available_from=now) for activity in activities
+        )
+
+        feed = Activity.objects.filter_feed(user2.player)
+
+        assert set(feed) == set(activities)
+        assert all(activity.feed_available_from == now for activity in feed)
+        assert not Activity.objects.filter_feed(user.player).exists()
+
+    def test_query_plans(self, seeded_activity_players: list[Player], assert_index_scans: Callable) -> None:
+        player = seeded_activity_players[0]
+        activity = player.activities.first()
+
+        assert_index_scans(
+            Activity.objects.filter_participant(player).order_by("pk")[:20],
+            "activity_player_player_idx",
+            "activity_pkey",
+        )
+        assert_index_scans(
+            Activity.objects.filter_available(player).order_by("pk")[:20],
+            "activity_player_player_idx",
+            "activity_pkey",
+        )
+        # The membership lookup of the chat permission and consumer.
+        assert_index_scans(
+            Activity.objects.filter(pk=activity.pk, players=player),
+            "activity_player_player_idx",
+            "activity_pkey",
+        )
+
 
 class TestActivity:
     def test_str(self, activity_without_participants: Activity) -> None:
@@ -133,6 +586,15 @@ class TestActivity:
             ),
         )
 
+    @pytest.mark.parametrize(
+        "activity_with_participants",
+        [{"player_limit": 10, "total_participants": 3}],
+        indirect=["activity_with_participants"],
+    )
+    def test_seats_left(self, activity_with_participants: Activity) -> None:
+        assert activity_with_participants.player_count == 4
+        assert activity_with_participants.seats_left == 6
+
     @pytest.mark.parametrize(
         "activity_with_participants",
         [{"player_limit": 10}],
@@ -163,8 +625,35 @@ class TestActivity:
         ],
         indirect=["user", "user2"],
     )
-    def test_check_participant(self, user2: User, activity_without_participants: Activity) -> None:
-        activity_without_participants.check_participant(participant=user2.player)
+    def test_check_participant(
+        self,
+        user2: User,
+        activity_without_participants: Activity,
+        django_assert_num_queries: Callable,
+    ) -> None:
+        with django_assert_num_queries(1):
+            activity_without_participants.check_participant(participant=user2.player)
+
+    @pytest.mark.parametrize(
+        "user, user2, activity_without_participants",
+        [
+            (
+                {"player__sports__level_id": 4, "player_sports_size": 1, "player__sports__sport_id": 5},
+                {"player__sports__level_id": 4, "player_sports_size": 1, "player__sports__sport_id": 5},
+                {"player_limit": 5},
+            ),
+        ],
+        indirect=["user", "user2", "activity_without_participants"],
+    )
+    def test_check_participant_when_participant_already_joined(
+        self,
+        user2: User,
+        activity_without_participants: Activity,
+    ) -> None:
+        activity_without_participants.add_participants(user2.player)
+
+        with pytest.raises(ValidationError, match="You already joined the activity."):
+            activity_without_participants.check_participant(participant=user2.player)
 
     @pytest.mark.parametrize(
         "user, user2, activity_without_participants",
@@ -258,6 +747,131 @@ class TestActivity:
         with pytest.raises(ValidationError, match="Your level is not eligible for the activity."):
             activity_without_participants.check_participant(participant=user2.player)
 
+    def test_check_participant_when_participant_has_schedule_conflict(
+        self,
+        activity_without_participants: Activity,
+    ) -> None:
+        activity = activity_without_participants
+        participant = _create_player(activity.sport, activity.levels.first())
+        ActivityFactory(
+            organizer=participant,
+            player_sport=participant.sports.get(),
+            available_between_at=activity.available_between_at,
+        )
+
+        with pytest.raises(ValidationError, match="You have another activity at the same time."):
+            activity.check_participant(participant=participant)
+
+    def test_set_levels(self, activity_without_participants: Activity) -> None:
+        activity_without_participants.set_levels([5, 1])
+
+        assert activity_without_participants.level_ids == [1, 5]
+        assert list(activity_without_participants.levels.values_list(flat=True)) == [1, 5]
+
+    def test_set_levels_when_player_is_not_eligible(self, activity_without_participants: Activity) -> None:
+        activity = activity_without_participants
+        player = _create_player(activity.sport, activity.levels.first())
+        ActivityFeedEntry.objects.refresh(players=[player])
+        assert player.activity_feed_entries.filter(activity=activity).exists()
+
+        activity.set_levels(SportLevel.objects.exclude(pk=player.sports.get().level_id))
+
+        assert not player.activity_feed_entries.exists()
+
+    def test_sync_level_ids(self, activity_without_participants: Activity) -> None:
+        activity_without_participants.activity_levels.all().delete()
+        activity_without_participants.activity_levels.create(level_id=3)
+
+        activity_without_participants.sync_level_ids()
+
+        assert activity_without_participants.level_ids == [3]
+
+    def test_add_participants(self, user2: User, activity_with_participants: Activity) -> None:
+        activity_with_participants.add_participants(user2.player)
+
+        assert activity_with_participants.players.contains(user2.player)
+        assert activity_with_participants.player_count == 3
+        assert activity_with_participants.player_count == activity_with_participants.players.count()
+
+    def test_add_participants_when_participant_already_joined(self, activity_with_participants: Activity) -> None:
+        activity_with_participants.add_participants(*activity_with_participants.participants)
+
+        assert activity_with_participants.player_count == 2
+        assert activity_with_participants.player_count == activity_with_participants.players.count()
+
+    @pytest.mark.parametrize(
+        "activity_without_participants",
+        [{"player_limit": 3}],
+        indirect=["activity_without_participants"],
+    )
+    def test_add_participants_when_participant_has_exclusive_schedule(
+        self,
+        activity_without_participants: Activity,
+    ) -> None:
+        activity = activity_without_participants
+        participant = _create_player(activity.sport, activity.levels.first())
+        participant.set_exclusive_schedule(True)
+        other_activity = ActivityFactory(
+            organizer=activity.organizer,
+            player_sport=activity.organizer.sports.get(sport=activity.sport),
+            available_between_at=activity.available_between_at,
+            player_limit=3,
+        )
+        activity.add_participants(participant)
+
+        with pytest.raises(ValidationError, match="You have another activity at the same time."):
+            other_activity.add_participants(participant)
+
+        assert not other_activity.players.contains(participant)
+        other_activity.refresh_from_db()
+        assert other_activity.player_count == 1
+
+        Activity.objects.filter(pk=activity.pk).update(status=Activity.Status.CANCELLED)
+        activity.refresh_from_db()
+        activity.sync_schedule()
+        other_activity.add_participants(participant)
+
+        assert other_activity.players.contains(participant)
+
+    def test_remove_participant(self, activity_with_participants: Activity) -> None:
+        participant = activity_with_participants.participants[0]
+
+        activity_with_participants.remove_participant(participant)
+
+        assert not activity_with_participants.players.contains(participant)
+        assert activity_with_participants.player_count == 1
+
+    @pytest.mark.parametrize(
+        "activity_without_participants",
+        [{"player_limit": 3}],
+        indirect=["activity_without_participants"],
+    )
+    def test_add_and_remove_participants_feed_entries(self, activity_without_participants: Activity) -> None:
+        activity = activity_without_participants
+        players = [_create_player(activity.sport, activity.levels.first()) for _ in range(3)]
+        ActivityFeedEntry.objects.refresh(players=players)
+
+        def feed_players() -> set[Player]:
+            return {entry.player for entry in activity.feed_entries.select_related("player")}
+
+        activity.add_participants(players[0])
+        assert feed_players() == {players[1], players[2]}
+
+        activity.add_participants(players[1])
+        assert feed_players() == set()
+
+        activity.remove_participant(players[0])
+        assert feed_players() == {players[0], players[2]}
+
+        activity.remove_participant(players[1])
+        assert feed_players() == set(players)
+
+    def test_remove_participant_when_participant_is_organizer(self, activity_without_participants: Activity) -> None:
+        activity_without_participants.remove_participant(activity_without_participants.organizer)
+
+        assert activity_without_participants.players.contains(activity_without_participants.organizer)
+        assert activity_without_participants.player_count == 1
+
     def test_accept_participation_request(self, participation_request: ParticipationRequest) -> None:
         activity = participation_request.activity
         participant = participation_request.participant
@@ -265,9 +879,56 @@ class TestActivity:
         activity.accept_participation_request(participation_request)
 
         assert activity.players.contains(participant)
+        assert activity.player_count == 2
         with pytest.raises(ParticipationRequest.DoesNotExist):
             participation_request.refresh_from_db()
 
+    # Restores the sports of the data migrations, which the flush after
+    # another transactional test drops.
+    @pytest.mark.django_db(transaction=True, serialized_rollback=True)
+    @pytest.mark.parametrize(
+        "activity_without_participants",
+        [{"player_limit": 3}],
+        indirect=["activity_without_participants"],
+    )
+    def test_accept_participation_request_when_concurrent(self, activity_without_participants: Activity) -> None:
+        total_requests = 8
+        participation_requests = [
+            ParticipationRequestFactory(
+                activity=activity_without_participants,
+                participant=UserFactory(
+                    player__sports__sport=activity_without_participants.sport,
+                    player__sports__level=activity_without_participants.levels.first(),
+                    player_sports_size=1,
+                ).player,
+            )
+            for _ in range(total_requests)
+        ]
+        barrier = threading.Barrier(total_requests)
+        errors: list[ValidationError] = []
+
+        def accept(participation_request: ParticipationRequest) -> None:
+            try:
+                activity = Activity.objects.get(pk=activity_without_participants.pk)
+                barrier.wait()
+                activity.accept_participation_request(participation_request)
+            except ValidationError as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=accept, args=(request,)) for request in participation_requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        activity_without_participants.refresh_from_db()
+        assert activity_without_participants.player_count == 3
+        assert activity_without_participants.players.count() == 3
+        assert len(errors) == total_requests - 2
+        assert all(error.message == "The activity is fully booked." for error in errors)
+
     def test_reject_participation_request(self, participation_request: ParticipationRequest) -> None:
         activity = participation_request.activity
         participant = participation_request.participant
@@ -279,6 +940,41 @@ class TestActivity:
             participation_request.refresh_from_db()
 
 
+class TestActivityFeedEntryManager:
+    def test_refresh(self, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.first()
+        activity = ActivityFactory(organizer=user.player, player_sport=player_sport, levels=())
+        eligible_player = _create_player(player_sport.sport, player_sport.level)
+        _create_player(player_sport.sport, SportLevel.objects.exclude(pk=player_sport.level_id).first())
+        participant = _create_player(player_sport.sport, player_sport.level)
+        ActivityFactory(
+            organizer=user.player,
+            player_sport=player_sport,
+            levels=(),
+            player_limit=2,
+            participants=[participant],
+        )
+        ActivityFeedEntry.objects.all().delete()
+        activity.refresh_from_db()
+
+        total_created = ActivityFeedEntry.objects.refresh()
+
+        assert total_created == 2
+        assert set(ActivityFeedEntry.objects.values_list("player", "activity", "available_from")) == {
+            (eligible_player.pk, activity.pk, activity.available_between_at.lower),
+            (participant.pk, activity.pk, activity.available_between_at.lower),
+        }
+
+    def test_refresh_when_players(self, activity_without_participants: Activity) -> None:
+        activity = activity_without_participants
+        players = [_create_player(activity.sport, activity.levels.first()) for _ in range(2)]
+
+        total_created = ActivityFeedEntry.objects.refresh(players=players[:1])
+
+        assert total_created == 1
+        assert list(ActivityFeedEntry.objects.values_list("player", flat=True)) == [players[0].pk]
+
+
 class TestActivityLevel:
     def test_str(self, activity_without_participants: Activity) -> None:
         activity_level = activity_without_participants.activity_levels.first()
@@ -289,3 +985,175 @@ class TestActivityPlayer:
     def test_str(self, user: User, activity_without_participants: Activity) -> None:
         activity_player = activity_without_participants.activity_players.first()
         assert str(activity_player) == f"{activity_without_participants} - {user.email}"
+
+
+class TestActivityPlayerManager:
+    def test_get_player_ids(
+        self,
+        django_assert_num_queries: Callable,
+        activity_with_participants: Activity,
+    ) -> None:
+        activity = activity_with_participants
+        player_ids = {activity.organizer_id, *(participant.pk for participant in activity.participants)}
+
+        with django_assert_num_queries(1):
+            assert ActivityPlayer.objects.get_player_ids(activity.pk) == player_ids
+        with django_assert_num_queries(0):
+            assert ActivityPlayer.objects.is_member(activity.pk, activity.organizer_id)
+            assert not ActivityPlayer.objects.is_member(activity.pk, 0)
+
+    def test_is_member_when_activity_is_cancelled(self, activity_without_participants: Activity) -> None:
+        activity = activity_without_participants
+        Activity.objects.filter(pk=activity.pk).update(status=Activity.Status.CANCELLED)
+
+        assert ActivityPlayer.objects.is_member(activity.pk, activity.organizer_id)
+        assert not ActivityPlayer.objects.is_member(activity.pk, activity.organizer_id, include_cancelled=False)
+
+    @pytest.mark.parametrize(
+        "activity_without_participants",
+        [{"player_limit": 3}],
+        indirect=["activity_without_participants"],
+    )
+    def test_clear_membership_cache(
+        self,
+        django_capture_on_commit_callbacks: Callable,
+        activity_without_participants: Activity,
+    ) -> None:
+        activity = activity_without_participants
+        participant = _create_player(activity.sport, activity.levels.first())
+        assert not ActivityPlayer.objects.is_member(activity.pk, participant.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            activity.add_participants(participant)
+
+        assert ActivityPlayer.objects.is_member(activity.pk, participant.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            activity.remove_participant(participant)
+
+        assert not ActivityPlayer.objects.is_member(activity.pk, participant.pk)
+
+    def test_clear_membership_cache_when_miss_is_concurrent(
+        self,
+        django_capture_on_commit_callbacks: Callable,
+        activity_without_participants: Activity,
+    ) -> None:
+        activity = activity_without_participants
+        # A miss reads the version and the roster before the change commits
+        # and caches the roster after it.
+        version = ActivityPlayer.objects.get_membership_version(activity.pk)
+        stale_membership: tuple[list[int], bool] = ([], False)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ActivityPlayer.objects.clear_membership_cache([activity.pk])
+        cache.set(ActivityPlayer.objects.get_membership_cache_key(activity.pk, version), stale_membership)
+
+        assert ActivityPlayer.objects.get_membership_version(activity.pk) != version
+        assert ActivityPlayer.objects.is_member(activity.pk, activity.organizer_id)
+
+
+class TestActivitySeriesManager:
+    def test_create(self, django_assert_max_num_queries: Callable, user: User) -> None:
+        player_sport: PlayerSport = user.player.sports.select_related("sport", "level").first()
+        starts_at = timezone.datetime.now() + timezone.timedelta(days=1)
+        duration = timezone.timedelta(hours=2)
+
+        with django_assert_max_num_queries(16):
+            activity_series = ActivitySeries.objects.create(
+                organizer=user.player,
+                sport=player_sport.sport,
+                levels=[player_sport.level],
+                name=fake.name(),
+                starts_at=starts_at,
+                duration=duration,
+                frequency=ActivitySeries.Frequency.WEEKLY,
+            )
+
+        activities = list(activity_series.activities.order_by("available_between_at__startswith"))
+        assert activity_series.generated_count == 4
+        assert [activity.available_between_at.lower for activity in activities] == [
+            starts_at + timezone.timedelta(weeks=week) for week in range(4)
+        ]
+        assert all(
+            activity.available_between_at.upper - activity.available_between_at.lower == duration
+            for activity in activities
+        )
+        for activity in activities:
+            assert activity.organizer == user.player
+            assert activity.player_count == 1
+            assert list(activity.levels.all()) == [player_sport.level]
+
+
+class TestActivitySeriesQueryset:
+    def test_generate_occurrences(self, user: User, user2: User) -> None:
+        finished_activity_series = ActivitySeriesFactory(organizer=user.player, occurrence_limit=1)
+        activity_series = ActivitySeriesFactory(organizer=user2.player)
+        until = timezone.datetime.now() + timezone.timedelta(weeks=8)
+
+        total_created = ActivitySeries.objects.generate_occurrences(until)
+
+        assert total_created == 4
+        assert finished_activity_series.activities.count() == 1
+        assert activity_series.activities.count() == 8
+
+    def test_filter_unfinished(self, user: User) -> None:
+        ActivitySeriesFactory(organizer=user.player, occurrence_limit=1)
+        activity_series = ActivitySeriesFactory(organizer=user.player, occurrence_limit=10)
+
+        assert list(ActivitySeries.objects.filter_unfinished()) == [activity_series]
+
+
+class TestActivitySeries:
+    def test_str(self, activity_series: ActivitySeries) -> None:
+        assert str(activity_series) == activity_series.name
+
+    @pytest.mark.parametrize(
+        "activity_series",
+        [{"frequency": ActivitySeries.Frequency.DAILY, "interval": 3}],
+        indirect=["activity_series"],
+    )
+    def test_get_occurrence_range(self, activity_series: ActivitySeries) -> None:
+        available_between_at = activity_series.get_occurrence_range(2)
+
+        assert available_between_at.lower == activity_series.starts_at + timezone.timedelta(days=6)
+        assert available_between_at.upper == available_between_at.lower + activity_series.duration
+
+    def test_generate_occurrences(self, activity_series: ActivitySeries) -> None:
+        until = timezone.datetime.now() + timezone.timedelta(weeks=6)
+
+        activities = activity_series.generate_occurrences(until)
+
+        assert len(activities) == 2
+        assert activity_series.generated_count == 6
+        assert activity_series.activities.count() == 6
+        assert all(activity.organizer == activity_series.organizer for activity in activities)
+        assert all(
+            activity.players.get(activity_players__is_organizer=True) == activity_series.organizer
+            for activity in activities
+        )
+        assert activity_series.generate_occurrences(until) == []
+
+    @pytest.mark.parametrize(
+        "activity_series",
+        [{"occurrence_limit": 2}],
+        indirect=["activity_series"],
+    )
+    def test_generate_occurrences_when_occurrence_limit(self, activity_series: ActivitySeries) -> None:
+        activities = activity_series.generate_occurrences(timezone.datetime.now() + timezone.timedelta(weeks=8))
+
+        assert activities == []
+        assert activity_series.generated_count == 2
+        assert activity_series.activities.count() == 2
+
+    def test_generate_occurrences_when_occurrences_started(self, user: User) -> None:
+        activity_series = ActivitySeriesFactory(
+            organizer=user.player,
+            starts_at=timezone.datetime.now() - timezone.timedelta(days=2, hours=12),
+            frequency=ActivitySeries.Frequency.DAILY,
+        )
+
+        assert activity_series.generated_count == 31
+        assert activity_series.activities.count() == 28
+        assert not activity_series.activities.filter(
+            available_between_at__startswith__lte=timezone.datetime.now()
+        ).exists()
@@ -0,0 +1,44 @@
+import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import BaseChannelLayer
+from channels.testing import WebsocketCommunicator
+
+from django.contrib.auth.models import AnonymousUser
+
+from accounts.models import User
+from events.ws.consumers import ActivityDeltaConsumer
+from events.ws.deltas import get_player_group_name, get_sport_group_name
+
+pytestmark = pytest.mark.django_db
+
+
+class TestActivityDeltaConsumer:
+    def test_receive_deltas(self, channel_layer: BaseChannelLayer, user: User) -> None:
+        sport_pk = user.player.sports.values_list("sport", flat=True).first()
+
+        @async_to_sync
+        async def run() -> None:
+            communicator = WebsocketCommunicator(ActivityDeltaConsumer.as_asgi(), "/activities/")
+            communicator.scope["user"] = user
+            connected, _ = await communicator.connect()
+            assert connected
+
+            for group_name in (get_sport_group_name(sport_pk), get_player_group_name(user.player.pk)):
+                await channel_layer.group_send(group_name, {"type": "activity_delta", "delta": {"group": group_name}})
+                assert await communicator.receive_json_from() == {"group": group_name}
+
+            await channel_layer.group_send(get_sport_group_name(0), {"type": "activity_delta", "delta": {}})
+            assert await communicator.receive_nothing()
+            await communicator.disconnect()
+
+        run()
+
+    def test_connect_when_user_is_anonymous(self, channel_layer: BaseChannelLayer) -> None:
+        @async_to_sync
+        async def run() -> None:
+            communicator = WebsocketCommunicator(ActivityDeltaConsumer.as_asgi(), "/activities/")
+            communicator.scope["user"] = AnonymousUser()
+            connected, _ = await communicator.connect()
+            assert not connected
+
+        run()
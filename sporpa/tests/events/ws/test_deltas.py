@@ -0,0 +1,132 @@
+from typing import Any, Callable
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import BaseChannelLayer
+
+from events.models import Activity
+from events.ws.deltas import DeltaType, get_player_group_name, get_sport_group_name, publish_activity_delta
+from participants.models import ParticipationRequest
+from tests.accounts.factories import UserFactory
+from tests.events.factories import ActivityFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _subscribe(channel_layer: BaseChannelLayer, group_name: str) -> str:
+    channel_name = async_to_sync(channel_layer.new_channel)()
+    async_to_sync(channel_layer.group_add)(group_name, channel_name)
+    return channel_name
+
+
+def _receive(channel_layer: BaseChannelLayer, channel_name: str) -> dict[str, Any]:
+    message = async_to_sync(channel_layer.receive)(channel_name)
+    assert message["type"] == "activity_delta"
+    return message["delta"]
+
+
+def test_publish_activity_delta(
+    channel_layer: BaseChannelLayer,
+    django_capture_on_commit_callbacks: Callable,
+    activity_with_participants: Activity,
+) -> None:
+    activity = activity_with_participants
+    activity.refresh_from_db()
+    channel_name = _subscribe(channel_layer, get_sport_group_name(activity.sport_id))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        publish_activity_delta(activity)
+
+    assert _receive(channel_layer, channel_name) == {
+        "type": DeltaType.ACTIVITY_FILLED if not activity.seats_left else DeltaType.ACTIVITY_UPDATED,
+        "activity": {
+            "pk": activity.pk,
+            "sport": activity.sport_id,
+            "levels": activity.level_ids,
+            "name": activity.name,
+            "status": activity.status,
+            "player_limit": activity.player_limit,
+            "player_count": activity.player_count,
+            "available_between_at": [
+                activity.available_between_at.lower.isoformat(),
+                activity.available_between_at.upper.isoformat(),
+            ],
+        },
+    }
+
+
+def test_publish_activity_delta_when_not_committed(
+    channel_layer: BaseChannelLayer,
+    django_capture_on_commit_callbacks: Callable,
+    activity_without_participants: Activity,
+) -> None:
+    with django_capture_on_commit_callbacks() as callbacks:
+        publish_activity_delta(activity_without_participants, DeltaType.ACTIVITY_CANCELLED)
+
+    assert len(callbacks) == 1
+
+
+@pytest.mark.parametrize(
+    "activity_without_participants",
+    [{"player_limit": 2}],
+    indirect=["activity_without_participants"],
+)
+def test_accept_participation_request(
+    channel_layer: BaseChannelLayer,
+    django_capture_on_commit_callbacks: Callable,
+    participation_request: ParticipationRequest,
+) -> None:
+    activity = participation_request.activity
+    activity.refresh_from_db()
+    participant = participation_request.participant
+    sport_channel_name = _subscribe(channel_layer, get_sport_group_name(activity.sport_id))
+    player_channel_name = _subscribe(channel_layer, get_player_group_name(participant.pk))
+    participation_request_pk = participation_request.pk
+
+    with django_capture_on_commit_callbacks(execute=True):
+        activity.accept_participation_request(participation_request)
+
+    delta = _receive(channel_layer, sport_channel_name)
+    assert delta["type"] == DeltaType.ACTIVITY_FILLED
+    assert delta["activity"]["player_count"] == 2
+    assert _receive(channel_layer, player_channel_name) == {
+        "type": DeltaType.PARTICIPATION_REQUEST_ACCEPTED,
+        "participation_request": {
+            "pk": participation_request_pk,
+            "activity": activity.pk,
+            "participant": participant.pk,
+        },
+    }
+
+
+def test_approve_participation_requests(
+    channel_layer: BaseChannelLayer,
+    django_capture_on_commit_callbacks: Callable,
+    participation_request: ParticipationRequest,
+) -> None:
+    participant = participation_request.participant
+    player_channel_name = _subscribe(channel_layer, get_player_group_name(participant.pk))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Activity.objects.approve_participation_requests(
+            participation_request.activity.organizer,
+            {participation_request.pk: False},
+        )
+
+    assert _receive(channel_layer, player_channel_name)["type"] == DeltaType.PARTICIPATION_REQUEST_REJECTED
+
+
+def test_create_activity(
+    channel_layer: BaseChannelLayer,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+    organizer = UserFactory(player_sports_size=1).player
+    player_sport = organizer.sports.get()
+    channel_name = _subscribe(channel_layer, get_sport_group_name(player_sport.sport_id))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        activity = ActivityFactory(organizer=organizer, player_sport=player_sport)
+
+    delta = _receive(channel_layer, channel_name)
+    assert delta["type"] == DeltaType.ACTIVITY_CREATED
+    assert delta["activity"]["pk"] == activity.pk
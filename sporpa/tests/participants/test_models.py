@@ -2,10 +2,14 @@ import random
 
 import pytest
 
+from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 
 from accounts.models import User
+from events.models import ActivityFeedEntry
 from participants.models import ParticipationRequest, PlayerSport, Sport, SportLevel
+from tests.accounts.factories import UserFactory
+from tests.events.factories import ActivityFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -59,6 +63,21 @@ class TestPlayerSport:
 
         assert sport.level == sport_level
 
+    def test_update_level_refreshes_activity_feed(self, user2: User) -> None:
+        player_sport: PlayerSport = user2.player.sports.first()
+        activity = ActivityFactory(organizer=user2.player, player_sport=player_sport, levels=())
+        player = UserFactory(
+            player__sports__sport=player_sport.sport,
+            player__sports__level=SportLevel.objects.exclude(pk=player_sport.level_id).first(),
+            player_sports_size=1,
+        ).player
+
+        player.sports.get().update_level(player_sport.level)
+        assert list(player.activity_feed_entries.values_list("activity", flat=True)) == [activity.pk]
+
+        player.sports.get().update_level(SportLevel.objects.exclude(pk=player_sport.level_id).first())
+        assert not player.activity_feed_entries.exists()
+
 
 class TestPlayer:
     def test_create_sport(self, user_without_sport: User) -> None:
@@ -74,6 +93,47 @@ class TestPlayer:
 
         assert user_without_sport.player.sports.filter(pk=player_sport.pk).exists()
 
+    def test_create_sport_refreshes_activity_feed(self, user_without_sport: User, user2: User) -> None:
+        player_sport: PlayerSport = user2.player.sports.first()
+        activity = ActivityFactory(organizer=user2.player, player_sport=player_sport, levels=())
+        data = {
+            "player": user_without_sport.player,
+            "sport": player_sport.sport,
+            "level": player_sport.level,
+        }
+
+        user_without_sport.player.create_sport(data)
+
+        assert list(ActivityFeedEntry.objects.values_list("player", "activity")) == [
+            (user_without_sport.player.pk, activity.pk),
+        ]
+
+    def test_set_exclusive_schedule(self, user: User, user2: User) -> None:
+        player_sport: PlayerSport = user2.player.sports.first()
+        activity = ActivityFactory(organizer=user2.player, player_sport=player_sport)
+        activity.refresh_from_db()
+        ActivityFactory(
+            organizer=user2.player,
+            player_sport=player_sport,
+            available_between_at=activity.available_between_at,
+        )
+
+        with pytest.raises(ValidationError, match="You have another activity at the same time."):
+            user2.player.set_exclusive_schedule(True)
+
+        user2.player.refresh_from_db()
+        assert not user2.player.exclusive_schedule
+        assert not user2.player.activity_players.filter(available_between_at__isnull=False).exists()
+
+        ActivityFactory(organizer=user.player, available_between_at=activity.available_between_at)
+        user.player.set_exclusive_schedule(True)
+
+        assert user.player.activity_players.get().available_between_at == activity.available_between_at
+
+        user.player.set_exclusive_schedule(False)
+
+        assert user.player.activity_players.get().available_between_at is None
+
     def test_create_sport_when_has_same_sport(self, user: User) -> None:
         sport = user.player.sports.first().sport
         sport_level = random.choice(SportLevel.objects.all())
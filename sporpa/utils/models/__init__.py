@@ -1,3 +1,4 @@
+from .generated_field import GeneratedCharField, GeneratedSearchVectorField
 from .tracking_mixin import TrackingManagerMixin, TrackingMixin
 
-__all__ = ["TrackingMixin", "TrackingManagerMixin"]
+__all__ = ["GeneratedCharField", "GeneratedSearchVectorField", "TrackingMixin", "TrackingManagerMixin"]
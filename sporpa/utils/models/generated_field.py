@@ -0,0 +1,36 @@
+from typing import Any
+
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class DatabaseDefault(models.Expression):
+    template = "DEFAULT"
+
+    def as_sql(self, compiler: Any, connection: Any) -> tuple[str, list]:
+        return self.template, []
+
+
+class GeneratedFieldMixin:
+    """
+    A column which is generated by the database (GENERATED ALWAYS AS ...
+    STORED). The column cannot be written to, so DEFAULT is sent on every
+    insert and update. The column definition lives in the migration.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("editable", False)
+        kwargs.setdefault("null", True)
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance: models.Model, add: bool) -> DatabaseDefault:
+        return DatabaseDefault()
+
+
+class GeneratedSearchVectorField(GeneratedFieldMixin, SearchVectorField):
+    pass
+
+
+class GeneratedCharField(GeneratedFieldMixin, models.CharField):
+    # Read back on insert, the value is not known before.
+    db_returning = True